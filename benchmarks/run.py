@@ -0,0 +1,242 @@
+"""
+Time the four-body dispersion potentials, and compare the timings against a stored
+baseline.
+
+Run from the root of the repository:
+    python -m benchmarks.run                                # print the timings
+    python -m benchmarks.run --output results.json          # also save them as JSON
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+When a baseline is given, every benchmark that is slower than its baseline time by
+more than the tolerance (25% by default) is flagged as a regression, and the command
+exits with a status of 1. The timings depend on the machine, so a baseline is only
+meaningful on the machine that recorded it; record a new one with `--output`.
+
+The benchmarks cover:
+- single calls of each potential on the test geometries (tetrahedron, square,
+  collinear), including `DirectFourBodyDispersionPotential` and `_old_potential`, with
+  the points given as `Cartesian3D` objects and as NumPy arrays
+- batches of random quadruplets, through the NumPy, Numba, Gram-matrix, and component
+  paths
+- the total energy of a random cluster, through `ClusterDispersionEnergy`, and from
+  all of its quadruplets through `DipoleTensorClusterEnergy`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from dispersion4b import _old_potential
+from dispersion4b import gram
+from dispersion4b import jit
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.components import BadeComponentPotential
+from dispersion4b.dipole_tensor import DipoleTensorClusterEnergy
+from dispersion4b.direct_potential import DirectFourBodyDispersionPotential
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.unit_geometries import get_collinear_points
+from dispersion4b.unit_geometries import get_square_points
+from dispersion4b.unit_geometries import get_tetrahedron_points
+
+Benchmark = Callable[[], Any]
+
+SIDELENGTH = 3.0
+BATCH_SIZE = 4096
+CLUSTER_SIZE = 64
+CLUSTER_PAIR_CUTOFF = 4.0
+DEFAULT_TOLERANCE = 0.25
+
+
+def benchmarks() -> dict[str, Benchmark]:
+    """The benchmarks to run, by name."""
+    cases: dict[str, Benchmark] = {}
+
+    single_potentials = {
+        "full": FourBodyDispersionPotential(1.0),
+        "quadruplet": QuadrupletDispersionPotential(1.0),
+        "direct": DirectFourBodyDispersionPotential(1.0),
+        "old": _old_potential.FourBodyDispersionPotential(1.0),
+    }
+    geometries = {
+        "tetrahedron": get_tetrahedron_points(SIDELENGTH),
+        "square": get_square_points(SIDELENGTH),
+        "collinear": get_collinear_points(SIDELENGTH),
+    }
+    for potential_name, potential in single_potentials.items():
+        for geometry_name, points in geometries.items():
+            cases[f"single/{potential_name}/{geometry_name}"] = _bind(potential, points)
+
+    # the same calls, with the points given as NumPy arrays instead of `Cartesian3D`
+    for potential_name in ["full", "quadruplet", "direct"]:
+        for geometry_name, points in geometries.items():
+            array_points = np.array([tuple(point) for point in points])
+            cases[f"single/{potential_name}/{geometry_name}/array"] = _bind(
+                single_potentials[potential_name], list(array_points)
+            )
+
+    rng = np.random.default_rng(seed=0)
+    batch = rng.uniform(0.0, 2.0 * SIDELENGTH, size=(BATCH_SIZE, 4, 3))
+    squared_distances = gram.squared_pair_distances(batch)
+
+    full = FourBodyDispersionPotential(1.0)
+    quadruplet = QuadrupletDispersionPotential(1.0)
+    components = BadeComponentPotential(1.0)
+    for backend in jit.BACKENDS:
+        cases[f"batch/full/{backend}"] = lambda b=backend: full.evaluate_batch(
+            batch, backend=b
+        )
+        cases[f"batch/quadruplet/{backend}"] = (
+            lambda b=backend: quadruplet.evaluate_batch(batch, backend=b)
+        )
+    cases["batch/full/gram"] = lambda: full.energies_from_squared_distances(
+        squared_distances
+    )
+    cases["batch/quadruplet/gram"] = lambda: quadruplet.energies_from_squared_distances(
+        squared_distances
+    )
+    cases["batch/components"] = lambda: components.evaluate_components(batch)
+
+    positions = rng.uniform(0.0, 4.0 * SIDELENGTH, size=(CLUSTER_SIZE, 3))
+    cluster_energy = ClusterDispersionEnergy(
+        quadruplet, pair_cutoff=CLUSTER_PAIR_CUTOFF
+    )
+    cases["cluster/quadruplet"] = lambda: cluster_energy(positions)
+    dipole_tensor_energy = DipoleTensorClusterEnergy(quadruplet)
+    cases["cluster/quadruplet/dipole_tensor"] = lambda: dipole_tensor_energy(positions)
+
+    return cases
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int) -> dict[str, float]:
+    """
+    The best time per call out of `repeat` runs; each run calls the benchmark enough
+    times to take at least 0.2 seconds.
+    """
+    benchmark()  # warm up (and compile, for the Numba backend)
+
+    timer = timeit.Timer(benchmark)
+    number, _ = timer.autorange()
+    best_time = min(timer.repeat(repeat=repeat, number=number))
+
+    return {"seconds_per_call": best_time / number, "calls_per_run": number}
+
+
+def run_benchmarks(
+    names: Optional[Sequence[str]] = None, repeat: int = 5
+) -> dict[str, Any]:
+    """Run the benchmarks (all of them, by default), and collect the results."""
+    cases = benchmarks()
+    if names is None:
+        names = list(cases)
+
+    unknown = sorted(set(names) - set(cases))
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmarks; they must be among {sorted(cases)}.\n"
+            f"Entered: {unknown}"
+        )
+
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "numba_available": jit.NUMBA_AVAILABLE,
+        },
+        "results": {name: time_benchmark(cases[name], repeat) for name in names},
+    }
+
+
+def find_regressions(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> dict[str, float]:
+    """
+    The ratio of the current time to the baseline time, for each benchmark that is
+    slower than its baseline by more than the tolerance; benchmarks missing from the
+    baseline are ignored.
+    """
+    regressions = {}
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        ratio = (
+            result["seconds_per_call"] / baseline["results"][name]["seconds_per_call"]
+        )
+        if ratio > 1.0 + tolerance:
+            regressions[name] = ratio
+
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Time the dispersion potentials, and flag regressions.",
+    )
+    parser.add_argument("names", nargs="*", help="the benchmarks to run (default: all)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="the allowed relative slowdown before flagging a regression",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="the number of timing runs"
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list the benchmarks, and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(benchmarks()))
+        return 0
+
+    results = run_benchmarks(args.names or None, args.repeat)
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    regressions = {}
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.tolerance)
+
+    for name, result in results["results"].items():
+        line = f"{name:<32} {1.0e6 * result['seconds_per_call']:>14.3f} us"
+        if baseline is not None and name in baseline["results"]:
+            base_time = baseline["results"][name]["seconds_per_call"]
+            line += f"  ({result['seconds_per_call'] / base_time:5.2f}x baseline)"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    return 1 if regressions else 0
+
+
+def _bind(potential: Callable[..., float], points: Sequence[Any]) -> Benchmark:
+    p0, p1, p2, p3 = points
+    return lambda: potential(p0, p1, p2, p3)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+
+from dispersion4b.cli import main
+
+sys.exit(main())
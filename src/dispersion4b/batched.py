@@ -0,0 +1,372 @@
+"""
+Vectorized versions of the pair, triplet, and quadruplet contributions to the Bade
+dispersion interaction energy, evaluated over many quadruplets at once.
+
+A batch of quadruplets is a contiguous `(N, 4, 3)` array of float64 values, where
+`batch[i]` holds the four points of the i^th quadruplet. The six pair separations of
+each quadruplet are stored in the same order as the scalar implementation in
+`potential.py` uses them:
+    vec10, vec20, vec30, vec21, vec31, vec32
+
+The functions in this module only depend on the position of the last axes, so they
+also work on the geometry of a single quadruplet (arrays of shape `(6,)` and `(6, 3)`).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+# the cosines of the quadruplet numerator, either as plain floats (see `scalar.py`) or
+# as arrays
+CosineT = TypeVar("CosineT", float, NDArray[np.float64])
+
+# the indices of the points that make up each of the six pair separations
+# - the separation `k` is `points[PAIR_INDICES[k][0]] - points[PAIR_INDICES[k][1]]`
+PAIR_INDICES: tuple[tuple[int, int], ...] = (
+    (1, 0),
+    (2, 0),
+    (3, 0),
+    (2, 1),
+    (3, 1),
+    (3, 2),
+)
+
+_VEC10, _VEC20, _VEC30, _VEC21, _VEC31, _VEC32 = range(6)
+
+# the first and second points of each of the six pair separations, as index arrays
+FIRST_POINT = np.array([i for (i, _) in PAIR_INDICES])
+SECOND_POINT = np.array([j for (_, j) in PAIR_INDICES])
+
+# maps the gradients with respect to the six pair separations onto the four points
+_SEPARATION_TO_POINT = np.zeros((6, 4))
+_SEPARATION_TO_POINT[np.arange(6), FIRST_POINT] = 1.0
+_SEPARATION_TO_POINT[np.arange(6), SECOND_POINT] = -1.0
+
+# the pairs of separations used in each of the 12 triplet contributions
+TRIPLET_PAIRS = np.array(
+    [
+        (_VEC10, _VEC20),
+        (_VEC10, _VEC30),
+        (_VEC20, _VEC30),
+        (_VEC10, _VEC21),
+        (_VEC10, _VEC31),
+        (_VEC21, _VEC31),
+        (_VEC20, _VEC21),
+        (_VEC20, _VEC32),
+        (_VEC21, _VEC32),
+        (_VEC30, _VEC31),
+        (_VEC30, _VEC32),
+        (_VEC31, _VEC32),
+    ]
+)
+
+# the (ij, jk, kl, li) separations used in each of the 3 quadruplet contributions
+QUADRUPLET_CYCLES = np.array(
+    [
+        (_VEC30, _VEC32, _VEC21, _VEC10),
+        (_VEC20, _VEC32, _VEC31, _VEC10),
+        (_VEC20, _VEC21, _VEC31, _VEC30),
+    ]
+)
+
+# one-hot matrices that scatter per-term gradients back onto the six separations
+_TRIPLET_SCATTER = np.eye(6)[TRIPLET_PAIRS]
+_QUADRUPLET_SCATTER = np.eye(6)[QUADRUPLET_CYCLES]
+
+
+def as_quadruplet_batch(points: ArrayLike) -> NDArray[np.float64]:
+    """
+    View the input as a contiguous `(N, 4, 3)` float64 array; no copy is made if the
+    input already has this layout.
+    """
+    batch = np.ascontiguousarray(points, dtype=np.float64)
+
+    if batch.ndim != 3 or batch.shape[1:] != (4, 3):
+        raise ValueError(
+            "The batch of quadruplets must have the shape (N, 4, 3).\n"
+            f"Entered: shape = {batch.shape}"
+        )
+
+    return batch
+
+
+def pair_separations(batch: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The six pair separations of each quadruplet, as an `(N, 6, 3)` array."""
+    return batch[..., FIRST_POINT, :] - batch[..., SECOND_POINT, :]
+
+
+def distances_and_unit_vectors(
+    separations: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Split the pair separations into their magnitudes and directions."""
+    distances = np.sqrt(np.einsum("...i,...i->...", separations, separations))
+    unit_vectors = separations / distances[..., np.newaxis]
+
+    return distances, unit_vectors
+
+
+def pair_contributions(distances: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The sum of the six two-particle contributions of each quadruplet."""
+    return np.sum(1.0 / distances**12, axis=-1)
+
+
+def triplet_contributions(
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The sum of the twelve three-particle contributions of each quadruplet."""
+    vec_ij = TRIPLET_PAIRS[:, 0]
+    vec_jk = TRIPLET_PAIRS[:, 1]
+
+    cosine_ijk = _pairwise_dot(
+        unit_vectors[..., vec_ij, :], unit_vectors[..., vec_jk, :]
+    )
+
+    numer = 1.0 + cosine_ijk**2
+    denom = (distances[..., vec_ij] * distances[..., vec_jk]) ** 6
+
+    return np.sum(numer / denom, axis=-1)
+
+
+def quadruplet_contributions(
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The sum of the three four-particle contributions of each quadruplet, including
+    the factor of 2 that accounts for each cycle being traversed in both directions.
+    """
+    vec_ij, vec_jk, vec_kl, vec_li = QUADRUPLET_CYCLES.T
+
+    # the distance term
+    denom = (
+        distances[..., vec_ij]
+        * distances[..., vec_jk]
+        * distances[..., vec_kl]
+        * distances[..., vec_li]
+    ) ** 3
+
+    u_ij = unit_vectors[..., vec_ij, :]
+    u_jk = unit_vectors[..., vec_jk, :]
+    u_kl = unit_vectors[..., vec_kl, :]
+    u_li = unit_vectors[..., vec_li, :]
+
+    prod_ijjk = _pairwise_dot(u_ij, u_jk)
+    prod_ijkl = _pairwise_dot(u_ij, u_kl)
+    prod_ijli = _pairwise_dot(u_ij, u_li)
+    prod_jkkl = _pairwise_dot(u_jk, u_kl)
+    prod_jkli = _pairwise_dot(u_jk, u_li)
+    prod_klli = _pairwise_dot(u_kl, u_li)
+
+    numer = quadruplet_numerator(
+        prod_ijjk, prod_ijkl, prod_ijli, prod_jkkl, prod_jkli, prod_klli
+    )
+
+    return 2.0 * np.sum(numer / denom, axis=-1)
+
+
+def pair_gradients(
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The gradients of `pair_contributions()` with respect to each of the six pair
+    separations, as an `(N, 6, 3)` array.
+    """
+    return (-12.0 / distances**13)[..., np.newaxis] * unit_vectors
+
+
+def triplet_gradients(
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The gradients of `triplet_contributions()` with respect to each of the six pair
+    separations, as an `(N, 6, 3)` array.
+    """
+    vec_ij = TRIPLET_PAIRS[:, 0]
+    vec_jk = TRIPLET_PAIRS[:, 1]
+
+    dist_ij = distances[..., vec_ij]
+    dist_jk = distances[..., vec_jk]
+    u_ij = unit_vectors[..., vec_ij, :]
+    u_jk = unit_vectors[..., vec_jk, :]
+
+    cosine_ijk = _pairwise_dot(u_ij, u_jk)
+    denom = (dist_ij * dist_jk) ** 6
+
+    # the derivatives of the numerator with respect to the cosine, and of the
+    # logarithm of the denominator with respect to each distance
+    dnumer_dcos = (2.0 * cosine_ijk / denom)[..., np.newaxis]
+    energy_over_dist = -6.0 * (1.0 + cosine_ijk**2) / denom
+
+    grad_ij = (
+        dnumer_dcos * _cosine_gradient(cosine_ijk, u_ij, u_jk)
+        + energy_over_dist[..., np.newaxis] * u_ij
+    ) / dist_ij[..., np.newaxis]
+    grad_jk = (
+        dnumer_dcos * _cosine_gradient(cosine_ijk, u_jk, u_ij)
+        + energy_over_dist[..., np.newaxis] * u_jk
+    ) / dist_jk[..., np.newaxis]
+
+    return _scatter(_TRIPLET_SCATTER, grad_ij, grad_jk)
+
+
+def quadruplet_gradients(
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The gradients of `quadruplet_contributions()` with respect to each of the six pair
+    separations, as an `(N, 6, 3)` array.
+    """
+    vec_ij, vec_jk, vec_kl, vec_li = QUADRUPLET_CYCLES.T
+
+    dists = [distances[..., vec] for vec in (vec_ij, vec_jk, vec_kl, vec_li)]
+    units = [unit_vectors[..., vec, :] for vec in (vec_ij, vec_jk, vec_kl, vec_li)]
+    d_ij, d_jk, d_kl, d_li = dists
+    u_ij, u_jk, u_kl, u_li = units
+
+    denom = (d_ij * d_jk * d_kl * d_li) ** 3
+
+    prod_ijjk = _pairwise_dot(u_ij, u_jk)
+    prod_ijkl = _pairwise_dot(u_ij, u_kl)
+    prod_ijli = _pairwise_dot(u_ij, u_li)
+    prod_jkkl = _pairwise_dot(u_jk, u_kl)
+    prod_jkli = _pairwise_dot(u_jk, u_li)
+    prod_klli = _pairwise_dot(u_kl, u_li)
+
+    numer = quadruplet_numerator(
+        prod_ijjk, prod_ijkl, prod_ijli, prod_jkkl, prod_jkli, prod_klli
+    )
+    energy = numer / denom
+
+    # the derivatives of the numerator with respect to each of the six cosines
+    dnumer = {
+        "ijjk": 2.0 * prod_ijjk
+        - 3.0 * (prod_jkkl * prod_ijkl + prod_jkli * prod_ijli)
+        + 9.0 * (prod_jkkl * prod_klli * prod_ijli),
+        "ijkl": 2.0 * prod_ijkl - 3.0 * (prod_ijjk * prod_jkkl + prod_klli * prod_ijli),
+        "ijli": 2.0 * prod_ijli
+        - 3.0 * (prod_ijjk * prod_jkli + prod_ijkl * prod_klli)
+        + 9.0 * (prod_ijjk * prod_jkkl * prod_klli),
+        "jkkl": 2.0 * prod_jkkl
+        - 3.0 * (prod_ijjk * prod_ijkl + prod_klli * prod_jkli)
+        + 9.0 * (prod_ijjk * prod_klli * prod_ijli),
+        "jkli": 2.0 * prod_jkli - 3.0 * (prod_ijjk * prod_ijli + prod_jkkl * prod_klli),
+        "klli": 2.0 * prod_klli
+        - 3.0 * (prod_ijkl * prod_ijli + prod_jkkl * prod_jkli)
+        + 9.0 * (prod_ijjk * prod_jkkl * prod_ijli),
+    }
+    cosines = {
+        "ijjk": prod_ijjk,
+        "ijkl": prod_ijkl,
+        "ijli": prod_ijli,
+        "jkkl": prod_jkkl,
+        "jkli": prod_jkli,
+        "klli": prod_klli,
+    }
+
+    labels = ("ij", "jk", "kl", "li")
+    grads = []
+    for label, dist, unit in zip(labels, dists, units):
+        grad = -3.0 * energy[..., np.newaxis] * unit
+        for other_label, other_unit in zip(labels, units):
+            key = _cosine_key(label, other_label)
+            if key is None:
+                continue
+            dnumer_dcos = (dnumer[key] / denom)[..., np.newaxis]
+            grad = grad + dnumer_dcos * _cosine_gradient(cosines[key], unit, other_unit)
+
+        grads.append(grad / dist[..., np.newaxis])
+
+    return 2.0 * _scatter(_QUADRUPLET_SCATTER, *grads)
+
+
+def point_gradients(separation_gradients: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Convert the `(N, 6, 3)` gradients with respect to the pair separations into the
+    `(N, 4, 3)` gradients with respect to the four points of each quadruplet.
+    """
+    return np.einsum("ka,...ki->...ai", _SEPARATION_TO_POINT, separation_gradients)
+
+
+def _cosine_gradient(
+    cosine: NDArray[np.float64],
+    unit: NDArray[np.float64],
+    other_unit: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The gradient of the cosine between two vectors with respect to the first vector,
+    multiplied by the length of the first vector.
+    """
+    return other_unit - cosine[..., np.newaxis] * unit
+
+
+def _cosine_key(label: str, other_label: str) -> Optional[str]:
+    """The name of the cosine between two of the separations in a quadruplet cycle."""
+    order = ("ij", "jk", "kl", "li")
+    if label == other_label:
+        return None
+
+    first, second = sorted((label, other_label), key=order.index)
+    return first + second
+
+
+def _scatter(
+    scatter: NDArray[np.float64], *term_gradients: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Sum the gradients of each term with respect to its separations onto the six pair
+    separations; `scatter[t, s]` maps separation `s` of each term onto the six.
+    """
+    return sum(
+        np.einsum("ta,...ti->...ai", scatter[:, slot, :], grad)
+        for (slot, grad) in enumerate(term_gradients)
+    )
+
+
+def quadruplet_numerator(
+    prod_ijjk: CosineT,
+    prod_ijkl: CosineT,
+    prod_ijli: CosineT,
+    prod_jkkl: CosineT,
+    prod_jkli: CosineT,
+    prod_klli: CosineT,
+) -> CosineT:
+    """The angular part of the quadruplet contribution, given the six cosines."""
+    # the squared pair prods
+    pair_terms = (
+        prod_ijjk**2
+        + prod_ijkl**2
+        + prod_ijli**2
+        + prod_jkkl**2
+        + prod_jkli**2
+        + prod_klli**2
+    )
+
+    # the triplets
+    triplet_terms = (
+        (prod_ijjk * prod_jkkl * prod_ijkl)
+        + (prod_ijjk * prod_jkli * prod_ijli)
+        + (prod_ijkl * prod_klli * prod_ijli)
+        + (prod_jkkl * prod_klli * prod_jkli)
+    )
+
+    # the quadruplet term
+    quadruplet_term = prod_ijjk * prod_jkkl * prod_klli * prod_ijli
+
+    # along with the constant contribution
+    return -1.0 + pair_terms - 3.0 * triplet_terms + 9.0 * quadruplet_term
+
+
+def _pairwise_dot(
+    vecs0: NDArray[np.float64], vecs1: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Dot products between corresponding vectors along the last axis."""
+    return np.einsum("...i,...i->...", vecs0, vecs1)
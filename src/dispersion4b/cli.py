@@ -0,0 +1,222 @@
+"""
+The `dispersion4b` command, which evaluates the four-body dispersion energies of a
+file of quadruplets and writes one energy per quadruplet.
+
+The quadruplets are read from either a `.npy` file holding an `(N, 4, 3)` array, or a
+text file with the 12 coordinates of one quadruplet on each line (in the order
+x0 y0 z0 x1 y1 z1 ...). The `.npy` file is memory-mapped, and is evaluated in batches
+of `--batch-size` quadruplets.
+
+For example:
+    dispersion4b quadruplets.npy --potential quadruplet \\
+        --coefficient b12_parahydrogen_avtz_approx --workers 8 --output energies.npy
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import sys
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+from typing import Protocol
+from typing import Sequence
+from typing import TextIO
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b import coefficients
+from dispersion4b import jit
+from dispersion4b.cluster import BatchPotential
+from dispersion4b.parallel import parallel_batch_energies
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+class CommandLinePotential(BatchPotential, Protocol):
+    """A potential that can be chosen with `--potential`."""
+
+    def evaluate_batch(
+        self, points: ArrayLike, backend: str = "numpy"
+    ) -> NDArray[np.float64]: ...
+
+
+POTENTIALS: dict[str, Callable[[float], CommandLinePotential]] = {
+    "full": FourBodyDispersionPotential,
+    "quadruplet": QuadrupletDispersionPotential,
+}
+
+# the named coefficients are the public functions in `coefficients.py`
+COEFFICIENTS: dict[str, Callable[[], float]] = {
+    name: function
+    for (name, function) in inspect.getmembers(coefficients, inspect.isfunction)
+    if not name.startswith("_")
+}
+
+OUTPUT_FORMATS = ("txt", "npy")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="dispersion4b",
+        description="Evaluate the four-body dispersion energies of a file of quadruplets.",
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="an '.npy' file with an (N, 4, 3) array, or a text file with 12 coordinates per line",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="where to write the energies; '-' (the default) writes to stdout",
+    )
+    parser.add_argument(
+        "--potential",
+        choices=sorted(POTENTIALS),
+        default="full",
+        help="the full Bade potential, or only its quadruplet component",
+    )
+    parser.add_argument(
+        "--coefficient",
+        default="b12_parahydrogen_avtz_approx",
+        help="the name of a function in 'dispersion4b.coefficients', or a number",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=65536,
+        help="the number of quadruplets evaluated at once",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="the number of worker processes; each one evaluates a batch at a time",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=jit.BACKENDS,
+        default="numpy",
+        help="the backend used when running in a single process",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="the format of the output; by default, 'npy' if the output ends in '.npy', else 'txt'",
+    )
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        output_format = _output_format(args.output, args.format)
+        _check_positive("batch size", args.batch_size)
+        _check_positive("number of workers", args.workers)
+
+        potential = POTENTIALS[args.potential](parse_coefficient(args.coefficient))
+        batch = read_quadruplets(args.input)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.workers == 1:
+        energies = evaluate_in_batches(potential, batch, args.batch_size, args.backend)
+    else:
+        energies = parallel_batch_energies(
+            potential, batch, n_workers=args.workers, chunk_size=args.batch_size
+        )
+
+    if output_format == "npy":
+        # written through an open file, since `np.save()` would add the '.npy' suffix
+        # to a path that does not already end with it
+        with open(args.output, "wb") as output_file:
+            np.save(output_file, energies)
+    elif args.output == "-":
+        write_energies(energies, sys.stdout)
+    else:
+        with open(args.output, "w") as output_file:
+            write_energies(energies, output_file)
+
+    return 0
+
+
+def parse_coefficient(coefficient: str) -> float:
+    """The value of a named coefficient from `coefficients.py`, or of a number."""
+    if coefficient in COEFFICIENTS:
+        return COEFFICIENTS[coefficient]()
+
+    try:
+        return float(coefficient)
+    except ValueError:
+        raise ValueError(
+            f"The coefficient must be a number, or one of {sorted(COEFFICIENTS)}.\n"
+            f"Entered: coefficient = {coefficient!r}"
+        ) from None
+
+
+def read_quadruplets(path: Path) -> NDArray[np.float64]:
+    """
+    Read the `(N, 4, 3)` quadruplets from a `.npy` file (memory-mapped), or from a text
+    file with the 12 coordinates of one quadruplet on each line.
+    """
+    batch: NDArray[np.float64]
+    if path.suffix.lower() == ".npy":
+        batch = np.load(path, mmap_mode="r")
+    else:
+        batch = np.loadtxt(path, dtype=np.float64, ndmin=2)
+
+    if batch.size % 12 != 0 or (batch.ndim == 3 and batch.shape[1:] != (4, 3)):
+        raise ValueError(
+            "The quadruplets must have the shape (N, 4, 3), or 12 coordinates per line.\n"
+            f"Entered: shape = {batch.shape}"
+        )
+
+    return batch.reshape(-1, 4, 3)
+
+
+def evaluate_in_batches(
+    potential: CommandLinePotential,
+    batch: NDArray[np.float64],
+    batch_size: int,
+    backend: str = "numpy",
+) -> NDArray[np.float64]:
+    """The energies of the quadruplets, evaluated `batch_size` quadruplets at a time."""
+    energies = np.empty(len(batch), dtype=np.float64)
+    for start in range(0, len(batch), batch_size):
+        stop = min(start + batch_size, len(batch))
+        energies[start:stop] = potential.evaluate_batch(
+            np.asarray(batch[start:stop], dtype=np.float64), backend=backend
+        )
+
+    return energies
+
+
+def write_energies(energies: NDArray[np.float64], output_file: TextIO) -> None:
+    for energy in energies.tolist():
+        output_file.write(f"{energy!r}\n")
+
+
+def _output_format(output: str, output_format: Optional[str]) -> str:
+    if output_format is None:
+        output_format = "npy" if output.lower().endswith(".npy") else "txt"
+
+    if output_format == "npy" and output == "-":
+        raise ValueError(
+            "The 'npy' format needs an output file.\n" f"Entered: output = {output!r}"
+        )
+
+    return output_format
+
+
+def _check_positive(name: str, value: int) -> None:
+    if value <= 0:
+        raise ValueError(f"The {name} must be positive.\n" f"Entered: {value}")
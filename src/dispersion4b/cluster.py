@@ -0,0 +1,198 @@
+"""
+This module contains the ClusterDispersionEnergy class, which calculates the total
+four-body dispersion interaction energy of a cluster of identical particles.
+
+The total energy is the sum of the interaction energies of all the quadruplets in the
+cluster. Only quadruplets that fall within a cutoff are included; these are found with
+a cell list (see `neighbor_list.py`), which avoids the O(N^4) enumeration of all the
+quadruplets in the cluster.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+from typing import Protocol
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.neighbor_list import enumerate_quadruplets
+from dispersion4b.pair_geometry import PairGeometry
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.periodic import check_cutoff_fits_box
+
+
+class BatchPotential(Protocol):
+    """
+    Any potential that can evaluate the energies of a batch of quadruplets.
+
+    A potential that also has an `energies_from_squared_distances()` method (like the
+    `FourBodyDispersionPotential` and the `QuadrupletDispersionPotential`) is given
+    only the `(N, 6)` squared pair distances of each batch instead.
+    """
+
+    def energies_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> NDArray[np.float64]: ...
+
+
+class ClusterDispersionEnergy:
+    """
+    Calculate the total four-body dispersion interaction energy of a cluster, from
+    all the quadruplets that fall within the cutoff.
+
+    potential
+    - the four-body potential used for each quadruplet; for example, the
+      `FourBodyDispersionPotential` or the `QuadrupletDispersionPotential`
+    pair_cutoff
+    - a quadruplet is only included if all six of its pair distances are less than
+      the pair cutoff
+    sidelength_sum_cutoff
+    - a quadruplet is only included if the sum of its six pair distances (the
+      `sum_of_sidelengths` distance parameter) is less than this cutoff; the sum of the
+      sidelengths is at least three times the largest pair distance, so only pairs
+      closer than a third of this cutoff need to be searched
+    batch_size
+    - the number of quadruplets evaluated at once; limits the memory used
+    box
+    - if given, the particles are in this periodic box, and all the pair separations
+      follow the minimum image convention; the pair cutoff must be at most a third of
+      the smallest perpendicular width of the box (see `PeriodicBox.max_quadruplet_cutoff()`)
+    """
+
+    def __init__(
+        self,
+        potential: BatchPotential,
+        pair_cutoff: Optional[float] = None,
+        sidelength_sum_cutoff: Optional[float] = None,
+        batch_size: int = 65536,
+        box: Optional[PeriodicBox] = None,
+    ) -> None:
+        self._check_cutoffs(pair_cutoff, sidelength_sum_cutoff)
+        self._check_batch_size_positive(batch_size)
+
+        self._potential = potential
+        self._pair_cutoff = _search_cutoff(pair_cutoff, sidelength_sum_cutoff)
+        self._sidelength_sum_cutoff = sidelength_sum_cutoff
+        self._batch_size = batch_size
+        self._box = box
+
+        # the buffers for the geometry of each batch are reused across batches and calls
+        self._geometry = PairGeometry()
+
+        if box is not None:
+            check_cutoff_fits_box(self._pair_cutoff, box.max_quadruplet_cutoff())
+
+    def __call__(self, positions: ArrayLike) -> float:
+        positions = as_positions(positions)
+        quadruplets = self.quadruplets(positions)
+
+        return float(np.sum(self.energies(positions, quadruplets)))
+
+    def quadruplets(self, positions: ArrayLike) -> NDArray[np.int64]:
+        """
+        The `(M, 4)` indices of the quadruplets whose pair distances all fall within the
+        pair cutoff. The sum of sidelengths cutoff is applied later, in `energies()`,
+        where the pair distances are already available.
+        """
+        return enumerate_quadruplets(positions, self._pair_cutoff, self._box)
+
+    def energies(
+        self, positions: ArrayLike, quadruplets: NDArray[np.int64]
+    ) -> NDArray[np.float64]:
+        """
+        The interaction energy of each of the given quadruplets; quadruplets outside
+        the sum of sidelengths cutoff (or, for candidates that were not enumerated
+        within the pair cutoff, outside the pair cutoff) are given an energy of zero.
+        """
+        positions = as_positions(positions)
+        energies = np.zeros(len(quadruplets), dtype=np.float64)
+
+        # a potential that works from the squared pair distances alone (see `gram.py`)
+        # is given only those, which skips building the unit vectors
+        energies_from_squared_distances = getattr(
+            self._potential, "energies_from_squared_distances", None
+        )
+
+        for start in range(0, len(quadruplets), self._batch_size):
+            stop = start + self._batch_size
+
+            geometry: tuple[NDArray[np.float64], ...]
+            if energies_from_squared_distances is None:
+                evaluate = self._potential.energies_from_geometry
+                geometry = self._geometry.from_positions(
+                    positions, quadruplets[start:stop], self._box
+                )
+                distances = geometry[0]
+            else:
+                evaluate = energies_from_squared_distances
+                geometry = (
+                    self._geometry.squared_distances_from_positions(
+                        positions, quadruplets[start:stop], self._box
+                    ),
+                )
+                distances = np.sqrt(geometry[0])
+
+            mask = self._within_cutoffs(distances)
+            if mask is None:
+                energies[start:stop] = evaluate(*geometry)
+            else:
+                energies[start:stop][mask] = evaluate(
+                    *(array[mask] for array in geometry)
+                )
+
+        return energies
+
+    def _within_cutoffs(
+        self, distances: NDArray[np.float64]
+    ) -> Optional[NDArray[np.bool_]]:
+        """
+        Which of the quadruplets, given by their `(N, 6)` pair distances, fall within
+        the cutoffs not already applied by `quadruplets()`; None if all of them do.
+        """
+        if self._sidelength_sum_cutoff is None:
+            return None
+
+        within_sidelength_sum_cutoff: NDArray[np.bool_] = (
+            np.sum(distances, axis=1) < self._sidelength_sum_cutoff
+        )
+        return within_sidelength_sum_cutoff
+
+    def _check_cutoffs(
+        self, pair_cutoff: Optional[float], sidelength_sum_cutoff: Optional[float]
+    ) -> None:
+        if pair_cutoff is None and sidelength_sum_cutoff is None:
+            raise ValueError(
+                "At least one of the pair cutoff or the sum of sidelengths cutoff must be given."
+            )
+
+        for name, cutoff in [
+            ("pair_cutoff", pair_cutoff),
+            ("sidelength_sum_cutoff", sidelength_sum_cutoff),
+        ]:
+            if cutoff is not None and cutoff <= 0.0:
+                raise ValueError(
+                    "The cutoff must be positive.\n" f"Entered: {name} = {cutoff}"
+                )
+
+    def _check_batch_size_positive(self, batch_size: int) -> None:
+        if batch_size <= 0:
+            raise ValueError(
+                "The batch size must be positive.\n"
+                f"Entered: batch_size = {batch_size}"
+            )
+
+
+def _search_cutoff(
+    pair_cutoff: Optional[float], sidelength_sum_cutoff: Optional[float]
+) -> float:
+    """The largest pair distance that a quadruplet within both cutoffs can have."""
+    cutoffs = []
+    if pair_cutoff is not None:
+        cutoffs.append(pair_cutoff)
+    if sidelength_sum_cutoff is not None:
+        cutoffs.append(sidelength_sum_cutoff / 3.0)
+
+    return min(cutoffs)
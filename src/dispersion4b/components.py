@@ -0,0 +1,167 @@
+"""
+This module contains the BadeComponentPotential class, which calculates any subset of
+the pair, triplet, and quadruplet components of the Bade dispersion interaction energy
+from a single calculation of the geometry of each quadruplet.
+
+The full Bade potential (`potential.py`) and the quadruplet-only potential
+(`quadruplet_potential.py`) each calculate the six distances and unit vectors of each
+quadruplet. When both the total energy and its decomposition are needed (for example,
+to compare the quadruplet component to the total interaction, as in
+`coefficients.q12_parahydrogen_midzuno_kihara()`), this potential calculates the shared
+geometry only once, and passes it to the same kernels in `batched.py` that the
+potentials use.
+"""
+
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from cartesian import CartesianND
+
+from dispersion4b import batched
+from dispersion4b.utils import as_point_array
+
+
+class BadeComponent(enum.Flag):
+    """The components of the Bade dispersion interaction energy."""
+
+    PAIR = enum.auto()
+    TRIPLET = enum.auto()
+    QUADRUPLET = enum.auto()
+    ALL = PAIR | TRIPLET | QUADRUPLET
+
+
+@dataclass(frozen=True)
+class BadeComponentEnergies:
+    """
+    The energies of each requested component of the Bade interaction, for a batch of
+    quadruplets; components that were not requested are `None`.
+    """
+
+    pair: Optional[NDArray[np.float64]]
+    triplet: Optional[NDArray[np.float64]]
+    quadruplet: Optional[NDArray[np.float64]]
+
+    @property
+    def total(self) -> NDArray[np.float64]:
+        """The sum of all the requested components."""
+        energies = [
+            energy
+            for energy in (self.pair, self.triplet, self.quadruplet)
+            if energy is not None
+        ]
+
+        total = energies[0].copy()
+        for energy in energies[1:]:
+            total += energy
+
+        return total
+
+
+class BadeComponentPotential:
+    """
+    Calculate the requested components of the dipole^4 dispersion interaction energy
+    between four identical pointwise particles.
+
+    coeff
+    - the coefficient determining the interaction strength; it is shared by all the
+      components
+    components
+    - the components included in the energy; for example,
+      `BadeComponent.PAIR | BadeComponent.QUADRUPLET`
+    """
+
+    _coeff: float  # coefficient determining interaction strength
+
+    def __init__(
+        self, coeff: float, components: BadeComponent = BadeComponent.ALL
+    ) -> None:
+        self._check_coeff_positive(coeff)
+        self._check_components_not_empty(components)
+
+        self._coeff = coeff
+        self._components = components
+
+    @property
+    def components(self) -> BadeComponent:
+        return self._components
+
+    def __call__(
+        self, p0: CartesianND, p1: CartesianND, p2: CartesianND, p3: CartesianND
+    ) -> float:
+        points = as_point_array([p0, p1, p2, p3])
+        return float(self.evaluate_batch(points[np.newaxis])[0])
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]:
+        """
+        Calculate the sum of the requested components for a batch of quadruplets,
+        given as an `(N, 4, 3)` array of points; returns an `(N,)` array of energies.
+        """
+        return self.evaluate_components(points).total
+
+    def evaluate_components(self, points: ArrayLike) -> BadeComponentEnergies:
+        """
+        Calculate each requested component separately for a batch of quadruplets,
+        given as an `(N, 4, 3)` array of points.
+        """
+        batch = batched.as_quadruplet_batch(points)
+        separations = batched.pair_separations(batch)
+        distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+        return self.components_from_geometry(distances, unit_vectors)
+
+    def energies_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Calculate the sum of the requested components from the `(N, 6)` pair distances
+        and the `(N, 6, 3)` unit vectors of a batch of quadruplets, in the pair order
+        given by `batched.PAIR_INDICES`.
+        """
+        return self.components_from_geometry(distances, unit_vectors).total
+
+    def components_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> BadeComponentEnergies:
+        """
+        Calculate each requested component separately, from the pair distances and
+        unit vectors of a batch of quadruplets.
+        """
+        pair = None
+        triplet = None
+        quadruplet = None
+
+        if BadeComponent.PAIR in self._components:
+            pair = -self._coeff * batched.pair_contributions(distances)
+
+        if BadeComponent.TRIPLET in self._components:
+            triplet = -self._coeff * batched.triplet_contributions(
+                distances, unit_vectors
+            )
+
+        if BadeComponent.QUADRUPLET in self._components:
+            quadruplet = -self._coeff * batched.quadruplet_contributions(
+                distances, unit_vectors
+            )
+
+        return BadeComponentEnergies(pair=pair, triplet=triplet, quadruplet=quadruplet)
+
+    def _check_coeff_positive(self, coeff: float) -> None:
+        if coeff <= 0.0:
+            raise ValueError(
+                "The C12 coefficient for the interaction must be positive.\n"
+                f"Entered: coeff = {coeff}"
+            )
+
+    def _check_components_not_empty(self, components: BadeComponent) -> None:
+        if not components:
+            raise ValueError(
+                "At least one component of the interaction must be included.\n"
+                f"Entered: components = {components}"
+            )
@@ -0,0 +1,172 @@
+"""
+This module contains the DipoleTensorClusterEnergy class, which calculates the total
+four-body dispersion interaction energy of a cluster from all of its quadruplets,
+exactly, without enumerating them.
+
+For a pair of particles `(i, j)` with separation `r_ij` along the unit vector `u_ij`,
+the dipole tensor is the 3x3 matrix
+
+    T_ij = (3 u_ij u_ij^T - I) / r_ij^3
+
+and the angular terms of the quadruplet component around the cycle
+`i -> j -> k -> l -> i` are, divided by the distance terms, a ninth of the trace
+`Tr(T_ij T_jk T_kl T_li)`. The quadruplet component sums over the three cycles of a
+quadruplet in both directions, so summed over all the quadruplets it becomes a sum over
+all the sequences `(i, j, k, l)` of four distinct particles, each cycle appearing eight
+times (once for each starting particle and direction).
+
+Let `T` be the `(3N, 3N)` matrix made of the dipole tensors of all the pairs, with zero
+blocks on the diagonal. Then `Tr(T^4)` is the same sum over all the sequences in which
+only neighbouring particles differ; the sequences that also have `i == k` or `j == l`
+only involve pairs, and are subtracted with
+
+    A_i = sum_j T_ij^2 = 3 Q_i + a_i I
+    a_i = sum_j r_ij^-6
+    Q_i = sum_j r_ij^-6 u_ij u_ij^T
+
+so that the sum of the quadruplet components over all the quadruplets is
+
+    [Tr(T^4) - 18 sum_i (|Q_i|^2 + a_i^2) + 18 sum_{i != j} r_ij^-12] / 36
+
+The pair and triplet components of the `FourBodyDispersionPotential` only depend on
+the pairs and the triplets of a quadruplet; each pair is shared by `C(N - 2, 2)`
+quadruplets, and each triplet by `N - 3`, so their sums need only `a_i`, `Q_i`, and
+the `r_ij^-12`.
+
+The result is exact (up to rounding). `Tr(T^4)` is the squared Frobenius norm of `T^2`,
+which costs a single O(N^3) matrix product; everything else costs O(N^2). The matrix
+`T` takes `72 N^2` bytes of memory (about 72 MB for 1000 particles), and `T^2` is
+calculated a block of rows at a time. All the quadruplets are included, with no cutoff,
+and periodic boxes are not supported.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+class DipoleTensorClusterEnergy:
+    """
+    Calculate the total four-body dispersion interaction energy of a cluster, from all
+    of its quadruplets, through the dipole tensors of its pairs.
+
+    potential
+    - either the `FourBodyDispersionPotential`, or the `QuadrupletDispersionPotential`
+      (the quadruplet component only)
+    block_size
+    - the number of particles whose rows of the matrices are calculated at once; each
+      block uses about `72 * block_size * N` bytes of memory
+    """
+
+    def __init__(
+        self,
+        potential: Union[FourBodyDispersionPotential, QuadrupletDispersionPotential],
+        block_size: int = 256,
+    ) -> None:
+        self._check_block_size_positive(block_size)
+
+        if isinstance(potential, FourBodyDispersionPotential):
+            self._coeff = potential.c12_coeff
+            self._quadruplet_only = False
+        elif isinstance(potential, QuadrupletDispersionPotential):
+            self._coeff = potential.coeff
+            self._quadruplet_only = True
+        else:
+            raise TypeError(
+                "The potential must be a `FourBodyDispersionPotential` or a "
+                "`QuadrupletDispersionPotential`.\n"
+                f"Entered: {type(potential).__name__}"
+            )
+
+        self._block_size = block_size
+
+    def __call__(self, positions: ArrayLike) -> float:
+        """The total energy of the cluster, given as an `(N, 3)` array of positions."""
+        positions = as_positions(positions)
+        n_particles = len(positions)
+        if n_particles < 4:
+            return 0.0
+
+        tensors, a_sums, q_sq_norms, inv_r12_sum = self._pair_sums(positions)
+
+        trace_fourth_power = 0.0
+        for start in range(0, 3 * n_particles, 3 * self._block_size):
+            stop = start + 3 * self._block_size
+            rows = tensors[start:stop] @ tensors
+            trace_fourth_power += float(np.vdot(rows, rows))
+
+        angular_sum = float(np.sum(q_sq_norms + a_sums * a_sums))
+        # `inv_r12_sum` counts each pair twice
+        quadruplet = (
+            trace_fourth_power - 18.0 * angular_sum + 18.0 * inv_r12_sum
+        ) / 36.0
+
+        if self._quadruplet_only:
+            return -self._coeff * quadruplet
+
+        pair = 0.5 * inv_r12_sum * math.comb(n_particles - 2, 2)
+        triplet = 0.5 * (angular_sum - 2.0 * inv_r12_sum) * (n_particles - 3)
+
+        return -self._coeff * (pair + triplet + quadruplet)
+
+    def _pair_sums(
+        self, positions: NDArray[np.float64]
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], float]:
+        """
+        The `(3N, 3N)` matrix of the dipole tensors of all the pairs, the `a_i`, the
+        `|Q_i|^2`, and the sum of `r_ij^-12` over all `i != j`.
+        """
+        n_particles = len(positions)
+        tensors = np.empty((n_particles, 3, n_particles, 3), dtype=np.float64)
+        a_sums = np.empty(n_particles, dtype=np.float64)
+        q_sq_norms = np.empty(n_particles, dtype=np.float64)
+        inv_r12_sum = 0.0
+
+        for start in range(0, n_particles, self._block_size):
+            stop = min(start + self._block_size, n_particles)
+            separations = (
+                positions[np.newaxis, :, :] - positions[start:stop, np.newaxis]
+            )
+            sq_distances = np.einsum("ijk,ijk->ij", separations, separations)
+            sq_distances[np.arange(stop - start), np.arange(start, stop)] = np.inf
+
+            inv_r3 = 1.0 / (sq_distances * np.sqrt(sq_distances))
+            inv_r6 = inv_r3 * inv_r3
+
+            # `T_ij[a, b] = 3 s_a s_b / r^5 - delta_ab / r^3`, for the separation `s`
+            outer = np.einsum(
+                "ij,ija,ijb->iajb", inv_r3 / sq_distances, separations, separations
+            )
+            tensors[start:stop] = 3.0 * outer
+            for axis in range(3):
+                tensors[start:stop, axis, :, axis] -= inv_r3
+
+            q_matrices = np.einsum(
+                "ij,ija,ijb->iab", inv_r6 / sq_distances, separations, separations
+            )
+            a_sums[start:stop] = np.sum(inv_r6, axis=1)
+            q_sq_norms[start:stop] = np.sum(q_matrices * q_matrices, axis=(1, 2))
+            inv_r12_sum += float(np.sum(inv_r6 * inv_r6))
+
+        return (
+            tensors.reshape(3 * n_particles, 3 * n_particles),
+            a_sums,
+            q_sq_norms,
+            inv_r12_sum,
+        )
+
+    def _check_block_size_positive(self, block_size: int) -> None:
+        if block_size <= 0:
+            raise ValueError(
+                "The block size must be positive.\n"
+                f"Entered: block_size = {block_size}"
+            )
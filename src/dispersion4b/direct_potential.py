@@ -10,6 +10,9 @@ import itertools
 from cartesian import CartesianND
 from cartesian.operations import dot_product
 
+from dispersion4b import scalar
+from dispersion4b.utils import PointLike
+from dispersion4b.utils import are_all_cartesian
 from dispersion4b.utils import distance_and_unit_vector
 
 
@@ -27,11 +30,14 @@ class DirectFourBodyDispersionPotential:
         self._c12_coeff = c12_coeff
 
     def __call__(
-        self, p0: CartesianND, p1: CartesianND, p2: CartesianND, p3: CartesianND
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
     ) -> float:
+        points = (p0, p1, p2, p3)
+        if not are_all_cartesian(points, CartesianND):
+            return self._call_with_coordinates(*points)
+
         total_energy = 0.0
 
-        points = [p0, p1, p2, p3]
         for (i, j, k, l) in itertools.product(range(4), repeat=4):
             if i != j and j != k and k != l and l != i:
                 pi = points[i]
@@ -43,6 +49,18 @@ class DirectFourBodyDispersionPotential:
 
         return -self._c12_coeff * total_energy
 
+    def _call_with_coordinates(self, *points: PointLike) -> float:
+        coords = [scalar.as_coordinates(point) for point in points]
+
+        total_energy = 0.0
+        for i, j, k, l in itertools.product(range(4), repeat=4):
+            if i != j and j != k and k != l and l != i:
+                total_energy += scalar.cycle_contribution_from_points(
+                    coords[i], coords[j], coords[k], coords[l]
+                )
+
+        return -self._c12_coeff * total_energy
+
 
 def _quadruplet_contribution_from_points(
     p_i: CartesianND,
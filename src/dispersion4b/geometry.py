@@ -0,0 +1,49 @@
+"""
+This module contains the QuadrupletGeometry class, which holds the pair distances and
+unit vectors of one quadruplet (or a batch of quadruplets), so that they only need to
+be calculated once and can be shared by every part of a potential.
+
+The arrays follow the layout used in `batched.py`: the points have the shape
+`(..., 4, 3)`, the distances `(..., 6)`, and the unit vectors `(..., 6, 3)`, with the
+six pairs in the order given by `batched.PAIR_INDICES`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from cartesian import CartesianND
+
+from dispersion4b import batched
+from dispersion4b.utils import as_point_array
+
+
+@dataclass(frozen=True)
+class QuadrupletGeometry:
+    points: NDArray[np.float64]
+    distances: NDArray[np.float64]
+    unit_vectors: NDArray[np.float64]
+
+    @classmethod
+    def from_points(
+        cls, points: Union[Sequence[CartesianND], ArrayLike]
+    ) -> QuadrupletGeometry:
+        """
+        Calculate the geometry from the four points of a single quadruplet, or from an
+        `(N, 4, 3)` array holding a batch of quadruplets.
+        """
+        if isinstance(points, np.ndarray):
+            points = np.asarray(points, dtype=np.float64)
+        else:
+            points = as_point_array(points)
+
+        separations = batched.pair_separations(points)
+        distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+        return cls(points=points, distances=distances, unit_vectors=unit_vectors)
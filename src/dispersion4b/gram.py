@@ -0,0 +1,181 @@
+"""
+Distance-only versions of the pair, triplet, and quadruplet contributions to the Bade
+dispersion interaction energy.
+
+Every cosine in the Bade formula is the dot product of two unit vectors along the pair
+separations of the quadruplet. The dot product of two (unnormalized) separations can be
+found from the six squared pair distances alone, since
+    (r_a - r_b) . (r_c - r_d) = (|r_a - r_d|^2 + |r_b - r_c|^2
+                                 - |r_a - r_c|^2 - |r_b - r_d|^2) / 2
+
+Each term of the energy is a ratio of such dot products and squared distances, so the
+pair and triplet contributions need no square roots at all, and each quadruplet cycle
+needs a single square root (of the product of its four squared distances). No unit
+vectors are ever built.
+
+The squared distances are stored in the pair order given by `batched.PAIR_INDICES`.
+As in `batched.py`, the functions only depend on the position of the last axis, so
+they work on a single quadruplet (an array of shape `(6,)`) as well as on a batch.
+
+The potentials expose these functions through `energies_from_squared_distances()`,
+which `ClusterDispersionEnergy` and the worker pools in `parallel.py` use for each batch
+in place of the unit vectors.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+
+# the distance between a point and itself is placed in an extra slot after the six
+# squared pair distances; this slot always holds zero
+_ZERO_SLOT = 6
+
+
+def _distance_slots() -> NDArray[np.int64]:
+    """The slot of the squared distance between each pair of the four points."""
+    slots = np.full((4, 4), _ZERO_SLOT, dtype=np.int64)
+    for slot, (i, j) in enumerate(batched.PAIR_INDICES):
+        slots[i, j] = slot
+        slots[j, i] = slot
+
+    return slots
+
+
+_DISTANCE_SLOT = _distance_slots()
+
+
+def _dot_product_slots(
+    separation_pairs: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    For each pair of separations `(a, b)`, the slots of the two squared distances that
+    are added, and of the two that are subtracted, in the dot product of `a` and `b`.
+    """
+    first = batched.FIRST_POINT
+    second = batched.SECOND_POINT
+
+    sep_a = separation_pairs[..., 0]
+    sep_b = separation_pairs[..., 1]
+
+    added = np.stack(
+        [
+            _DISTANCE_SLOT[first[sep_a], second[sep_b]],
+            _DISTANCE_SLOT[second[sep_a], first[sep_b]],
+        ],
+        axis=-1,
+    )
+    subtracted = np.stack(
+        [
+            _DISTANCE_SLOT[first[sep_a], first[sep_b]],
+            _DISTANCE_SLOT[second[sep_a], second[sep_b]],
+        ],
+        axis=-1,
+    )
+
+    return added, subtracted
+
+
+_TRIPLET_ADDED, _TRIPLET_SUBTRACTED = _dot_product_slots(batched.TRIPLET_PAIRS)
+
+# the six dot products of each quadruplet cycle, in the order
+#     (ij.jk, ij.kl, ij.li, jk.kl, jk.li, kl.li)
+_CYCLE_DOT_ORDER = np.array([(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)])
+_QUADRUPLET_ADDED, _QUADRUPLET_SUBTRACTED = _dot_product_slots(
+    batched.QUADRUPLET_CYCLES[:, _CYCLE_DOT_ORDER]
+)
+
+
+def squared_pair_distances(batch: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The six squared pair distances of each quadruplet, as an `(N, 6)` array."""
+    separations = batched.pair_separations(batch)
+    return np.einsum("...i,...i->...", separations, separations)
+
+
+def pair_contributions(squared_distances: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The sum of the six two-particle contributions of each quadruplet."""
+    return np.sum(1.0 / squared_distances**6, axis=-1)
+
+
+def triplet_contributions(
+    squared_distances: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The sum of the twelve three-particle contributions of each quadruplet."""
+    sq_ij = squared_distances[..., batched.TRIPLET_PAIRS[:, 0]]
+    sq_jk = squared_distances[..., batched.TRIPLET_PAIRS[:, 1]]
+    dot_ijjk = _dot_products(squared_distances, _TRIPLET_ADDED, _TRIPLET_SUBTRACTED)
+
+    # (1 + cos^2) / (r_ij r_jk)^6, with cos^2 = dot^2 / (r_ij^2 r_jk^2)
+    sq_product = sq_ij * sq_jk
+
+    return np.sum((sq_product + dot_ijjk**2) / sq_product**4, axis=-1)
+
+
+def quadruplet_contributions(
+    squared_distances: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The sum of the three four-particle contributions of each quadruplet, including
+    the factor of 2 that accounts for each cycle being traversed in both directions.
+    """
+    sq_ij, sq_jk, sq_kl, sq_li = (
+        squared_distances[..., batched.QUADRUPLET_CYCLES[:, k]] for k in range(4)
+    )
+
+    dots = _dot_products(squared_distances, _QUADRUPLET_ADDED, _QUADRUPLET_SUBTRACTED)
+    dot_ijjk, dot_ijkl, dot_ijli, dot_jkkl, dot_jkli, dot_klli = (
+        dots[..., k] for k in range(6)
+    )
+
+    # the numerator of the scalar implementation, multiplied through by the product
+    # of the four squared distances, so that every cosine is replaced by a dot product
+    sq_product = sq_ij * sq_jk * sq_kl * sq_li
+
+    # begin with the constant contribution
+    numer = -sq_product
+
+    # the squared pair prods
+    numer += (
+        dot_ijjk**2 * sq_kl * sq_li
+        + dot_ijkl**2 * sq_jk * sq_li
+        + dot_ijli**2 * sq_jk * sq_kl
+        + dot_jkkl**2 * sq_ij * sq_li
+        + dot_jkli**2 * sq_ij * sq_kl
+        + dot_klli**2 * sq_ij * sq_jk
+    )
+
+    # the triplets
+    numer -= 3.0 * (
+        (dot_ijjk * dot_jkkl * dot_ijkl) * sq_li
+        + (dot_ijjk * dot_jkli * dot_ijli) * sq_kl
+        + (dot_ijkl * dot_klli * dot_ijli) * sq_jk
+        + (dot_jkkl * dot_klli * dot_jkli) * sq_ij
+    )
+
+    # the quadruplet term
+    numer += 9.0 * (dot_ijjk * dot_jkkl * dot_klli * dot_ijli)
+
+    # the denominator of the scalar implementation is sq_product^(3/2)
+    denom = sq_product**2 * np.sqrt(sq_product)
+
+    return 2.0 * np.sum(numer / denom, axis=-1)
+
+
+def _dot_products(
+    squared_distances: NDArray[np.float64],
+    added: NDArray[np.int64],
+    subtracted: NDArray[np.int64],
+) -> NDArray[np.float64]:
+    """The dot products between pairs of separations, from the squared distances."""
+    padded = np.concatenate(
+        [squared_distances, np.zeros_like(squared_distances[..., :1])], axis=-1
+    )
+
+    return 0.5 * (
+        padded[..., added[..., 0]]
+        + padded[..., added[..., 1]]
+        - padded[..., subtracted[..., 0]]
+        - padded[..., subtracted[..., 1]]
+    )
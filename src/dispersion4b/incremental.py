@@ -0,0 +1,257 @@
+"""
+This module contains the IncrementalClusterEnergy class, which keeps track of the total
+four-body dispersion energy of a cluster as single particles are moved one at a time,
+as they are in Metropolis Monte Carlo and path integral Monte Carlo simulations.
+
+When a single particle moves, only the quadruplets that contain that particle change
+their energy. The evaluator caches the matrix of pair distances and unit vectors of
+the whole cluster, so a trial move only needs to calculate the distances from the moved
+particle to all the others, and the energies of the quadruplets that contain it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+from dispersion4b.cluster import BatchPotential
+from dispersion4b.neighbor_list import adjacent_triplets
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.neighbor_list import enumerate_quadruplets
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.periodic import check_cutoff_fits_box
+
+
+@dataclass(frozen=True)
+class _ProposedMove:
+    index: int
+    new_position: NDArray[np.float64]
+    new_distances: NDArray[np.float64]
+    new_unit_vectors: NDArray[np.float64]
+    old_quadruplets: NDArray[np.int64]
+    old_energies: NDArray[np.float64]
+    new_quadruplets: NDArray[np.int64]
+    new_energies: NDArray[np.float64]
+
+
+class IncrementalClusterEnergy:
+    """
+    Track the total four-body dispersion energy of a cluster under single-particle moves.
+
+    potential
+    - the four-body potential used for each quadruplet; for example, the
+      `QuadrupletDispersionPotential`
+    positions
+    - the `(N, 3)` initial positions of the particles; these are copied
+    cutoff
+    - a quadruplet is only included if all six of its pair distances are less than the
+      cutoff
+    box
+    - if given, the particles are in this periodic box, and all the pair separations
+      follow the minimum image convention
+
+    The evaluator stores `(N, N)` distances and `(N, N, 3)` unit vectors, where the unit
+    vector `[i, j]` points from particle `j` to particle `i`.
+
+    A trial move is made with `propose_move()`, which returns the change in the total
+    energy; the move must then be either kept with `accept()` or undone with `reject()`.
+    """
+
+    def __init__(
+        self,
+        potential: BatchPotential,
+        positions: ArrayLike,
+        cutoff: float,
+        box: Optional[PeriodicBox] = None,
+    ) -> None:
+        self._check_cutoff_positive(cutoff)
+        if box is not None:
+            check_cutoff_fits_box(cutoff, box.max_quadruplet_cutoff())
+
+        self._potential = potential
+        self._cutoff = cutoff
+        self._box = box
+        self._positions = as_positions(positions).copy()
+        self._proposed: Optional[_ProposedMove] = None
+
+        self.recompute()
+
+    @property
+    def positions(self) -> NDArray[np.float64]:
+        """A read-only view of the current positions of the particles."""
+        view = self._positions.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def particle_energies(self) -> NDArray[np.float64]:
+        """
+        The energy of all the quadruplets that contain each particle; each quadruplet
+        contributes to the energies of all four of its particles.
+        """
+        view = self._particle_energies.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def total_energy(self) -> float:
+        return float(np.sum(self._particle_energies) / 4.0)
+
+    def recompute(self) -> None:
+        """
+        Recalculate all the cached distances, unit vectors, and energies from scratch;
+        this removes any floating-point drift accumulated over many accepted moves.
+        """
+        if self._proposed is not None:
+            raise RuntimeError("Cannot recompute the energies while a move is pending.")
+
+        separations = self._positions[:, np.newaxis, :] - self._positions[np.newaxis]
+        if self._box is not None:
+            separations = self._box.minimum_image(separations)
+
+        distances = np.sqrt(np.einsum("ijk,ijk->ij", separations, separations))
+        np.fill_diagonal(distances, np.inf)
+
+        self._distances = distances
+        self._unit_vectors = separations / distances[:, :, np.newaxis]
+
+        quadruplets = enumerate_quadruplets(self._positions, self._cutoff, self._box)
+        energies = self._energies(quadruplets)
+
+        self._particle_energies = np.zeros(len(self._positions), dtype=np.float64)
+        np.add.at(self._particle_energies, quadruplets, energies[:, np.newaxis])
+
+    def propose_move(self, index: int, new_position: ArrayLike) -> float:
+        """
+        Calculate the change in the total energy if the particle at `index` were moved
+        to `new_position`; the cached state is not changed until `accept()` is called.
+        """
+        if self._proposed is not None:
+            raise RuntimeError(
+                "A proposed move is already pending; call accept() or reject() first."
+            )
+
+        new_position = np.asarray(new_position, dtype=np.float64)
+        new_separations = self._positions - new_position
+        if self._box is not None:
+            new_separations = self._box.minimum_image(new_separations)
+        new_distances = np.sqrt(np.einsum("ij,ij->i", new_separations, new_separations))
+        new_distances[index] = np.inf
+        new_unit_vectors = new_separations / new_distances[:, np.newaxis]
+
+        old_quadruplets = self._quadruplets_containing(index, self._distances[:, index])
+        old_energies = self._energies(old_quadruplets)
+
+        new_quadruplets = self._quadruplets_containing(index, new_distances)
+        new_energies = self._energies(new_quadruplets, new_distances, new_unit_vectors)
+
+        self._proposed = _ProposedMove(
+            index=index,
+            new_position=new_position,
+            new_distances=new_distances,
+            new_unit_vectors=new_unit_vectors,
+            old_quadruplets=old_quadruplets,
+            old_energies=old_energies,
+            new_quadruplets=new_quadruplets,
+            new_energies=new_energies,
+        )
+
+        return float(np.sum(new_energies) - np.sum(old_energies))
+
+    def accept(self) -> None:
+        """Keep the pending move, and update the cached state."""
+        move = self._pop_proposed()
+        index = move.index
+
+        self._positions[index] = move.new_position
+
+        self._distances[:, index] = move.new_distances
+        self._distances[index, :] = move.new_distances
+        self._unit_vectors[:, index] = move.new_unit_vectors
+        self._unit_vectors[index, :] = -move.new_unit_vectors
+        self._unit_vectors[index, index] = 0.0
+
+        np.add.at(
+            self._particle_energies,
+            move.old_quadruplets,
+            -move.old_energies[:, np.newaxis],
+        )
+        np.add.at(
+            self._particle_energies,
+            move.new_quadruplets,
+            move.new_energies[:, np.newaxis],
+        )
+        self._particle_energies[index] = np.sum(move.new_energies)
+
+    def reject(self) -> None:
+        """Discard the pending move."""
+        self._pop_proposed()
+
+    def _pop_proposed(self) -> _ProposedMove:
+        if self._proposed is None:
+            raise RuntimeError("There is no pending move; call propose_move() first.")
+
+        move = self._proposed
+        self._proposed = None
+
+        return move
+
+    def _quadruplets_containing(
+        self, index: int, distances_to_index: NDArray[np.float64]
+    ) -> NDArray[np.int64]:
+        """
+        The `(M, 4)` indices of the quadruplets within the cutoff that contain the
+        particle at `index`, with that particle in the first column.
+        """
+        candidates = np.flatnonzero(distances_to_index < self._cutoff)
+        if len(candidates) < 3:
+            return np.empty((0, 4), dtype=np.int64)
+
+        adjacent = self._distances[np.ix_(candidates, candidates)] < self._cutoff
+        others = candidates[adjacent_triplets(adjacent)]
+
+        return np.column_stack((np.full(len(others), index), others))
+
+    def _energies(
+        self,
+        quadruplets: NDArray[np.int64],
+        first_distances: Optional[NDArray[np.float64]] = None,
+        first_unit_vectors: Optional[NDArray[np.float64]] = None,
+    ) -> NDArray[np.float64]:
+        """
+        The energies of the given quadruplets, using the cached distances and unit
+        vectors. If `first_distances` and `first_unit_vectors` are given, they replace
+        the separations from the particle in the first column to every other particle;
+        this lets the energies be evaluated with that particle at a trial position.
+        """
+        n_quadruplets = len(quadruplets)
+        distances = np.empty((n_quadruplets, 6), dtype=np.float64)
+        unit_vectors = np.empty((n_quadruplets, 6, 3), dtype=np.float64)
+
+        for k, (i, j) in enumerate(batched.PAIR_INDICES):
+            idx_i = quadruplets[:, i]
+            idx_j = quadruplets[:, j]
+
+            if (
+                j == 0
+                and first_distances is not None
+                and first_unit_vectors is not None
+            ):
+                distances[:, k] = first_distances[idx_i]
+                unit_vectors[:, k] = first_unit_vectors[idx_i]
+            else:
+                distances[:, k] = self._distances[idx_i, idx_j]
+                unit_vectors[:, k] = self._unit_vectors[idx_i, idx_j]
+
+        return self._potential.energies_from_geometry(distances, unit_vectors)
+
+    def _check_cutoff_positive(self, cutoff: float) -> None:
+        if cutoff <= 0.0:
+            raise ValueError(
+                "The cutoff distance must be positive.\n" f"Entered: cutoff = {cutoff}"
+            )
@@ -0,0 +1,365 @@
+"""
+Opt-in instrumentation of the four-body potentials, for finding out where the time of
+a long run goes.
+
+The potentials themselves are never instrumented; instead, a potential is wrapped in
+an `InstrumentedPotential` (or an `InstrumentedAnalyticPotential`, or an
+`InstrumentedClusterEnergy`), which times each call it passes on to the public methods
+of the potential, and records the number of quadruplets and the time spent in each
+stage in an `EvaluationStats`. The wrappers never calculate anything themselves, so
+they always measure the same code that runs without them; and code that does not use
+the wrappers runs exactly as before, with no overhead at all.
+
+For example:
+```
+stats = EvaluationStats()
+potential = QuadrupletDispersionPotential(b12_coeff)
+cluster_energy = InstrumentedClusterEnergy(potential, stats, pair_cutoff=8.0)
+
+for positions in frames:
+    cluster_energy(positions)
+
+print(stats.summary())
+stats.dump("stats.json")
+```
+
+The stages are:
+- "dispersion": the dispersion potential, from the geometry (or the points) of the
+  quadruplets
+- "short_range": the short-range part of a `FourBodyAnalyticPotential`
+- "attenuation": the attenuation function of a `FourBodyAnalyticPotential`
+- "geometry": everything else done for a batch; the pair distances and unit vectors,
+  and the sum of sidelengths cutoff of a `ClusterDispersionEnergy`
+- "enumeration": finding the quadruplets within the cutoff, in `ClusterDispersionEnergy`
+
+The stages are nested (for example, "geometry" contains the calls to the potential),
+and the time spent in a nested stage is only counted in that stage, so the times of
+all the stages add up to the total time.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.shortrange.four_body_analytic_potential import DispersionPotential
+from dispersion4b.shortrange.four_body_analytic_potential import FourPoints
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.utils import PointLike
+
+
+@dataclass
+class EvaluationStats:
+    """
+    The number of quadruplets evaluated and pruned, and the time spent in each stage
+    of the evaluation.
+
+    quadruplets_evaluated
+    - the number of quadruplets whose energy was calculated
+    quadruplets_pruned
+    - the number of enumerated quadruplets skipped because they fall outside the sum of
+      sidelengths cutoff of a `ClusterDispersionEnergy`; quadruplets outside the pair
+      cutoff are never enumerated, and are not counted
+    stage_seconds
+    - the total time spent in each stage, in seconds, not including the time spent in
+      the stages nested inside it
+    stage_calls
+    - the number of times each stage was run
+    """
+
+    quadruplets_evaluated: int = 0
+    quadruplets_pruned: int = 0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    stage_calls: dict[str, int] = field(default_factory=dict)
+
+    # the time spent in the nested stages of each stage that is still running
+    _nested_seconds: list[float] = field(
+        default_factory=list, repr=False, compare=False
+    )
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Add the time spent inside the `with` block to the given stage."""
+        start = time.perf_counter()
+        self._nested_seconds.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._nested_seconds.pop()
+            if self._nested_seconds:
+                self._nested_seconds[-1] += elapsed
+
+            self.stage_seconds[stage] = (
+                self.stage_seconds.get(stage, 0.0) + elapsed - nested
+            )
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.stage_seconds.values())
+
+    def reset(self) -> None:
+        self.quadruplets_evaluated = 0
+        self.quadruplets_pruned = 0
+        self.stage_seconds.clear()
+        self.stage_calls.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "quadruplets_evaluated": self.quadruplets_evaluated,
+            "quadruplets_pruned": self.quadruplets_pruned,
+            "stage_seconds": dict(self.stage_seconds),
+            "stage_calls": dict(self.stage_calls),
+        }
+
+    def dump(self, output: Union[str, Path, TextIO]) -> None:
+        """Write the stats as JSON to a file, given as either a path or an open file."""
+        if isinstance(output, (str, Path)):
+            with open(output, "w") as output_file:
+                json.dump(self.as_dict(), output_file, indent=2)
+        else:
+            json.dump(self.as_dict(), output, indent=2)
+
+    def summary(self) -> str:
+        """A human-readable table of the stats."""
+        lines = [
+            f"quadruplets evaluated: {self.quadruplets_evaluated}",
+            f"quadruplets pruned:    {self.quadruplets_pruned}",
+        ]
+
+        total_seconds = self.total_seconds
+        for stage, seconds in self.stage_seconds.items():
+            fraction = seconds / total_seconds if total_seconds > 0.0 else 0.0
+            lines.append(
+                f"{stage:<14} {seconds:12.6f} s  {100.0 * fraction:5.1f}%"
+                f"  ({self.stage_calls[stage]} calls)"
+            )
+
+        return "\n".join(lines)
+
+
+class InstrumentedPotential:
+    """
+    A dispersion potential (for example, a `FourBodyDispersionPotential` or a
+    `QuadrupletDispersionPotential`) that records the number of quadruplets it
+    evaluates, and the time it spends evaluating them. It passes every call on to the
+    potential it wraps, so it gives exactly the same energies, and can be used anywhere
+    that potential can (for example, in a `ClusterDispersionEnergy`).
+    """
+
+    # only present if the wrapped potential has it, so that a `ClusterDispersionEnergy`
+    # takes the same path through the wrapper as through the potential itself
+    energies_from_squared_distances: Callable[
+        [NDArray[np.float64]], NDArray[np.float64]
+    ]
+
+    def __init__(self, potential: DispersionPotential, stats: EvaluationStats) -> None:
+        self._potential = potential
+        self._stats = stats
+
+        energies_from_squared_distances = getattr(
+            potential, "energies_from_squared_distances", None
+        )
+        if energies_from_squared_distances is not None:
+            self.energies_from_squared_distances = self._counted(
+                energies_from_squared_distances
+            )
+
+    @property
+    def potential(self) -> DispersionPotential:
+        return self._potential
+
+    @property
+    def stats(self) -> EvaluationStats:
+        return self._stats
+
+    def __call__(
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
+    ) -> float:
+        self._stats.quadruplets_evaluated += 1
+        with self._stats.timed("dispersion"):
+            return self._potential(p0, p1, p2, p3)
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]:
+        with self._stats.timed("dispersion"):
+            energies = self._potential.evaluate_batch(points)
+
+        self._stats.quadruplets_evaluated += len(energies)
+        return energies
+
+    def energies_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        self._stats.quadruplets_evaluated += len(distances)
+        with self._stats.timed("dispersion"):
+            return self._potential.energies_from_geometry(distances, unit_vectors)
+
+    def energy_and_forces(
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
+    ) -> tuple[float, NDArray[np.float64]]:
+        self._stats.quadruplets_evaluated += 1
+        with self._stats.timed("dispersion"):
+            return self._potential.energy_and_forces(p0, p1, p2, p3)
+
+    def _counted(
+        self, method: Callable[[NDArray[np.float64]], NDArray[np.float64]]
+    ) -> Callable[[NDArray[np.float64]], NDArray[np.float64]]:
+        """Time the method, and count the quadruplets of the batch it is given."""
+
+        def counted_method(values: NDArray[np.float64]) -> NDArray[np.float64]:
+            self._stats.quadruplets_evaluated += len(values)
+            with self._stats.timed("dispersion"):
+                return method(values)
+
+        return counted_method
+
+
+class InstrumentedAnalyticPotential:
+    """
+    A `FourBodyAnalyticPotential` that records the time spent in its dispersion
+    potential, its short-range potential, and its attenuation function.
+
+    The wrapped potential is evaluated through a copy of it, whose three components are
+    wrapped to time each call made to them.
+    """
+
+    def __init__(
+        self, potential: FourBodyAnalyticPotential, stats: EvaluationStats
+    ) -> None:
+        self._potential = potential
+        self._stats = stats
+        self._instrumented = dataclasses.replace(
+            potential,
+            dispersion_potential=InstrumentedPotential(
+                potential.dispersion_potential, stats
+            ),
+            short_range_potential=_InstrumentedComponent(
+                potential.short_range_potential, stats, "short_range"
+            ),
+            short_long_attenuation=_InstrumentedComponent(
+                potential.short_long_attenuation, stats, "attenuation"
+            ),
+        )
+
+    @property
+    def potential(self) -> FourBodyAnalyticPotential:
+        return self._potential
+
+    @property
+    def stats(self) -> EvaluationStats:
+        return self._stats
+
+    def __call__(self, points: FourPoints) -> float:
+        with self._stats.timed("geometry"):
+            return self._instrumented(points)
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies of a batch of quadruplets, given as an
+        `(N, 4, 3)` array of points; returns an `(N,)` array of energies.
+        """
+        with self._stats.timed("geometry"):
+            return self._instrumented.evaluate_batch(points)
+
+
+class InstrumentedClusterEnergy(ClusterDispersionEnergy):
+    """
+    A `ClusterDispersionEnergy` that records the time spent finding the quadruplets
+    within the cutoff and evaluating them, and the number of quadruplets evaluated and
+    pruned by the sum of sidelengths cutoff.
+
+    The remaining arguments are the same as for `ClusterDispersionEnergy`.
+    """
+
+    def __init__(
+        self,
+        potential: DispersionPotential,
+        stats: EvaluationStats,
+        pair_cutoff: Optional[float] = None,
+        sidelength_sum_cutoff: Optional[float] = None,
+        batch_size: int = 65536,
+        box: Optional[PeriodicBox] = None,
+    ) -> None:
+        super().__init__(
+            InstrumentedPotential(potential, stats),
+            pair_cutoff=pair_cutoff,
+            sidelength_sum_cutoff=sidelength_sum_cutoff,
+            batch_size=batch_size,
+            box=box,
+        )
+        self._stats = stats
+
+    @property
+    def stats(self) -> EvaluationStats:
+        return self._stats
+
+    def quadruplets(self, positions: ArrayLike) -> NDArray[np.int64]:
+        with self._stats.timed("enumeration"):
+            return super().quadruplets(positions)
+
+    def energies(
+        self, positions: ArrayLike, quadruplets: NDArray[np.int64]
+    ) -> NDArray[np.float64]:
+        n_evaluated = self._stats.quadruplets_evaluated
+
+        with self._stats.timed("geometry"):
+            energies = super().energies(positions, quadruplets)
+
+        # every quadruplet not passed on to the potential was pruned
+        n_evaluated = self._stats.quadruplets_evaluated - n_evaluated
+        self._stats.quadruplets_pruned += len(quadruplets) - n_evaluated
+
+        return energies
+
+
+class _InstrumentedComponent:
+    """
+    A short-range potential or an attenuation function of a `FourBodyAnalyticPotential`,
+    whose calls (including to its optional methods, like `evaluate_batch()`) are timed as
+    the given stage.
+    """
+
+    def __init__(
+        self,
+        component: Callable[[FourPoints], float],
+        stats: EvaluationStats,
+        stage: str,
+    ) -> None:
+        self._component = component
+        self._stats = stats
+        self._stage = stage
+
+    def __call__(self, points: FourPoints) -> float:
+        with self._stats.timed(self._stage):
+            return self._component(points)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        # raises an AttributeError if the component has no such method, so that the
+        # potential falls back to calling the component, just as it would without it
+        method: Callable[..., Any] = getattr(self._component, name)
+
+        def timed_method(*args: Any, **kwargs: Any) -> Any:
+            with self._stats.timed(self._stage):
+                return method(*args, **kwargs)
+
+        return timed_method
@@ -0,0 +1,233 @@
+"""
+An optional compiled backend for the Bade dispersion interaction energy, using Numba.
+
+The kernels in this module loop over the quadruplets of a contiguous `(N, 4, 3)` batch
+in parallel, and calculate the pair, triplet, and quadruplet contributions of each
+quadruplet without creating any temporary arrays for the whole batch. They give the
+same results as the NumPy implementation in `batched.py`, to within floating-point
+rounding.
+
+Numba is an optional dependency, installed with the `numba` extra:
+    pip install dispersion4b[numba]
+
+If Numba is not installed, the functions in this module fall back to the NumPy
+implementation; `NUMBA_AVAILABLE` tells which one is used.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+from types import ModuleType
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+
+numba: Optional[ModuleType]
+try:
+    numba = importlib.import_module("numba")
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# the names of the backends that the potentials accept
+BACKENDS = ("numpy", "numba")
+
+_FIRST_POINT = batched.FIRST_POINT.astype(np.int64)
+_SECOND_POINT = batched.SECOND_POINT.astype(np.int64)
+_TRIPLET_PAIRS = batched.TRIPLET_PAIRS.astype(np.int64)
+_QUADRUPLET_CYCLES = batched.QUADRUPLET_CYCLES.astype(np.int64)
+
+FunctionT = TypeVar("FunctionT", bound=Callable[..., object])
+
+
+def full_contributions(batch: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    The sum of the pair, triplet, and quadruplet contributions of each quadruplet in
+    the batch; this is the energy of the `FourBodyDispersionPotential` without the
+    coefficient.
+    """
+    batch = batched.as_quadruplet_batch(batch)
+
+    if NUMBA_AVAILABLE:
+        return _compiled_contributions(batch, True)
+
+    separations = batched.pair_separations(batch)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+    return (
+        batched.pair_contributions(distances)
+        + batched.triplet_contributions(distances, unit_vectors)
+        + batched.quadruplet_contributions(distances, unit_vectors)
+    )
+
+
+def quadruplet_contributions(batch: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    The quadruplet contribution of each quadruplet in the batch; this is the energy
+    of the `QuadrupletDispersionPotential` without the coefficient.
+    """
+    batch = batched.as_quadruplet_batch(batch)
+
+    if NUMBA_AVAILABLE:
+        return _compiled_contributions(batch, False)
+
+    separations = batched.pair_separations(batch)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+    return batched.quadruplet_contributions(distances, unit_vectors)
+
+
+def check_backend(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"The backend must be one of {BACKENDS}.\n"
+            f"Entered: backend = {backend!r}"
+        )
+
+
+# ----------------------------------------------------------------------------------------
+# The kernels below are written so that Numba can compile them; they are only used when
+# Numba is installed, since they are far too slow to run as plain Python.
+# ----------------------------------------------------------------------------------------
+
+
+def _jitable(function: FunctionT) -> FunctionT:
+    """
+    Let the compiled kernels call the function, if Numba is installed; the function
+    itself is returned unchanged.
+    """
+    if numba is not None:
+        numba.extending.register_jitable(function)
+
+    return function
+
+
+@_jitable
+def _fill_geometry(
+    points: NDArray[np.float64],
+    distances: NDArray[np.float64],
+    unit_vectors: NDArray[np.float64],
+) -> None:
+    """Fill the six pair distances and unit vectors of a single quadruplet."""
+    for k in range(6):
+        i = _FIRST_POINT[k]
+        j = _SECOND_POINT[k]
+
+        sq_distance = 0.0
+        for axis in range(3):
+            separation = points[i, axis] - points[j, axis]
+            unit_vectors[k, axis] = separation
+            sq_distance += separation * separation
+
+        distance = math.sqrt(sq_distance)
+        distances[k] = distance
+        for axis in range(3):
+            unit_vectors[k, axis] /= distance
+
+
+@_jitable
+def _dot(unit_vectors: NDArray[np.float64], a: int, b: int) -> float:
+    dot: float = (
+        unit_vectors[a, 0] * unit_vectors[b, 0]
+        + unit_vectors[a, 1] * unit_vectors[b, 1]
+        + unit_vectors[a, 2] * unit_vectors[b, 2]
+    )
+    return dot
+
+
+@_jitable
+def _pair_and_triplet_contribution(
+    distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+) -> float:
+    total = 0.0
+
+    # the pair contribution
+    for k in range(6):
+        total += 1.0 / distances[k] ** 12
+
+    # the triplet contribution
+    for t in range(_TRIPLET_PAIRS.shape[0]):
+        vec_ij = _TRIPLET_PAIRS[t, 0]
+        vec_jk = _TRIPLET_PAIRS[t, 1]
+
+        cosine_ijk = _dot(unit_vectors, vec_ij, vec_jk)
+
+        numer = 1.0 + cosine_ijk**2
+        denom = (distances[vec_ij] * distances[vec_jk]) ** 6
+        total += numer / denom
+
+    return total
+
+
+@_jitable
+def _quadruplet_contribution(
+    distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+) -> float:
+    total = 0.0
+
+    for c in range(_QUADRUPLET_CYCLES.shape[0]):
+        vec_ij = _QUADRUPLET_CYCLES[c, 0]
+        vec_jk = _QUADRUPLET_CYCLES[c, 1]
+        vec_kl = _QUADRUPLET_CYCLES[c, 2]
+        vec_li = _QUADRUPLET_CYCLES[c, 3]
+
+        # the distance term
+        denom = (
+            distances[vec_ij]
+            * distances[vec_jk]
+            * distances[vec_kl]
+            * distances[vec_li]
+        ) ** 3
+
+        numer = batched.quadruplet_numerator(
+            _dot(unit_vectors, vec_ij, vec_jk),
+            _dot(unit_vectors, vec_ij, vec_kl),
+            _dot(unit_vectors, vec_ij, vec_li),
+            _dot(unit_vectors, vec_jk, vec_kl),
+            _dot(unit_vectors, vec_jk, vec_li),
+            _dot(unit_vectors, vec_kl, vec_li),
+        )
+
+        total += numer / denom
+
+    return 2.0 * total
+
+
+def _contributions(
+    batch: NDArray[np.float64], include_pair_and_triplet: bool
+) -> NDArray[np.float64]:
+    n_quadruplets = batch.shape[0]
+    contributions = np.empty(n_quadruplets, dtype=np.float64)
+
+    for q in _prange(n_quadruplets):
+        distances = np.empty(6, dtype=np.float64)
+        unit_vectors = np.empty((6, 3), dtype=np.float64)
+        _fill_geometry(batch[q], distances, unit_vectors)
+
+        total = _quadruplet_contribution(distances, unit_vectors)
+        if include_pair_and_triplet:
+            total += _pair_and_triplet_contribution(distances, unit_vectors)
+
+        contributions[q] = total
+
+    return contributions
+
+
+# `numba.prange` runs the loop of a compiled kernel in parallel
+_prange: Callable[[int], Iterable[int]]
+_compiled_contributions: Callable[[NDArray[np.float64], bool], NDArray[np.float64]]
+
+if numba is not None:
+    _prange = numba.prange
+    _jitable(batched.quadruplet_numerator)
+    _compiled_contributions = numba.njit(parallel=True)(_contributions)
+else:
+    _prange = range
@@ -0,0 +1,400 @@
+"""
+This module calculates the static four-body lattice energy per site of a perfect
+crystal (for example, HCP or FCC solid parahydrogen).
+
+The energy per site is a quarter of the sum of the energies of all the quadruplets that
+contain a reference site, since each quadruplet contains four sites. In a perfect crystal,
+most of these quadruplets are congruent to each other, through the symmetry operations
+of the reference site (the rotations and reflections about it that map the lattice onto
+itself; there are 48 for FCC and 12 for HCP).
+
+The quadruplets are never enumerated one by one. Instead, the other three sites of a
+quadruplet are chosen one at a time, and at each step only a single site is taken from
+each orbit of the operations that fix the sites already chosen; the energy of the
+quadruplet is then multiplied by the product of the sizes of these orbits. To avoid
+reaching the same quadruplet in several orders, the sites are chosen in order of their
+distance from the reference site, and a quadruplet with several sites at the same
+distance is divided by the number of orders in which it can be reached.
+
+The sum is converged shell by shell: the n^th shell includes all the quadruplets whose
+six pair distances are at most the n^th distinct distance from the reference site.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+from dispersion4b.cluster import BatchPotential
+
+# relative tolerance used to decide if two distances in the lattice are equal
+_DISTANCE_RTOL = 1.0e-8
+
+# relative resolution of the site positions when matching them after a symmetry operation
+_POSITION_RTOL = 1.0e-6
+
+
+@dataclass(frozen=True)
+class LatticeSum:
+    """
+    shell_radii
+    - the largest pair distance of the quadruplets included in each shell
+    energies
+    - the energy per site, including all the quadruplets up to and including each shell
+    n_quadruplets
+    - the number of quadruplets that contain the reference site, over all the shells
+    n_evaluated
+    - the number of quadruplets whose energy was actually evaluated
+    """
+
+    shell_radii: NDArray[np.float64]
+    energies: NDArray[np.float64]
+    n_quadruplets: int
+    n_evaluated: int
+
+    @property
+    def energy(self) -> float:
+        """The energy per site, including all the shells."""
+        return float(self.energies[-1])
+
+
+def fcc_lattice_sites(
+    nearest_neighbor_distance: float, radius: float
+) -> NDArray[np.float64]:
+    """
+    The sites of an FCC lattice within `radius` of the site at the origin, sorted by
+    their distance from the origin (so the origin is the first site).
+    """
+    cubic_constant = nearest_neighbor_distance * math.sqrt(2.0)
+    lattice_vectors = cubic_constant * np.eye(3)
+    basis = np.array(
+        [[0.0, 0.0, 0.0], [0.0, 0.5, 0.5], [0.5, 0.0, 0.5], [0.5, 0.5, 0.0]]
+    )
+
+    return _lattice_sites(lattice_vectors, basis, radius)
+
+
+def hcp_lattice_sites(
+    nearest_neighbor_distance: float, radius: float
+) -> NDArray[np.float64]:
+    """
+    The sites of an ideal HCP lattice (with `c / a = sqrt(8 / 3)`) within `radius` of the
+    site at the origin, sorted by their distance from the origin.
+    """
+    a = nearest_neighbor_distance
+    c = a * math.sqrt(8.0 / 3.0)
+    lattice_vectors = np.array(
+        [[a, 0.0, 0.0], [0.5 * a, 0.5 * math.sqrt(3.0) * a, 0.0], [0.0, 0.0, c]]
+    )
+    basis = np.array([[0.0, 0.0, 0.0], [1.0 / 3.0, 1.0 / 3.0, 0.5]])
+
+    return _lattice_sites(lattice_vectors, basis, radius)
+
+
+def lattice_energy_per_site(
+    potential: BatchPotential, sites: NDArray[np.float64], n_shells: int
+) -> LatticeSum:
+    """
+    Calculate the energy per site of the lattice, shell by shell, up to `n_shells`.
+
+    The `sites` must contain every lattice site within the radius of the last shell, with
+    the reference site first; see `fcc_lattice_sites()` and `hcp_lattice_sites()`.
+    """
+    _check_n_shells_positive(n_shells)
+
+    shell_radii = _shell_radii(sites)[:n_shells]
+    shell_energies, n_quadruplets, n_evaluated = _shell_energies(
+        potential, sites, shell_radii, first_shell=0
+    )
+
+    return LatticeSum(
+        shell_radii=shell_radii,
+        energies=0.25 * np.cumsum(shell_energies),
+        n_quadruplets=n_quadruplets,
+        n_evaluated=n_evaluated,
+    )
+
+
+def converged_lattice_energy_per_site(
+    potential: BatchPotential,
+    lattice_sites: Callable[[float, float], NDArray[np.float64]],
+    nearest_neighbor_distance: float,
+    rtol: float = 1.0e-6,
+    max_shells: int = 12,
+) -> LatticeSum:
+    """
+    Add shells to the lattice sum until the last shell changes the energy per site by
+    less than `rtol` (relative to the energy), or until `max_shells` shells are included.
+    Two shells are added each time the sum has not yet converged; only the quadruplets
+    of the new shells are evaluated.
+
+    The number of quadruplets grows very quickly with the number of shells (roughly as
+    the ninth power of the radius), so `max_shells` should be kept small.
+
+    lattice_sites
+    - a function like `fcc_lattice_sites()` or `hcp_lattice_sites()`, that takes the
+      nearest neighbor distance and a radius, and returns the lattice sites
+    """
+    _check_max_shells(max_shells)
+
+    shell_energies = np.zeros(0, dtype=np.float64)
+    n_evaluated = 0
+
+    n_shells = min(4, max_shells)
+    while True:
+        radius = nearest_neighbor_distance
+        while True:
+            sites = lattice_sites(nearest_neighbor_distance, radius)
+            if len(_shell_radii(sites)) >= n_shells:
+                break
+            radius *= 1.25
+
+        shell_radii = _shell_radii(sites)[:n_shells]
+        new_energies, n_quadruplets, n_new = _shell_energies(
+            potential, sites, shell_radii, first_shell=len(shell_energies)
+        )
+        shell_energies = np.concatenate((shell_energies, new_energies))
+        n_evaluated += n_new
+
+        result = LatticeSum(
+            shell_radii=shell_radii,
+            energies=0.25 * np.cumsum(shell_energies),
+            n_quadruplets=n_quadruplets,
+            n_evaluated=n_evaluated,
+        )
+
+        change = abs(result.energies[-1] - result.energies[-2])
+        if change <= rtol * abs(result.energies[-1]) or n_shells == max_shells:
+            return result
+
+        n_shells = min(n_shells + 2, max_shells)
+
+
+def _shell_energies(
+    potential: BatchPotential,
+    sites: NDArray[np.float64],
+    shell_radii: NDArray[np.float64],
+    first_shell: int,
+) -> tuple[NDArray[np.float64], int, int]:
+    """
+    The sum of the energies of the quadruplets that contain the reference site, that
+    first appear in each of the shells from `first_shell` onwards; also returns the
+    number of quadruplets over all the shells, and the number that were evaluated.
+    """
+    upper_radii = shell_radii * (1.0 + _DISTANCE_RTOL)
+
+    # only the sites within the last shell can be part of a quadruplet
+    separations = sites - sites[0]
+    sites = sites[np.linalg.norm(separations, axis=1) <= upper_radii[-1]]
+
+    pair_distances = np.linalg.norm(sites[:, np.newaxis] - sites[np.newaxis], axis=2)
+    is_within = pair_distances <= upper_radii[-1]
+    site_shells = np.searchsorted(upper_radii, pair_distances[0], side="left")
+
+    permutations = _site_symmetries(sites, shell_radii[0])
+
+    # the other three sites are chosen with nondecreasing distance from the reference
+    representatives: list[NDArray[np.int64]] = []
+    orbit_sizes: list[NDArray[np.int64]] = []
+
+    candidates_a = np.arange(1, len(sites))
+    for a, size_a in zip(*_orbit_representatives(permutations, candidates_a)):
+        stabilizer_a = permutations[permutations[:, a] == a]
+        candidates_b = candidates_a[
+            (candidates_a != a)
+            & is_within[a, candidates_a]
+            & (site_shells[candidates_a] >= site_shells[a])
+        ]
+
+        for b, size_b in zip(*_orbit_representatives(stabilizer_a, candidates_b)):
+            stabilizer_ab = stabilizer_a[stabilizer_a[:, b] == b]
+            candidates_c = candidates_b[
+                (candidates_b != b)
+                & is_within[b, candidates_b]
+                & (site_shells[candidates_b] >= site_shells[b])
+            ]
+
+            c, size_c = _orbit_representatives(stabilizer_ab, candidates_c)
+            representatives.append(
+                np.column_stack(
+                    (np.zeros_like(c), np.full_like(c, a), np.full_like(c, b), c)
+                )
+            )
+            orbit_sizes.append(size_a * size_b * size_c)
+
+    quadruplets = np.concatenate(representatives or [np.empty((0, 4), np.int64)])
+    weights = np.concatenate(orbit_sizes or [np.empty(0, np.int64)]).astype(np.float64)
+
+    # the number of orders, with nondecreasing distance from the reference, in which
+    # the same quadruplet is reached
+    shell_a, shell_b, shell_c = site_shells[quadruplets[:, 1:]].T
+    weights /= np.where(
+        shell_a == shell_c,
+        6.0,
+        np.where((shell_a == shell_b) | (shell_b == shell_c), 2.0, 1.0),
+    )
+    n_quadruplets = round(float(np.sum(weights)))
+
+    # the contribution of each quadruplet goes into the first shell that contains it
+    pairs = quadruplets[:, np.array(batched.PAIR_INDICES)]
+    quadruplet_radii = np.max(pair_distances[pairs[..., 0], pairs[..., 1]], axis=1)
+    quadruplet_shells = np.searchsorted(upper_radii, quadruplet_radii, side="left")
+
+    is_new = quadruplet_shells >= first_shell
+    quadruplets = quadruplets[is_new]
+
+    distances, unit_vectors = batched.distances_and_unit_vectors(
+        batched.pair_separations(sites[quadruplets])
+    )
+    energies = potential.energies_from_geometry(distances, unit_vectors)
+
+    shell_energies = np.zeros(len(shell_radii), dtype=np.float64)
+    np.add.at(shell_energies, quadruplet_shells[is_new], weights[is_new] * energies)
+
+    return shell_energies[first_shell:], n_quadruplets, len(quadruplets)
+
+
+def _site_symmetries(
+    sites: NDArray[np.float64], length_scale: float
+) -> NDArray[np.int64]:
+    """
+    The `(G, M)` permutations of the sites produced by each of the `G` rotations and
+    reflections about the reference site that map the sites onto themselves.
+    """
+    separations = sites - sites[0]
+    identity = np.arange(len(sites))[np.newaxis, :]
+
+    basis = _independent_sites(separations, length_scale)
+    if basis is None:
+        return identity
+
+    basis_vectors = separations[basis]
+    basis_gram = basis_vectors @ basis_vectors.T
+    inverse_basis = np.linalg.inv(basis_vectors)
+
+    resolution = length_scale * _POSITION_RTOL
+    site_index = {
+        tuple(key): index
+        for (index, key) in enumerate(
+            np.round(separations / resolution).astype(np.int64)
+        )
+    }
+
+    # the candidate images of each basis vector are the sites at the same distance
+    norms = np.linalg.norm(separations, axis=1)
+    candidate_images = [
+        np.flatnonzero(np.isclose(norms, norms[index], rtol=_DISTANCE_RTOL))
+        for index in basis
+    ]
+
+    # only the images with the same dot products as the basis vectors can come from
+    # a rotation or reflection
+    images = np.array(list(itertools.product(*candidate_images)), dtype=np.int64)
+    image_vectors = separations[images]
+    image_grams = np.einsum("tik,tjk->tij", image_vectors, image_vectors)
+    is_orthogonal = np.all(
+        np.abs(image_grams - basis_gram) <= resolution * length_scale, axis=(1, 2)
+    )
+
+    permutations = []
+    for operation in inverse_basis @ image_vectors[is_orthogonal]:
+        keys = np.round((separations @ operation) / resolution).astype(np.int64)
+        permutation = [site_index.get(tuple(key), -1) for key in keys]
+        if -1 not in permutation:
+            permutations.append(permutation)
+
+    return np.array(permutations, dtype=np.int64)
+
+
+def _independent_sites(
+    separations: NDArray[np.float64], length_scale: float
+) -> Optional[list[int]]:
+    """
+    The indices of the first three sites whose separations from the reference site are
+    linearly independent, or None if there are no such sites.
+    """
+    tolerance = _POSITION_RTOL * length_scale**3
+    basis: list[int] = []
+    for index in range(1, len(separations)):
+        vectors = separations[basis + [index]]
+        singular_values = np.linalg.svd(vectors, compute_uv=False)
+        if np.prod(singular_values) > tolerance:
+            basis.append(index)
+            if len(basis) == 3:
+                return basis
+
+    return None
+
+
+def _orbit_representatives(
+    permutations: NDArray[np.int64], candidates: NDArray[np.int64]
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    The smallest site of each orbit of the permutations among the candidates (which
+    must be closed under the permutations), and the size of each of these orbits.
+    """
+    images = np.sort(permutations[:, candidates], axis=0)
+
+    is_representative = images[0] == candidates
+    sizes = 1 + np.count_nonzero(np.diff(images, axis=0), axis=0)
+
+    return candidates[is_representative], sizes[is_representative]
+
+
+def _lattice_sites(
+    lattice_vectors: NDArray[np.float64], basis: NDArray[np.float64], radius: float
+) -> NDArray[np.float64]:
+    # enough unit cells in each direction to cover the sphere of the given radius
+    widths = abs(np.linalg.det(lattice_vectors)) / np.linalg.norm(
+        np.cross(
+            np.roll(lattice_vectors, -1, axis=0), np.roll(lattice_vectors, -2, axis=0)
+        ),
+        axis=1,
+    )
+    n_cells = np.ceil(radius / widths).astype(np.int64) + 1
+
+    ranges = [np.arange(-n, n + 1) for n in n_cells]
+    cell_indices = np.array(list(itertools.product(*ranges)), dtype=np.float64)
+
+    fractional = (cell_indices[:, np.newaxis, :] + basis[np.newaxis, :, :]).reshape(
+        -1, 3
+    )
+    sites: NDArray[np.float64] = fractional @ lattice_vectors
+
+    distances: NDArray[np.float64] = np.linalg.norm(sites, axis=1)
+    keep = distances <= radius * (1.0 + _DISTANCE_RTOL)
+    order = np.argsort(distances[keep], kind="stable")
+
+    return sites[keep][order]
+
+
+def _shell_radii(sites: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The distinct distances from the reference site (the first site) to the others."""
+    distances = np.sort(np.linalg.norm(sites[1:] - sites[0], axis=1))
+    if len(distances) == 0:
+        return distances
+
+    is_new_shell = np.diff(distances, prepend=-np.inf) > _DISTANCE_RTOL * distances
+    return distances[is_new_shell]
+
+
+def _check_n_shells_positive(n_shells: int) -> None:
+    if n_shells <= 0:
+        raise ValueError(
+            "The number of shells must be positive.\n" f"Entered: n_shells = {n_shells}"
+        )
+
+
+def _check_max_shells(max_shells: int) -> None:
+    if max_shells < 2:
+        raise ValueError(
+            "At least two shells are needed to check the convergence of the sum.\n"
+            f"Entered: max_shells = {max_shells}"
+        )
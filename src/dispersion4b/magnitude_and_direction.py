@@ -5,5 +5,10 @@ from cartesian import CartesianND
 
 @dataclass(frozen=True)
 class MagnitudeAndDirection:
+    # one of these is created for every pair separation of every quadruplet evaluated
+    # with `CartesianND` points; the slots make each instance smaller and cheaper to
+    # create than one with an instance dictionary
+    __slots__ = ("magnitude", "direction")
+
     magnitude: float
     direction: CartesianND
@@ -0,0 +1,247 @@
+"""
+This module contains functions to find the pairs and quadruplets of particles that
+lie within a cutoff distance of each other.
+
+The pairs are found using a cell list: the particles are binned into cells that are at
+least as wide as the cutoff, and only particles in neighboring cells are compared. In a
+periodic box, the cells are built in fractional coordinates and wrap around the edges
+of the box, and all separations follow the minimum image convention.
+The quadruplets are then built from the pairs; a quadruplet is only kept if all six of
+its pair distances are within the cutoff (i.e. the four particles form a 4-clique in
+the neighbor graph). This avoids the O(N^4) enumeration of all quadruplets.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.periodic import check_cutoff_fits_box
+
+# the 27 offsets from a cell to itself and to each of its neighboring cells
+_CELL_OFFSETS = np.array(list(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64)
+
+
+def as_positions(positions: ArrayLike) -> NDArray[np.float64]:
+    """
+    View the input as a contiguous `(N, 3)` float64 array; no copy is made if the
+    input already has this layout.
+    """
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError(
+            "The positions of the particles must have the shape (N, 3).\n"
+            f"Entered: shape = {positions.shape}"
+        )
+
+    return positions
+
+
+def neighbor_pairs(
+    positions: ArrayLike, cutoff: float, box: Optional[PeriodicBox] = None
+) -> NDArray[np.int64]:
+    """
+    Find all pairs of particles separated by less than `cutoff`, using a cell list.
+
+    Returns an `(P, 2)` array of particle indices, where `i < j` for each pair `(i, j)`,
+    and the pairs are sorted lexicographically.
+    """
+    _check_cutoff_positive(cutoff)
+    positions = as_positions(positions)
+    n_particles = len(positions)
+
+    if box is not None:
+        check_cutoff_fits_box(cutoff, box.max_pair_cutoff())
+
+    if n_particles < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # bin each particle into a cell; the offsets to the neighboring cells are reduced
+    # to the unique ones, since they can wrap onto the same cell in a small periodic box
+    if box is None:
+        cell_coords = np.floor((positions - positions.min(axis=0)) / cutoff)
+        cell_coords = cell_coords.astype(np.int64)
+        grid_shape = cell_coords.max(axis=0) + 1
+        cell_offsets = _CELL_OFFSETS
+    else:
+        grid_shape = np.floor(box.perpendicular_widths() / cutoff).astype(np.int64)
+        grid_shape = np.maximum(grid_shape, 1)
+        fractional = box.fractional_coordinates(positions)
+        cell_coords = np.minimum(np.floor(fractional * grid_shape), grid_shape - 1)
+        cell_coords = cell_coords.astype(np.int64)
+        cell_offsets = np.unique(_CELL_OFFSETS % grid_shape, axis=0)
+
+    cell_ids = np.ravel_multi_index(cell_coords.T, grid_shape)
+
+    # sort the particles by cell, so the members of each cell form a contiguous range
+    order = np.argsort(cell_ids, kind="stable")
+    sorted_cell_ids = cell_ids[order]
+
+    pair_chunks = []
+    for offset in cell_offsets:
+        neighbor_coords = cell_coords + offset
+        if box is None:
+            in_grid = np.all(
+                (neighbor_coords >= 0) & (neighbor_coords < grid_shape), axis=1
+            )
+        else:
+            neighbor_coords %= grid_shape
+            in_grid = np.ones(n_particles, dtype=bool)
+
+        particles = np.flatnonzero(in_grid)
+        neighbor_ids = np.ravel_multi_index(neighbor_coords[in_grid].T, grid_shape)
+        starts = np.searchsorted(sorted_cell_ids, neighbor_ids, side="left")
+        counts = np.searchsorted(sorted_cell_ids, neighbor_ids, side="right") - starts
+
+        i_indices = np.repeat(particles, counts)
+        j_indices = order[_expand_ranges(starts, counts)]
+
+        keep = i_indices < j_indices
+        i_indices = i_indices[keep]
+        j_indices = j_indices[keep]
+
+        separations = _separations(positions[i_indices], positions[j_indices], box)
+        sq_distances = np.einsum("ij,ij->i", separations, separations)
+        within_cutoff = sq_distances < cutoff**2
+
+        pair_chunks.append(
+            np.column_stack((i_indices[within_cutoff], j_indices[within_cutoff]))
+        )
+
+    pairs = np.concatenate(pair_chunks)
+    sort_order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+
+    return pairs[sort_order]
+
+
+def enumerate_quadruplets(
+    positions: ArrayLike, cutoff: float, box: Optional[PeriodicBox] = None
+) -> NDArray[np.int64]:
+    """
+    Find all quadruplets of particles where each of the six pair distances is less
+    than `cutoff`.
+
+    Returns an `(M, 4)` array of particle indices, where `i < j < k < l` for each
+    quadruplet `(i, j, k, l)`.
+    """
+    positions = as_positions(positions)
+    if box is not None:
+        check_cutoff_fits_box(cutoff, box.max_quadruplet_cutoff())
+
+    pairs = neighbor_pairs(positions, cutoff, box)
+
+    # the neighbors of each particle with a larger index, in CSR format
+    neighbor_starts = np.searchsorted(pairs[:, 0], np.arange(len(positions) + 1))
+    neighbors = pairs[:, 1]
+
+    quadruplet_chunks = []
+    for i in range(len(positions)):
+        start, stop = neighbor_starts[i], neighbor_starts[i + 1]
+        upper = neighbors[start:stop]
+        if len(upper) < 3:
+            continue
+
+        others = _neighbor_triplets(positions[upper], cutoff, box)
+        quadruplet = np.column_stack((np.full(len(others), i), upper[others]))
+        quadruplet_chunks.append(quadruplet)
+
+    if not quadruplet_chunks:
+        return np.empty((0, 4), dtype=np.int64)
+
+    return np.concatenate(quadruplet_chunks).astype(np.int64)
+
+
+def quadruplets_containing(
+    index: int,
+    positions: ArrayLike,
+    cutoff: float,
+    box: Optional[PeriodicBox] = None,
+) -> NDArray[np.int64]:
+    """
+    Find all the quadruplets that contain the particle at `index`, where each of the six
+    pair distances is less than `cutoff`.
+
+    Returns an `(M, 3)` array with the indices of the other three particles of each
+    quadruplet, in increasing order.
+    """
+    _check_cutoff_positive(cutoff)
+    positions = as_positions(positions)
+    if box is not None:
+        check_cutoff_fits_box(cutoff, box.max_quadruplet_cutoff())
+
+    separations = _separations(positions, positions[index], box)
+    sq_distances = np.einsum("ij,ij->i", separations, separations)
+    within_cutoff = sq_distances < cutoff**2
+    within_cutoff[index] = False
+
+    candidates = np.flatnonzero(within_cutoff)
+    if len(candidates) < 3:
+        return np.empty((0, 3), dtype=np.int64)
+
+    others = _neighbor_triplets(positions[candidates], cutoff, box)
+
+    return candidates[others]
+
+
+def _neighbor_triplets(
+    points: NDArray[np.float64], cutoff: float, box: Optional[PeriodicBox]
+) -> NDArray[np.int64]:
+    """
+    Find all triplets `(a, b, c)` with `a < b < c` among the given points, where each of
+    the three pair distances is less than `cutoff`.
+    """
+    separations = _separations(points[:, np.newaxis, :], points[np.newaxis, :, :], box)
+    sq_distances = np.einsum("ijk,ijk->ij", separations, separations)
+
+    return adjacent_triplets(sq_distances < cutoff**2)
+
+
+def adjacent_triplets(adjacent: NDArray[np.bool_]) -> NDArray[np.int64]:
+    """
+    Find all triplets `(a, b, c)` with `a < b < c` where each pair of the three is
+    marked as adjacent in the symmetric `(n, n)` boolean adjacency matrix.
+    """
+    adjacent = np.triu(adjacent, k=1)
+    idx_a, idx_b = np.nonzero(adjacent)
+
+    # the third point must be adjacent to both of the first two, and have a larger index
+    common = adjacent[idx_a] & adjacent[idx_b]
+    which_pair, idx_c = np.nonzero(common)
+
+    return np.column_stack((idx_a[which_pair], idx_b[which_pair], idx_c))
+
+
+def _separations(
+    points0: NDArray[np.float64],
+    points1: NDArray[np.float64],
+    box: Optional[PeriodicBox],
+) -> NDArray[np.float64]:
+    """The separations `points0 - points1`, as minimum images if the box is periodic."""
+    separations = points0 - points1
+    if box is not None:
+        separations = box.minimum_image(separations)
+
+    return separations
+
+
+def _expand_ranges(
+    starts: NDArray[np.int64], counts: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """Concatenate the integer ranges `[start, start + count)` into a single array."""
+    total = counts.sum()
+    range_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+
+    return np.repeat(starts, counts) + np.arange(total) - range_offsets
+
+
+def _check_cutoff_positive(cutoff: float) -> None:
+    if cutoff <= 0.0:
+        raise ValueError(
+            "The cutoff distance must be positive.\n" f"Entered: cutoff = {cutoff}"
+        )
@@ -0,0 +1,168 @@
+"""
+This module contains the PairGeometry class, which holds the pair distances and unit
+vectors of a batch of quadruplets as a structure of arrays, in buffers that are
+allocated once and reused for every batch.
+
+Calculating the geometry of a batch with `batched.pair_separations()` and
+`batched.distances_and_unit_vectors()` creates several new `(N, 6, 3)` arrays for every
+batch. When the same sizes of batches are evaluated over and over (for example, for
+every frame of a long simulation), a `PairGeometry` writes them into the same memory
+instead, so the batches create no new arrays for their geometry.
+
+The arrays follow the layout used in `batched.py`: the distances have the shape
+`(N, 6)`, and the unit vectors `(N, 6, 3)`, with the six pairs in the order given by
+`batched.PAIR_INDICES`. The potentials that work from the squared distances alone
+(see `gram.py`) can be given just the `(N, 6)` squared distances instead, which skips
+the square roots and the normalization of the unit vectors.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+from dispersion4b.periodic import PeriodicBox
+
+
+class PairGeometry:
+    """
+    Reusable buffers for the pair distances and unit vectors of a batch of quadruplets.
+
+    The arrays returned by `from_points()` and `from_positions()` are views into the
+    buffers; they are overwritten by the next call, and must be copied if they are
+    needed for longer.
+
+    capacity
+    - the number of quadruplets that the buffers can hold at first; the buffers grow
+      whenever a larger batch is calculated
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        self._check_capacity_nonnegative(capacity)
+
+        # the `(N, 6)` distances are stored one pair after another, so that the values of
+        # a single pair across the batch (which the potentials gather at once) are
+        # contiguous
+        self._distances = np.empty((6, capacity), dtype=np.float64).T
+        self._unit_vectors = np.empty((capacity, 6, 3), dtype=np.float64)
+        self._points: Optional[NDArray[np.float64]] = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self._distances)
+
+    def reserve(self, capacity: int) -> None:
+        """Make sure the buffers can hold at least `capacity` quadruplets."""
+        if capacity > self.capacity:
+            self._distances = np.empty((6, capacity), dtype=np.float64).T
+            self._unit_vectors = np.empty((capacity, 6, 3), dtype=np.float64)
+            self._points = None
+
+    def from_points(
+        self, points: ArrayLike, box: Optional[PeriodicBox] = None
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        The `(N, 6)` pair distances and `(N, 6, 3)` unit vectors of the quadruplets in
+        an `(N, 4, 3)` batch of points.
+        """
+        batch = batched.as_quadruplet_batch(points)
+        self.reserve(len(batch))
+
+        return self._normalize(self._separations(batch, box))
+
+    def from_positions(
+        self,
+        positions: NDArray[np.float64],
+        quadruplets: NDArray[np.int64],
+        box: Optional[PeriodicBox] = None,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        The pair distances and unit vectors of the quadruplets given by the `(N, 4)`
+        indices into the `(n_particles, 3)` positions; the points of the quadruplets
+        are also gathered into a reused buffer.
+        """
+        return self.from_points(self._gather(positions, quadruplets), box)
+
+    def squared_distances_from_points(
+        self, points: ArrayLike, box: Optional[PeriodicBox] = None
+    ) -> NDArray[np.float64]:
+        """
+        The `(N, 6)` squared pair distances of the quadruplets in an `(N, 4, 3)` batch
+        of points, for the potentials that need no unit vectors (see `gram.py`); the
+        square roots and the normalization are skipped.
+        """
+        batch = batched.as_quadruplet_batch(points)
+        self.reserve(len(batch))
+
+        separations = self._separations(batch, box)
+        sq_distances = self._distances[: len(batch)]
+        np.einsum("...i,...i->...", separations, separations, out=sq_distances)
+
+        return sq_distances
+
+    def squared_distances_from_positions(
+        self,
+        positions: NDArray[np.float64],
+        quadruplets: NDArray[np.int64],
+        box: Optional[PeriodicBox] = None,
+    ) -> NDArray[np.float64]:
+        """
+        The squared pair distances of the quadruplets given by the `(N, 4)` indices
+        into the `(n_particles, 3)` positions.
+        """
+        return self.squared_distances_from_points(
+            self._gather(positions, quadruplets), box
+        )
+
+    def _gather(
+        self, positions: NDArray[np.float64], quadruplets: NDArray[np.int64]
+    ) -> NDArray[np.float64]:
+        """The `(N, 4, 3)` points of the quadruplets, in the reused points buffer."""
+        n_quadruplets = len(quadruplets)
+        self.reserve(n_quadruplets)
+
+        if self._points is None:
+            self._points = np.empty((self.capacity, 4, 3), dtype=np.float64)
+
+        points = self._points[:n_quadruplets]
+        np.take(positions, quadruplets, axis=0, out=points)
+
+        return points
+
+    def _separations(
+        self, batch: NDArray[np.float64], box: Optional[PeriodicBox]
+    ) -> NDArray[np.float64]:
+        """
+        The `(N, 6, 3)` pair separations of the batch, written into the unit vector
+        buffer (where `_normalize()` turns them into the unit vectors).
+        """
+        separations = self._unit_vectors[: len(batch)]
+        for k, (i, j) in enumerate(batched.PAIR_INDICES):
+            np.subtract(batch[:, i], batch[:, j], out=separations[:, k])
+
+        if box is not None:
+            separations[...] = box.minimum_image(separations)
+
+        return separations
+
+    def _normalize(
+        self, separations: NDArray[np.float64]
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        distances = self._distances[: len(separations)]
+
+        np.einsum("...i,...i->...", separations, separations, out=distances)
+        np.sqrt(distances, out=distances)
+        separations /= distances[..., np.newaxis]
+
+        return distances, separations
+
+    def _check_capacity_nonnegative(self, capacity: int) -> None:
+        if capacity < 0:
+            raise ValueError(
+                "The capacity must be zero or positive.\n"
+                f"Entered: capacity = {capacity}"
+            )
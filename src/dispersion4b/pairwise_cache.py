@@ -0,0 +1,236 @@
+"""
+This module contains the PairwiseGeometryCache class, which calculates the distance
+and unit vector of each pair of particles in a configuration at most once, and only
+when it is first needed.
+
+When the energies of all the quadruplets of a cluster are summed, each pair of
+particles belongs to many quadruplets; calculating the six pair separations of every
+quadruplet from scratch repeats the same distance and unit vector for every quadruplet
+that shares a pair. The cache stores the geometry of each pair the first time any
+quadruplet asks for it, and every later quadruplet reads it back by index.
+
+Only the pairs that have been asked for are stored, so the memory used for the
+geometry grows with the number of distinct pairs used (for example, the pairs within a
+cutoff). The slot of each pair is found through an `(N, N)` table of integers for up to
+`DENSE_TABLE_MAX_PARTICLES` particles, and through a sorted array of pair keys (which
+is slower to search, but does not grow with N^2) for larger systems. The table is
+reused by `update()` when the number of particles does not change.
+
+The cache pays off when the same quadruplets (or quadruplets sharing the same pairs)
+of a configuration are evaluated more than once; for example, with several potentials,
+or for the energies and then the forces. Reading the geometry of a batch back from a
+filled cache is faster than calculating it again with a `PairGeometry` (by about a
+factor of two for the quadruplets within a cutoff of a few hundred particles), but
+filling the cache costs about twice as much as a single `PairGeometry` pass, since
+NumPy spends more time gathering the pairs than calculating them. For a single pass
+over the quadruplets, as in `ClusterDispersionEnergy`, a `PairGeometry` is faster.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b import batched
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.periodic import PeriodicBox
+
+# up to this many particles, the slot of each pair is found in an `(N, N)` table of
+# 32-bit integers (64 MiB at the limit); beyond it, in a sorted array of pair keys
+DENSE_TABLE_MAX_PARTICLES = 4096
+
+ScalarT = TypeVar("ScalarT", bound=np.generic)
+
+
+class PairwiseGeometryCache:
+    """
+    The distances and unit vectors between pairs of particles, calculated lazily and
+    at most once per configuration.
+
+    positions
+    - the `(N, 3)` positions of the particles; these are copied, so the cache always
+      describes the configuration it was built (or last updated) with
+    box
+    - if given, the pair separations follow the minimum image convention of this box
+
+    The unit vector of the pair `(i, j)` points from particle `j` to particle `i`,
+    as in `batched.py`.
+    """
+
+    # the particles of each stored pair
+    _first: NDArray[np.int64]
+    _second: NDArray[np.int64]
+
+    def __init__(self, positions: ArrayLike, box: Optional[PeriodicBox] = None) -> None:
+        self._box = box
+        self._table: Optional[NDArray[np.int32]] = None
+        self._n_stored = 0
+        self.update(positions)
+
+    @property
+    def n_particles(self) -> int:
+        return len(self._positions)
+
+    @property
+    def n_computed(self) -> int:
+        """The number of distinct pairs whose geometry has been calculated."""
+        return self._n_stored // 2
+
+    def update(self, positions: ArrayLike) -> None:
+        """Start a new configuration; every pair is calculated again when next used."""
+        positions = as_positions(positions).copy()
+        same_size = self._table is not None and len(positions) == self.n_particles
+        self._positions = positions
+
+        # the dense table is reused for a configuration with the same number of
+        # particles; only the entries of the pairs stored so far need to be cleared
+        if same_size and self._table is not None:
+            n_stored = self._n_stored
+            if n_stored < self._table.size // 8:
+                self._table[self._first[:n_stored], self._second[:n_stored]] = 0
+            else:
+                self._table.fill(0)
+        elif self.n_particles <= DENSE_TABLE_MAX_PARTICLES:
+            self._table = np.zeros((self.n_particles, self.n_particles), dtype=np.int32)
+        else:
+            self._table = None
+
+        # the geometry of each pair, in both orientations, stored in the order the pairs
+        # were first used; the stores grow geometrically, and only the first
+        # `_n_stored` entries are in use
+        self._n_stored = 0
+        self._first = np.empty(0, dtype=np.int64)
+        self._second = np.empty(0, dtype=np.int64)
+        self._distances = np.empty(0, dtype=np.float64)
+        self._unit_vectors = np.empty((0, 3), dtype=np.float64)
+
+        # the slot of each stored pair `(first, second)`; in the dense table,
+        # `table[first, second]` holds `slot + 1`, or 0 if the pair is not stored yet;
+        # otherwise, `keys` holds the sorted keys `first * N + second` of the stored
+        # pairs, and `key_slots` their slots
+        self._keys = np.empty(0, dtype=np.int64)
+        self._key_slots = np.empty(0, dtype=np.int64)
+
+    def pair_geometry(
+        self, first: ArrayLike, second: ArrayLike
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        The distances and unit vectors of the separations `positions[first] -
+        positions[second]`, for arrays of particle indices of any (matching) shape.
+        """
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        self._check_distinct(first, second)
+
+        slots = self._slots(first, second)
+        if np.any(slots < 0):
+            missing = slots < 0
+            self._insert(first[missing], second[missing])
+            slots = self._slots(first, second)
+
+        return self._distances[slots], self._unit_vectors[slots]
+
+    def quadruplet_geometry(
+        self, quadruplets: ArrayLike
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        The `(M, 6)` pair distances and `(M, 6, 3)` unit vectors of the quadruplets
+        given by the `(M, 4)` particle indices, in the pair order of `batched.py`.
+        """
+        quadruplets = np.asarray(quadruplets, dtype=np.int64).reshape(-1, 4)
+
+        return self.pair_geometry(
+            quadruplets[:, batched.FIRST_POINT], quadruplets[:, batched.SECOND_POINT]
+        )
+
+    def _slots(
+        self, first: NDArray[np.int64], second: NDArray[np.int64]
+    ) -> NDArray[np.int64]:
+        """The slot of each pair, or -1 if it is not stored yet."""
+        if self._table is not None:
+            return self._table[first, second].astype(np.int64) - 1
+
+        keys = first * self.n_particles + second
+        positions = np.searchsorted(self._keys, keys)
+        positions = np.minimum(positions, len(self._keys) - 1)
+
+        slots = np.full(keys.shape, -1, dtype=np.int64)
+        if len(self._keys) > 0:
+            found = self._keys[positions] == keys
+            slots[found] = self._key_slots[positions[found]]
+
+        return slots
+
+    def _insert(self, first: NDArray[np.int64], second: NDArray[np.int64]) -> None:
+        keys = np.unique(
+            np.minimum(first, second) * self.n_particles + np.maximum(first, second)
+        )
+        lower, upper = np.divmod(keys, self.n_particles)
+
+        separations = self._positions[upper] - self._positions[lower]
+        if self._box is not None:
+            separations = self._box.minimum_image(separations)
+
+        new_distances, new_unit_vectors = batched.distances_and_unit_vectors(
+            separations
+        )
+
+        # each pair is stored twice, as `(upper, lower)` and as `(lower, upper)`, so
+        # that the unit vectors are read back without flipping their signs
+        start = self._n_stored
+        stop = start + 2 * len(keys)
+        self._reserve(stop)
+
+        self._first[start:stop] = np.column_stack((upper, lower)).ravel()
+        self._second[start:stop] = np.column_stack((lower, upper)).ravel()
+        self._distances[start:stop] = np.repeat(new_distances, 2)
+        self._unit_vectors[start:stop] = np.stack(
+            (new_unit_vectors, -new_unit_vectors), axis=1
+        ).reshape(-1, 3)
+        self._n_stored = stop
+
+        new_first = self._first[start:stop]
+        new_second = self._second[start:stop]
+        new_slots = np.arange(start, stop)
+
+        if self._table is not None:
+            self._table[new_first, new_second] = new_slots + 1
+        else:
+            new_keys = new_first * self.n_particles + new_second
+            order = np.argsort(new_keys)
+            insert_at = np.searchsorted(self._keys, new_keys[order])
+            self._keys = np.insert(self._keys, insert_at, new_keys[order])
+            self._key_slots = np.insert(self._key_slots, insert_at, new_slots[order])
+
+    def _reserve(self, n_stored: int) -> None:
+        """Grow the stores, by at least doubling them, to hold `n_stored` entries."""
+        capacity = len(self._distances)
+        if n_stored <= capacity:
+            return
+
+        capacity = max(n_stored, 2 * capacity)
+        self._first = _grown(self._first, capacity, self._n_stored)
+        self._second = _grown(self._second, capacity, self._n_stored)
+        self._distances = _grown(self._distances, capacity, self._n_stored)
+        self._unit_vectors = _grown(self._unit_vectors, capacity, self._n_stored)
+
+    def _check_distinct(
+        self, first: NDArray[np.int64], second: NDArray[np.int64]
+    ) -> None:
+        if np.any(first == second):
+            raise ValueError(
+                "A pair must be made of two different particles.\n"
+                f"Entered: first = {first}, second = {second}"
+            )
+
+
+def _grown(store: NDArray[ScalarT], capacity: int, n_used: int) -> NDArray[ScalarT]:
+    """A copy of the first `n_used` entries of the store, with room for `capacity`."""
+    grown = np.empty((capacity, *store.shape[1:]), dtype=store.dtype)
+    grown[:n_used] = store[:n_used]
+
+    return grown
@@ -0,0 +1,372 @@
+"""
+This module evaluates the total energy of a large set of quadruplets across a pool of
+worker processes.
+
+The quadruplets are split into chunks of a fixed size, and each chunk is evaluated by
+one of the workers. The positions and the quadruplet indices are placed in shared
+memory once, so that the tasks only need to send the bounds of each chunk to the
+workers; the potential is sent once to each worker when it starts.
+
+A batch of quadruplets given by their points, as with a memory-mapped `.npy` file, is
+instead sent to the workers one chunk at a time, by `parallel_batch_energies()`; only a
+few chunks are read from the batch at once, so the batch never needs to fit in memory.
+
+The partial sum of each chunk is returned in chunk order, and the partial sums are
+added with `math.fsum()`. Since the chunks do not depend on the number of workers, the
+total energy is the same for any number of workers.
+
+The workers are started with the "spawn" method, so each one imports the package again;
+this costs a fraction of a second per pool, which is small next to the chunks it is meant
+for.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.cluster import BatchPotential
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.pair_geometry import PairGeometry
+from dispersion4b.periodic import PeriodicBox
+
+T = TypeVar("T")
+ScalarT = TypeVar("ScalarT", bound=np.generic)
+
+
+@dataclass(frozen=True)
+class _WorkerState:
+    potential: BatchPotential
+    positions: NDArray[np.float64]
+    quadruplets: NDArray[np.int64]
+    box: Optional[PeriodicBox]
+    geometry: PairGeometry
+
+    # the memory blocks are kept alive for as long as the worker uses the arrays
+    memory: tuple[shared_memory.SharedMemory, ...]
+
+
+@dataclass(frozen=True)
+class _BatchWorkerState:
+    potential: BatchPotential
+    geometry: PairGeometry
+
+
+# the state of each worker process, set once by `_initialize_worker()` or by
+# `_initialize_batch_worker()`
+_worker_state: Optional[_WorkerState] = None
+_batch_worker_state: Optional[_BatchWorkerState] = None
+
+# the number of chunks of a batch sent to the pool for each worker, before waiting for
+# the first of them to finish
+_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# the workers are started fresh instead of forked; a forked worker inherits the threads
+# of the parallel Numba kernels (see `jit.py`) in whatever state they were in, and the
+# pool then deadlocks when it shuts down
+_START_METHOD = multiprocessing.get_context("spawn")
+
+
+def parallel_quadruplet_energy(
+    potential: BatchPotential,
+    positions: ArrayLike,
+    quadruplets: ArrayLike,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 65536,
+    box: Optional[PeriodicBox] = None,
+) -> float:
+    """
+    The sum of the energies of the given quadruplets, evaluated across a pool of
+    worker processes.
+
+    potential
+    - the four-body potential used for each quadruplet; it must be picklable
+    positions
+    - the `(N, 3)` positions of the particles
+    quadruplets
+    - the `(M, 4)` indices of the quadruplets; for example, from
+      `ClusterDispersionEnergy.quadruplets()`
+    n_workers
+    - the number of worker processes; by default, the number of CPUs
+    chunk_size
+    - the number of quadruplets in each task; the result depends on the chunk size
+      (through floating-point rounding), but not on the number of workers
+    box
+    - if given, the pair separations follow the minimum image convention of this box
+    """
+    partial_sums = _map_chunks(
+        _chunk_energy, potential, positions, quadruplets, n_workers, chunk_size, box
+    )
+
+    return math.fsum(partial_sums)
+
+
+def parallel_quadruplet_energies(
+    potential: BatchPotential,
+    positions: ArrayLike,
+    quadruplets: ArrayLike,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 65536,
+    box: Optional[PeriodicBox] = None,
+) -> NDArray[np.float64]:
+    """
+    The `(M,)` energies of each of the given quadruplets, in the same order, evaluated
+    across a pool of worker processes; the arguments are the same as for
+    `parallel_quadruplet_energy()`.
+    """
+    chunk_energies = _map_chunks(
+        _chunk_energies, potential, positions, quadruplets, n_workers, chunk_size, box
+    )
+
+    if len(chunk_energies) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    return np.concatenate(chunk_energies)
+
+
+def parallel_batch_energies(
+    potential: BatchPotential,
+    batch: NDArray[np.float64],
+    n_workers: Optional[int] = None,
+    chunk_size: int = 65536,
+) -> NDArray[np.float64]:
+    """
+    The `(N,)` energies of a batch of quadruplets, given as an `(N, 4, 3)` array of
+    points, evaluated across a pool of worker processes.
+
+    potential
+    - the four-body potential used for each quadruplet; it must be picklable
+    batch
+    - the points of the quadruplets; for example, a memory-mapped `.npy` file, which
+      is read one chunk at a time
+    n_workers
+    - the number of worker processes; by default, the number of CPUs
+    chunk_size
+    - the number of quadruplets in each task
+    """
+    _check_chunk_size_positive(chunk_size)
+    _check_batch_shape(np.shape(batch))
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    energies = np.empty(len(batch), dtype=np.float64)
+    pending: deque[tuple[int, Future[NDArray[np.float64]]]] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=_START_METHOD,
+        initializer=_initialize_batch_worker,
+        initargs=(potential,),
+    ) as executor:
+        for start in range(0, len(batch), chunk_size):
+            stop = min(start + chunk_size, len(batch))
+            chunk = np.asarray(batch[start:stop], dtype=np.float64)
+            pending.append((start, executor.submit(_batch_chunk_energies, chunk)))
+
+            if len(pending) >= _CHUNKS_IN_FLIGHT_PER_WORKER * n_workers:
+                _store_chunk_energies(energies, *pending.popleft())
+
+        while pending:
+            _store_chunk_energies(energies, *pending.popleft())
+
+    return energies
+
+
+def _map_chunks(
+    chunk_function: Callable[[tuple[int, int]], T],
+    potential: BatchPotential,
+    positions: ArrayLike,
+    quadruplets: ArrayLike,
+    n_workers: Optional[int],
+    chunk_size: int,
+    box: Optional[PeriodicBox],
+) -> list[T]:
+    """Apply the function to each chunk of the quadruplets, in chunk order."""
+    _check_chunk_size_positive(chunk_size)
+
+    positions = as_positions(positions)
+    quadruplets = np.ascontiguousarray(quadruplets, dtype=np.int64).reshape(-1, 4)
+
+    n_quadruplets = len(quadruplets)
+    if n_quadruplets == 0:
+        return []
+
+    chunks = [
+        (start, min(start + chunk_size, n_quadruplets))
+        for start in range(0, n_quadruplets, chunk_size)
+    ]
+
+    shared_positions = _SharedArray.from_array(positions)
+    shared_quadruplets = _SharedArray.from_array(quadruplets)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=_START_METHOD,
+            initializer=_initialize_worker,
+            initargs=(
+                potential,
+                shared_positions.descriptor,
+                shared_quadruplets.descriptor,
+                box,
+            ),
+        ) as executor:
+            return list(executor.map(chunk_function, chunks))
+    finally:
+        shared_positions.release()
+        shared_quadruplets.release()
+
+
+class _SharedArray:
+    """A NumPy array copied into a block of shared memory."""
+
+    def __init__(
+        self, memory: shared_memory.SharedMemory, shape: tuple[int, ...], dtype: str
+    ) -> None:
+        self._memory = memory
+        self._shape = shape
+        self._dtype = dtype
+
+    @classmethod
+    def from_array(cls, array: NDArray[np.generic]) -> _SharedArray:
+        memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+        shared[...] = array
+
+        return cls(memory, array.shape, array.dtype.str)
+
+    @property
+    def descriptor(self) -> tuple[str, tuple[int, ...], str]:
+        """The name, shape, and dtype needed to attach to the array from a worker."""
+        return (self._memory.name, self._shape, self._dtype)
+
+    def release(self) -> None:
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _attach(
+    descriptor: tuple[str, tuple[int, ...], str], scalar_type: type[ScalarT]
+) -> tuple[shared_memory.SharedMemory, NDArray[ScalarT]]:
+    """Attach to a shared array, which must hold elements of the given type."""
+    name, shape, dtype = descriptor
+    memory = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+
+    # a view with the same dtype, which only changes the static type of the array
+    return memory, array.view(scalar_type)
+
+
+def _initialize_worker(
+    potential: BatchPotential,
+    positions_descriptor: tuple[str, tuple[int, ...], str],
+    quadruplets_descriptor: tuple[str, tuple[int, ...], str],
+    box: Optional[PeriodicBox],
+) -> None:
+    global _worker_state
+
+    positions_memory, positions = _attach(positions_descriptor, np.float64)
+    quadruplets_memory, quadruplets = _attach(quadruplets_descriptor, np.int64)
+
+    _worker_state = _WorkerState(
+        potential=potential,
+        positions=positions,
+        quadruplets=quadruplets,
+        box=box,
+        geometry=PairGeometry(),
+        memory=(positions_memory, quadruplets_memory),
+    )
+
+
+def _chunk_energies(chunk: tuple[int, int]) -> NDArray[np.float64]:
+    """The energies of the quadruplets in the chunk `[start, stop)`."""
+    assert _worker_state is not None
+    state = _worker_state
+    start, stop = chunk
+
+    quadruplets = state.quadruplets[start:stop]
+
+    # as in `ClusterDispersionEnergy.energies()`, a potential that works from the
+    # squared pair distances alone is given only those
+    energies_from_squared_distances = getattr(
+        state.potential, "energies_from_squared_distances", None
+    )
+    if energies_from_squared_distances is not None:
+        sq_distances = state.geometry.squared_distances_from_positions(
+            state.positions, quadruplets, state.box
+        )
+        return np.asarray(energies_from_squared_distances(sq_distances))
+
+    distances, unit_vectors = state.geometry.from_positions(
+        state.positions, quadruplets, state.box
+    )
+
+    return state.potential.energies_from_geometry(distances, unit_vectors)
+
+
+def _chunk_energy(chunk: tuple[int, int]) -> float:
+    """The sum of the energies of the quadruplets in the chunk `[start, stop)`."""
+    return math.fsum(_chunk_energies(chunk))
+
+
+def _initialize_batch_worker(potential: BatchPotential) -> None:
+    global _batch_worker_state
+
+    _batch_worker_state = _BatchWorkerState(
+        potential=potential, geometry=PairGeometry()
+    )
+
+
+def _batch_chunk_energies(points: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The energies of a chunk of a batch of quadruplets, given by their points."""
+    assert _batch_worker_state is not None
+    state = _batch_worker_state
+
+    energies_from_squared_distances = getattr(
+        state.potential, "energies_from_squared_distances", None
+    )
+    if energies_from_squared_distances is not None:
+        sq_distances = state.geometry.squared_distances_from_points(points)
+        return np.asarray(energies_from_squared_distances(sq_distances))
+
+    distances, unit_vectors = state.geometry.from_points(points)
+
+    return state.potential.energies_from_geometry(distances, unit_vectors)
+
+
+def _store_chunk_energies(
+    energies: NDArray[np.float64],
+    start: int,
+    future: Future[NDArray[np.float64]],
+) -> None:
+    chunk_energies = future.result()
+    stop = start + len(chunk_energies)
+    energies[start:stop] = chunk_energies
+
+
+def _check_batch_shape(shape: tuple[int, ...]) -> None:
+    if len(shape) != 3 or shape[1:] != (4, 3):
+        raise ValueError(
+            "The batch of quadruplets must have the shape (N, 4, 3).\n"
+            f"Entered: shape = {shape}"
+        )
+
+
+def _check_chunk_size_positive(chunk_size: int) -> None:
+    if chunk_size <= 0:
+        raise ValueError(
+            "The chunk size must be positive.\n" f"Entered: chunk_size = {chunk_size}"
+        )
@@ -0,0 +1,141 @@
+"""
+This module contains the PeriodicBox class, which describes a periodic simulation cell
+(for example, a supercell of solid parahydrogen) and applies the minimum image
+convention to the separations between particles.
+
+The cell is given by three lattice vectors, stored as the rows of a `(3, 3)` matrix;
+a position `r` has fractional coordinates `s` such that `r = s @ cell`. Both
+orthorhombic and triclinic cells are supported.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+
+class PeriodicBox:
+    """
+    A periodic simulation cell.
+
+    cell
+    - either the three side lengths of an orthorhombic cell, or a `(3, 3)` matrix whose
+      rows are the three lattice vectors of a triclinic cell
+    """
+
+    def __init__(self, cell: ArrayLike) -> None:
+        cell = np.asarray(cell, dtype=np.float64)
+        if cell.shape == (3,):
+            self._check_lengths_positive(cell)
+            cell = np.diag(cell)
+
+        self._check_cell(cell)
+
+        self._cell = cell
+        self._inverse_cell = np.linalg.inv(cell)
+        self._is_orthorhombic = bool(np.all(cell == np.diag(np.diag(cell))))
+        self._lengths = np.diag(cell).copy()
+
+    @property
+    def cell(self) -> NDArray[np.float64]:
+        return self._cell.copy()
+
+    @property
+    def is_orthorhombic(self) -> bool:
+        return self._is_orthorhombic
+
+    @property
+    def volume(self) -> float:
+        return float(abs(np.linalg.det(self._cell)))
+
+    def perpendicular_widths(self) -> NDArray[np.float64]:
+        """
+        The distance between each pair of opposite faces of the cell; for an
+        orthorhombic cell, these are the side lengths.
+        """
+        a, b, c = self._cell
+        face_areas = np.linalg.norm(
+            [np.cross(b, c), np.cross(c, a), np.cross(a, b)], axis=1
+        )
+
+        return self.volume / face_areas
+
+    def max_pair_cutoff(self) -> float:
+        """
+        The largest pair cutoff for which every pair has a unique minimum image; this
+        is half of the smallest perpendicular width of the cell.
+        """
+        return float(np.min(self.perpendicular_widths()) / 2.0)
+
+    def max_quadruplet_cutoff(self) -> float:
+        """
+        The largest pair cutoff for which the six minimum image separations of every
+        quadruplet within the cutoff describe one consistent set of four points.
+
+        If all the pair distances are below this cutoff, then the separation between
+        any two points, when unwrapped through a third point, differs from its minimum
+        image by a lattice vector shorter than the smallest perpendicular width; that
+        lattice vector must therefore be zero. This gives a third of the smallest width.
+        """
+        return float(np.min(self.perpendicular_widths()) / 3.0)
+
+    def minimum_image(self, separations: ArrayLike) -> NDArray[np.float64]:
+        """
+        Replace each separation vector (along the last axis) with its minimum image.
+
+        For a triclinic cell, the result is exact for any separation whose minimum
+        image is shorter than half of the smallest perpendicular width, which holds
+        for every pair within `max_pair_cutoff()`.
+        """
+        separations = np.asarray(separations, dtype=np.float64)
+
+        if self._is_orthorhombic:
+            return separations - self._lengths * np.round(separations / self._lengths)
+        else:
+            fractional = separations @ self._inverse_cell
+            fractional -= np.round(fractional)
+            return fractional @ self._cell
+
+    def fractional_coordinates(self, positions: ArrayLike) -> NDArray[np.float64]:
+        """The fractional coordinates of the positions, wrapped into `[0, 1)`."""
+        fractional = np.asarray(positions, dtype=np.float64) @ self._inverse_cell
+        fractional -= np.floor(fractional)
+
+        # rounding can map values just below 1.0 to exactly 1.0
+        fractional[fractional >= 1.0] = 0.0
+
+        return fractional
+
+    def wrap(self, positions: ArrayLike) -> NDArray[np.float64]:
+        """Map each position back into the cell."""
+        return self.fractional_coordinates(positions) @ self._cell
+
+    def _check_cell(self, cell: NDArray[np.float64]) -> None:
+        if cell.shape != (3, 3):
+            raise ValueError(
+                "The cell must be given as 3 side lengths, or as a (3, 3) matrix of lattice vectors.\n"
+                f"Entered: shape = {cell.shape}"
+            )
+
+        if abs(np.linalg.det(cell)) <= 0.0:
+            raise ValueError(
+                "The lattice vectors of the cell must be linearly independent.\n"
+                f"Entered: cell = {cell.tolist()}"
+            )
+
+    def _check_lengths_positive(self, lengths: NDArray[np.float64]) -> None:
+        if np.any(lengths <= 0.0):
+            raise ValueError(
+                "The side lengths of the cell must be positive.\n"
+                f"Entered: lengths = {lengths.tolist()}"
+            )
+
+
+def check_cutoff_fits_box(cutoff: float, max_cutoff: float) -> None:
+    if cutoff > max_cutoff:
+        raise ValueError(
+            "The cutoff is too large for the periodic cell; the minimum image convention\n"
+            "would not give a unique, consistent set of separations.\n"
+            f"Entered: cutoff = {cutoff}, largest allowed cutoff = {max_cutoff}"
+        )
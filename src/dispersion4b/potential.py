@@ -16,10 +16,22 @@ TODO: are there better names for this?
 
 from __future__ import annotations
 
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
 from cartesian import CartesianND
 from cartesian.operations import dot_product
 
+from dispersion4b import batched
+from dispersion4b import gram
+from dispersion4b import jit
+from dispersion4b import scalar
 from dispersion4b.magnitude_and_direction import MagnitudeAndDirection
+from dispersion4b.pairwise_cache import PairwiseGeometryCache
+from dispersion4b.utils import PointLike
+from dispersion4b.utils import are_all_cartesian
+from dispersion4b.utils import as_point_array
 from dispersion4b.utils import distance_and_unit_vector
 
 
@@ -36,9 +48,25 @@ class FourBodyDispersionPotential:
 
         self._c12_coeff = c12_coeff
 
+    @property
+    def c12_coeff(self) -> float:
+        return self._c12_coeff
+
     def __call__(
-        self, p0: CartesianND, p1: CartesianND, p2: CartesianND, p3: CartesianND
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
     ) -> float:
+        """
+        Calculate the interaction energy of the four points. The points may be
+        `CartesianND` objects, or plain NumPy arrays (or other sequences of three
+        floats), whose coordinates are read directly without creating any
+        `CartesianND` objects; for example, `potential(*points)` for a `(4, 3)` array.
+        """
+        points = (p0, p1, p2, p3)
+        if not are_all_cartesian(points, CartesianND):
+            return self._call_with_coordinates(*points)
+
+        p0, p1, p2, p3 = points
+
         # calculate the distances and unit vectors between each pair of points
         # i.e. describe the vector as an arrow with a magnitude and direction
         vec10 = distance_and_unit_vector(p1, p0)
@@ -85,6 +113,131 @@ class FourBodyDispersionPotential:
 
         return -self._c12_coeff * total_energy
 
+    def _call_with_coordinates(self, *points: PointLike) -> float:
+        distances, unit_vectors = scalar.pair_geometry(
+            [scalar.as_coordinates(point) for point in points]
+        )
+
+        total_energy = (
+            scalar.pair_contribution(distances)
+            + scalar.triplet_contribution(distances, unit_vectors)
+            + scalar.quadruplet_contribution(distances, unit_vectors)
+        )
+
+        return -self._c12_coeff * total_energy
+
+    def evaluate_batch(
+        self, points: ArrayLike, backend: str = "numpy"
+    ) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies of a batch of quadruplets, given as an
+        `(N, 4, 3)` array of points; returns an `(N,)` array of energies.
+
+        backend
+        - either "numpy", or "numba" to use the compiled kernels in `jit.py`; these fall
+          back to NumPy if Numba is not installed
+        """
+        jit.check_backend(backend)
+        batch = batched.as_quadruplet_batch(points)
+
+        if backend == "numba":
+            return -self._c12_coeff * jit.full_contributions(batch)
+
+        separations = batched.pair_separations(batch)
+        distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+        return self.energies_from_geometry(distances, unit_vectors)
+
+    def energies_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies from the `(N, 6)` pair distances and the
+        `(N, 6, 3)` unit vectors of a batch of quadruplets, in the pair order given
+        by `batched.PAIR_INDICES`.
+        """
+        total_energy = (
+            batched.pair_contributions(distances)
+            + batched.triplet_contributions(distances, unit_vectors)
+            + batched.quadruplet_contributions(distances, unit_vectors)
+        )
+
+        return -self._c12_coeff * total_energy
+
+    def energies_from_cache(
+        self, cache: PairwiseGeometryCache, quadruplets: ArrayLike
+    ) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies of the quadruplets given by `(M, 4)` particle
+        indices, reading their pair distances and unit vectors from the cache; each
+        pair shared by several quadruplets is only calculated once.
+        """
+        distances, unit_vectors = cache.quadruplet_geometry(quadruplets)
+
+        return self.energies_from_geometry(distances, unit_vectors)
+
+    def energies_from_squared_distances(
+        self, squared_distances: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies from only the `(N, 6)` squared pair distances
+        of a batch of quadruplets, without building any unit vectors (see `gram.py`).
+        A single quadruplet can be given as an array of shape `(6,)`.
+        """
+        total_energy = (
+            gram.pair_contributions(squared_distances)
+            + gram.triplet_contributions(squared_distances)
+            + gram.quadruplet_contributions(squared_distances)
+        )
+
+        return -self._c12_coeff * total_energy
+
+    def energy_and_forces(
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
+    ) -> tuple[float, NDArray[np.float64]]:
+        """
+        Calculate the interaction energy, and the analytic forces on each of the four
+        points as a `(4, 3)` array.
+        """
+        points = as_point_array([p0, p1, p2, p3])
+        energies, forces = self.evaluate_batch_with_forces(points[np.newaxis])
+
+        return float(energies[0]), forces[0]
+
+    def evaluate_batch_with_forces(
+        self, points: ArrayLike
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Calculate the interaction energies of a batch of quadruplets, given as an
+        `(N, 4, 3)` array of points, along with the `(N, 4, 3)` forces on each point.
+        """
+        batch = batched.as_quadruplet_batch(points)
+        separations = batched.pair_separations(batch)
+        distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+        energies, separation_gradients = self.energies_and_gradients_from_geometry(
+            distances, unit_vectors
+        )
+        forces = -batched.point_gradients(separation_gradients)
+
+        return energies, forces
+
+    def energies_and_gradients_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Calculate the interaction energies of a batch of quadruplets, along with their
+        `(N, 6, 3)` gradients with respect to the six pair separations.
+        """
+        energies = self.energies_from_geometry(distances, unit_vectors)
+        separation_gradients = (
+            batched.pair_gradients(distances, unit_vectors)
+            + batched.triplet_gradients(distances, unit_vectors)
+            + batched.quadruplet_gradients(distances, unit_vectors)
+        )
+
+        return energies, -self._c12_coeff * separation_gradients
+
     def _check_c12_coeff_positive(self, c12_coeff: float) -> None:
         if c12_coeff <= 0.0:
             raise ValueError(
@@ -0,0 +1,359 @@
+"""
+This module contains the QuadrupletEnergySampler class, which estimates the total
+four-body dispersion interaction energy of a large cluster by Monte Carlo sampling of
+its quadruplets, instead of enumerating them.
+
+Each quadruplet is drawn as a chain of four distinct particles `i, j, k, l`, where each
+step favours nearby particles:
+    - `i` is drawn uniformly from all N particles
+    - `j` is drawn with a weight of `r_ij^-3`
+    - `k` is drawn with a weight of `r_jk^-3`
+    - `l` is drawn with a weight of `r_kl^-3 * r_li^-3`, which closes the cycle
+      `i -> j -> k -> l -> i`
+The weights follow the distance terms of a quadruplet cycle, so the quadruplets with
+the largest energies are drawn most often. Every step is normalized over all the
+particles not drawn yet, so the exact probability `p` of drawing a quadruplet, summed
+over the 24 orders in which its particles could have been drawn, is known.
+
+The total energy is the expectation of `energy / p`, and the mean of this quantity over
+the samples is an unbiased estimate of the total energy; the standard error of the
+estimate is found from the sample variance. Summing the probability over all the orders
+(instead of using the probability of the order actually drawn) needs no extra distances,
+and greatly reduces the variance.
+
+Each quadruplet costs O(N) operations, for the inverse cubed distances from its four
+particles to all the others; no O(N^2) or O(N^4) enumeration is ever done. All the
+quadruplets are included, with no cutoff, and periodic boxes are not supported.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Optional
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.cluster import BatchPotential
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.pair_geometry import PairGeometry
+
+# the 24 orders in which the four particles of a quadruplet can be drawn
+_ORDERINGS = np.array(list(itertools.permutations(range(4))), dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class SampledEnergy:
+    """The result of a Monte Carlo estimate of the total energy."""
+
+    energy: float
+    standard_error: float
+    n_samples: int
+    converged: bool  # whether the target precision was reached
+
+
+class QuadrupletEnergySampler:
+    """
+    Estimate the total four-body dispersion interaction energy of a cluster, from a
+    sample of its quadruplets drawn with a probability that favours nearby particles.
+
+    potential
+    - the four-body potential used for each quadruplet; for example, the
+      `QuadrupletDispersionPotential`
+    batch_size
+    - the number of quadruplets drawn at once; each step of a batch uses
+      `batch_size * N` floats of memory
+    seed
+    - the seed (or generator) for the random numbers
+    """
+
+    def __init__(
+        self,
+        potential: BatchPotential,
+        batch_size: int = 64,
+        seed: Union[int, np.random.Generator, None] = None,
+    ) -> None:
+        self._check_batch_size_positive(batch_size)
+
+        self._potential = potential
+        self._batch_size = batch_size
+        self._rng = np.random.default_rng(seed)
+        self._geometry = PairGeometry()
+
+    def estimate(
+        self,
+        positions: ArrayLike,
+        target_error: Optional[float] = None,
+        target_relative_error: Optional[float] = None,
+        min_samples: int = 1024,
+        max_samples: int = 1_000_000,
+    ) -> SampledEnergy:
+        """
+        Draw quadruplets in batches until the standard error of the estimate falls
+        below one of the targets, or until `max_samples` quadruplets have been drawn.
+
+        target_error
+        - stop once the standard error is at most this value
+        target_relative_error
+        - stop once the standard error is at most this fraction of the magnitude of
+          the estimated energy
+        min_samples
+        - the number of quadruplets drawn before the targets are checked, so that the
+          standard error itself is estimated reliably
+        max_samples
+        - the largest number of quadruplets drawn; if neither target is given, exactly
+          this many are drawn (rounded up to a whole batch)
+        """
+        self._check_targets_positive(target_error, target_relative_error)
+        self._check_sample_counts(min_samples, max_samples)
+
+        positions = as_positions(positions)
+        self._check_enough_particles(len(positions))
+
+        statistics = _RunningStatistics()
+        while statistics.n_values < max_samples:
+            quadruplets, probabilities = self.sample(positions, self._batch_size)
+            energies = self.energies(positions, quadruplets)
+            statistics.add(energies / probabilities)
+
+            if statistics.n_values >= min_samples and _reached_target(
+                statistics.mean,
+                statistics.standard_error,
+                target_error,
+                target_relative_error,
+            ):
+                return SampledEnergy(
+                    statistics.mean,
+                    statistics.standard_error,
+                    statistics.n_values,
+                    True,
+                )
+
+        return SampledEnergy(
+            statistics.mean, statistics.standard_error, statistics.n_values, False
+        )
+
+    def sample(
+        self, positions: ArrayLike, n_samples: int
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Draw `n_samples` quadruplets; returns their `(n_samples, 4)` particle indices,
+        and the exact probability with which each quadruplet (in any order) was drawn.
+        """
+        positions = as_positions(positions)
+        self._check_enough_particles(len(positions))
+
+        rows = np.arange(n_samples)
+
+        first = self._rng.integers(len(positions), size=n_samples)
+        weights_first = _inverse_cubed_distances(positions, first)
+        second = self._draw(weights_first)
+
+        weights_second = _inverse_cubed_distances(positions, second)
+        weights_third = weights_second.copy()
+        weights_third[rows, first] = 0.0
+        third = self._draw(weights_third)
+
+        weights_third = _inverse_cubed_distances(positions, third)
+        weights_fourth = weights_third * weights_first
+        weights_fourth[rows, second] = 0.0
+        fourth = self._draw(weights_fourth)
+
+        quadruplets = np.stack((first, second, third, fourth), axis=1)
+        weights = np.stack(
+            (
+                weights_first,
+                weights_second,
+                weights_third,
+                _inverse_cubed_distances(positions, fourth),
+            ),
+            axis=1,
+        )
+
+        return quadruplets, _quadruplet_probabilities(quadruplets, weights)
+
+    def energies(
+        self, positions: ArrayLike, quadruplets: NDArray[np.int64]
+    ) -> NDArray[np.float64]:
+        """The interaction energy of each of the given quadruplets."""
+        positions = as_positions(positions)
+        distances, unit_vectors = self._geometry.from_positions(positions, quadruplets)
+
+        return self._potential.energies_from_geometry(distances, unit_vectors)
+
+    def _draw(self, weights: NDArray[np.float64]) -> NDArray[np.int64]:
+        """
+        Draw one index from each row of the `(M, N)` weights, with a probability
+        proportional to its weight.
+        """
+        cumulative = np.cumsum(weights, axis=1)
+        totals = cumulative[:, -1]
+        thresholds = self._rng.random(len(weights)) * totals
+
+        # the first index whose cumulative weight exceeds the threshold; an index with
+        # a weight of zero can never be drawn
+        indices: NDArray[np.int64] = np.minimum(
+            np.sum(cumulative <= thresholds[:, np.newaxis], axis=1),
+            weights.shape[1] - 1,
+        )
+        return indices
+
+    def _check_batch_size_positive(self, batch_size: int) -> None:
+        if batch_size <= 0:
+            raise ValueError(
+                "The batch size must be positive.\n"
+                f"Entered: batch_size = {batch_size}"
+            )
+
+    def _check_targets_positive(
+        self, target_error: Optional[float], target_relative_error: Optional[float]
+    ) -> None:
+        for name, target in [
+            ("target_error", target_error),
+            ("target_relative_error", target_relative_error),
+        ]:
+            if target is not None and target <= 0.0:
+                raise ValueError(
+                    "The target precision must be positive.\n"
+                    f"Entered: {name} = {target}"
+                )
+
+    def _check_sample_counts(self, min_samples: int, max_samples: int) -> None:
+        if min_samples < 2 or min_samples > max_samples:
+            raise ValueError(
+                "At least two samples are needed for a standard error, and the maximum number of samples must be at least the minimum.\n"
+                f"Entered: min_samples = {min_samples}, max_samples = {max_samples}"
+            )
+
+    def _check_enough_particles(self, n_particles: int) -> None:
+        if n_particles < 4:
+            raise ValueError(
+                "At least four particles are needed to form a quadruplet.\n"
+                f"Entered: {n_particles} particles"
+            )
+
+
+def _inverse_cubed_distances(
+    positions: NDArray[np.float64], centres: NDArray[np.int64]
+) -> NDArray[np.float64]:
+    """
+    The `(M, N)` inverse cubed distances from each of the `M` centre particles to all
+    the particles; the weight of each centre particle to itself is zero.
+    """
+    # one coordinate at a time, to avoid an `(M, N, 3)` array of separations
+    sq_distances = np.zeros((len(centres), len(positions)), dtype=np.float64)
+    for coordinates in positions.T:
+        separations = coordinates[np.newaxis, :] - coordinates[centres, np.newaxis]
+        sq_distances += separations * separations
+
+    sq_distances[np.arange(len(centres)), centres] = np.inf
+
+    return 1.0 / (sq_distances * np.sqrt(sq_distances))
+
+
+def _quadruplet_probabilities(
+    quadruplets: NDArray[np.int64], weights: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    The probability that each quadruplet is drawn, summed over the 24 orders in which
+    its particles can be drawn.
+
+    quadruplets
+    - the `(M, 4)` particle indices of the quadruplets
+    weights
+    - the `(M, 4, N)` inverse cubed distances from each particle of each quadruplet to
+      all the particles
+    """
+    n_samples, _, n_particles = weights.shape
+    rows = np.arange(n_samples)[:, np.newaxis, np.newaxis]
+
+    # `pair_weights[m, s, t]` is the weight between particles `s` and `t` of quadruplet
+    # `m`; `totals[m, s]` is the normalization of the weights from particle `s`; and
+    # `overlaps[m, s, t]` is the normalization of the product of the weights from
+    # particles `s` and `t` (both of which are zero for the particles themselves)
+    pair_weights = weights[
+        rows, np.arange(4)[:, np.newaxis], quadruplets[:, np.newaxis, :]
+    ]
+    totals = np.sum(weights, axis=2)
+    overlaps = np.einsum("msn,mtn->mst", weights, weights)
+
+    rows = rows[:, :, 0]
+    a, b, c, d = (_ORDERINGS[np.newaxis, :, n] for n in range(4))
+    prob_second = pair_weights[rows, a, b] / totals[rows, a]
+    prob_third = pair_weights[rows, b, c] / (totals[rows, b] - pair_weights[rows, b, a])
+    prob_fourth = (pair_weights[rows, c, d] * pair_weights[rows, d, a]) / (
+        overlaps[rows, c, a] - pair_weights[rows, c, b] * pair_weights[rows, a, b]
+    )
+
+    probabilities: NDArray[np.float64] = (
+        np.sum(prob_second * prob_third * prob_fourth, axis=1) / n_particles
+    )
+    return probabilities
+
+
+class _RunningStatistics:
+    """
+    The mean and the standard error of the mean of all the values added so far, updated
+    one batch at a time without storing the values (the batched form of Welford's
+    algorithm, from Chan, Golub, and LeVeque).
+    """
+
+    def __init__(self) -> None:
+        self._n_values = 0
+        self._mean = 0.0
+        self._sum_sq_deviations = 0.0  # the sum of the squared deviations from the mean
+
+    @property
+    def n_values(self) -> int:
+        return self._n_values
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def standard_error(self) -> float:
+        if self._n_values < 2:
+            return math.inf
+
+        variance = self._sum_sq_deviations / (self._n_values - 1)
+        return math.sqrt(variance / self._n_values)
+
+    def add(self, values: NDArray[np.float64]) -> None:
+        n_batch = len(values)
+        if n_batch == 0:
+            return
+
+        batch_mean = float(np.mean(values))
+        batch_sum_sq_deviations = float(np.sum((values - batch_mean) ** 2))
+
+        n_total = self._n_values + n_batch
+        delta = batch_mean - self._mean
+
+        self._mean += delta * n_batch / n_total
+        self._sum_sq_deviations += (
+            batch_sum_sq_deviations + delta**2 * self._n_values * n_batch / n_total
+        )
+        self._n_values = n_total
+
+
+def _reached_target(
+    energy: float,
+    standard_error: float,
+    target_error: Optional[float],
+    target_relative_error: Optional[float],
+) -> bool:
+    if target_error is not None and standard_error <= target_error:
+        return True
+
+    if (
+        target_relative_error is not None
+        and standard_error <= target_relative_error * abs(energy)
+    ):
+        return True
+
+    return False
@@ -0,0 +1,161 @@
+"""
+The pair, triplet, and quadruplet contributions to the Bade dispersion interaction
+energy of a single quadruplet, for points given as plain NumPy arrays or other
+sequences of numbers instead of `cartesian.CartesianND` objects.
+
+For a single quadruplet, the overhead of creating small NumPy arrays is larger than the
+arithmetic itself, so the kernels in this module work on plain Python floats. The
+coordinates are read straight out of the points (through the buffer protocol for an
+array), without building any intermediate `CartesianND` objects.
+
+The six pair separations follow the same order as in `batched.py`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from cartesian import CartesianND
+
+from dispersion4b import batched
+from dispersion4b.utils import PointLike
+
+Vector = tuple[float, float, float]
+
+# the separations of each triplet and quadruplet term, as tuples of plain ints
+_TRIPLET_PAIRS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(pair) for pair in batched.TRIPLET_PAIRS.tolist()
+)
+_QUADRUPLET_CYCLES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(cycle) for cycle in batched.QUADRUPLET_CYCLES.tolist()
+)
+
+
+def as_coordinates(point: PointLike) -> Vector:
+    """
+    The three coordinates of the point, as floats; the point may be a NumPy array, a
+    `CartesianND`, or any other sequence or buffer of three numbers.
+    """
+    if isinstance(point, np.ndarray):
+        x, y, z = point.tolist()
+    elif isinstance(point, (list, tuple, CartesianND)):
+        x, y, z = point
+    else:
+        # for example, an `array.array` or a `memoryview`
+        x, y, z = np.asarray(point, dtype=np.float64).tolist()
+
+    return (float(x), float(y), float(z))
+
+
+def separation(p_i: Vector, p_j: Vector) -> tuple[float, Vector]:
+    """The distance and unit vector of the separation `p_i - p_j`."""
+    x = p_i[0] - p_j[0]
+    y = p_i[1] - p_j[1]
+    z = p_i[2] - p_j[2]
+    distance = math.sqrt(x * x + y * y + z * z)
+
+    return distance, (x / distance, y / distance, z / distance)
+
+
+def pair_geometry(
+    points: Sequence[Vector],
+) -> tuple[list[float], list[Vector]]:
+    """The distances and unit vectors of the six pair separations of the quadruplet."""
+    distances = []
+    unit_vectors = []
+    for i, j in batched.PAIR_INDICES:
+        distance, unit_vector = separation(points[i], points[j])
+        distances.append(distance)
+        unit_vectors.append(unit_vector)
+
+    return distances, unit_vectors
+
+
+def dot(vec0: Vector, vec1: Vector) -> float:
+    return vec0[0] * vec1[0] + vec0[1] * vec1[1] + vec0[2] * vec1[2]
+
+
+def pair_contribution(distances: Sequence[float]) -> float:
+    """The sum of the six two-particle contributions of the quadruplet."""
+    return sum(1.0 / distance**12 for distance in distances)
+
+
+def triplet_contribution(
+    distances: Sequence[float], unit_vectors: Sequence[Vector]
+) -> float:
+    """The sum of the twelve three-particle contributions of the quadruplet."""
+    total = 0.0
+    for vec_ij, vec_jk in _TRIPLET_PAIRS:
+        cosine_ijk = dot(unit_vectors[vec_ij], unit_vectors[vec_jk])
+
+        numer = 1.0 + cosine_ijk**2
+        denom = (distances[vec_ij] * distances[vec_jk]) ** 6
+        total += numer / denom
+
+    return total
+
+
+def quadruplet_contribution(
+    distances: Sequence[float], unit_vectors: Sequence[Vector]
+) -> float:
+    """
+    The sum of the three four-particle contributions of the quadruplet, including the
+    factor of 2 that accounts for each cycle being traversed in both directions.
+    """
+    total = 0.0
+    for vec_ij, vec_jk, vec_kl, vec_li in _QUADRUPLET_CYCLES:
+        total += _cycle_contribution(
+            (
+                distances[vec_ij],
+                distances[vec_jk],
+                distances[vec_kl],
+                distances[vec_li],
+            ),
+            (
+                unit_vectors[vec_ij],
+                unit_vectors[vec_jk],
+                unit_vectors[vec_kl],
+                unit_vectors[vec_li],
+            ),
+        )
+
+    return 2.0 * total
+
+
+def cycle_contribution_from_points(
+    p_i: Vector, p_j: Vector, p_k: Vector, p_l: Vector
+) -> float:
+    """The contribution of the single cycle `i -> j -> k -> l -> i` of the quadruplet."""
+    dist_ij, u_ij = separation(p_i, p_j)
+    dist_jk, u_jk = separation(p_j, p_k)
+    dist_kl, u_kl = separation(p_k, p_l)
+    dist_li, u_li = separation(p_l, p_i)
+
+    return _cycle_contribution(
+        (dist_ij, dist_jk, dist_kl, dist_li), (u_ij, u_jk, u_kl, u_li)
+    )
+
+
+def _cycle_contribution(
+    distances: tuple[float, float, float, float],
+    unit_vectors: tuple[Vector, Vector, Vector, Vector],
+) -> float:
+    dist_ij, dist_jk, dist_kl, dist_li = distances
+    u_ij, u_jk, u_kl, u_li = unit_vectors
+
+    # the distance term
+    denom = (dist_ij * dist_jk * dist_kl * dist_li) ** 3
+
+    numer = batched.quadruplet_numerator(
+        dot(u_ij, u_jk),
+        dot(u_ij, u_kl),
+        dot(u_ij, u_li),
+        dot(u_jk, u_kl),
+        dot(u_jk, u_li),
+        dot(u_kl, u_li),
+    )
+
+    return numer / denom
@@ -0,0 +1,60 @@
+"""
+This module contains functions for radial scans, where a fixed shape (for example, a
+tetrahedron) is evaluated over many overall sizes.
+
+Every term of the Bade dispersion interaction falls off as the twelfth power of the
+size of the quadruplet; if every position is multiplied by a scale factor `s`, then
+    E(s * R) = s^(-12) * E(R)
+exactly. A scan of the dispersion energy therefore only needs the energy of the
+shape at a single size.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from cartesian import CartesianND
+
+from dispersion4b.utils import CartesianT
+
+# the degree of homogeneity of the Bade dispersion interaction energy
+DISPERSION_SCALING_EXPONENT = -12
+
+
+def as_scales(scales: ArrayLike) -> NDArray[np.float64]:
+    """View the scale factors of a scan as a 1D float64 array of positive values."""
+    scales = np.asarray(scales, dtype=np.float64)
+    if scales.ndim != 1 or np.any(scales <= 0.0):
+        raise ValueError(
+            "The scale factors must be a 1D array of positive values.\n"
+            f"Entered: scales = {scales}"
+        )
+
+    return scales
+
+
+def scale_points(points: Sequence[CartesianT], scale: float) -> list[CartesianT]:
+    """Multiply every position by the same scale factor."""
+    return [float(scale) * point for point in points]
+
+
+def dispersion_radial_scan(
+    potential: Callable[..., float], points: Sequence[CartesianND], scales: ArrayLike
+) -> NDArray[np.float64]:
+    """
+    The dispersion energy of the shape given by `points`, after every position is
+    multiplied by each of the `scales`.
+
+    The potential is only evaluated once, at the given `points`; this requires the
+    potential to be homogeneous of degree -12 (such as the `FourBodyDispersionPotential`
+    and the `QuadrupletDispersionPotential`).
+    """
+    scales = as_scales(scales)
+    energy = potential(*points)
+
+    return energy * scales**DISPERSION_SCALING_EXPONENT
@@ -1,5 +1,14 @@
+from __future__ import annotations
+
 import math
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from dispersion4b.utils import FloatOrArray
+from dispersion4b.utils import as_float_or_array
 
 
 @dataclass(frozen=True)
@@ -7,6 +16,11 @@ class SilveraGoldmanAttenuation:
     """
     The short-long attenuation function matching the form given in the
     Silvera-Goldman potential.
+
+    The function accepts either a single distance, or a NumPy array of distances; an
+    array is evaluated elementwise, and only the distances below the cutoff are passed
+    to the exponential. A single float is evaluated with the `math` module, which is
+    much faster than NumPy for one value.
     """
 
     r_cutoff: float
@@ -25,9 +39,41 @@ class SilveraGoldmanAttenuation:
                 f"Entered: {self.expon_coeff: .12f}"
             )
 
-    def __call__(self, r: float) -> float:
-        if r >= self.r_cutoff:
-            return 1.0
-        else:
-            exponent = ((self.r_cutoff / r) - 1.0) ** 2
-            return math.exp(-self.expon_coeff * exponent)
+    def __call__(self, r: Union[float, ArrayLike]) -> FloatOrArray:
+        if isinstance(r, (float, int)):
+            if r >= self.r_cutoff:
+                return 1.0
+
+            return math.exp(-self.expon_coeff * ((self.r_cutoff / r) - 1.0) ** 2)
+
+        r_values = np.asarray(r, dtype=np.float64)
+
+        values = np.ones_like(r_values)
+        inside = r_values < self.r_cutoff
+
+        exponent = ((self.r_cutoff / r_values[inside]) - 1.0) ** 2
+        values[inside] = np.exp(-self.expon_coeff * exponent)
+
+        return as_float_or_array(values, r)
+
+    def derivative(self, r: Union[float, ArrayLike]) -> FloatOrArray:
+        if isinstance(r, (float, int)):
+            if r >= self.r_cutoff:
+                return 0.0
+
+            scalar_ratio = self.r_cutoff / r
+            return (
+                2.0 * self.expon_coeff * (scalar_ratio - 1.0) * scalar_ratio / r
+            ) * math.exp(-self.expon_coeff * (scalar_ratio - 1.0) ** 2)
+
+        r_values = np.asarray(r, dtype=np.float64)
+
+        values = np.zeros_like(r_values)
+        inside = r_values < self.r_cutoff
+
+        r_inside = r_values[inside]
+        ratio = self.r_cutoff / r_inside
+        dexponent_dr = -2.0 * (ratio - 1.0) * ratio / r_inside
+        values[inside] = -self.expon_coeff * dexponent_dr * self(r_inside)
+
+        return as_float_or_array(values, r)
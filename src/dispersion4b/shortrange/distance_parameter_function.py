@@ -4,15 +4,33 @@ in cartesian space, and uses their relative separations to calculation a single
 floating point value.
 """
 
+import math
 from dataclasses import dataclass
 from itertools import combinations
 from typing import Callable
 from typing import Sequence
 
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
 from cartesian import Cartesian3D
 from cartesian.measure import euclidean_distance as distance
 from cartesian.operations import centroid
 
+from dispersion4b import batched
+from dispersion4b import scalar
+from dispersion4b.geometry import QuadrupletGeometry
+from dispersion4b.scan import as_scales
+from dispersion4b.scan import scale_points
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+from dispersion4b.shortrange.short_range_functions import ExponentialDecayOrder2
+from dispersion4b.utils import FloatOrArray
+from dispersion4b.utils import PointLike
+from dispersion4b.utils import are_all_cartesian
+from dispersion4b.utils import as_point_array
+
 
 @dataclass
 class DistanceParameterFunction:
@@ -27,10 +45,104 @@ class DistanceParameterFunction:
     function: Callable[[float], float]
     dist_param_calculator: Callable[[Sequence[Cartesian3D]], float]
 
-    def __call__(self, points: Sequence[Cartesian3D]) -> float:
-        dist_param = self.dist_param_calculator(points)
+    def __call__(self, points: Sequence[PointLike]) -> float:
+        dist_param = self._dist_param(points)
         return self.function(dist_param)
 
+    def evaluate_geometry(self, geometry: QuadrupletGeometry) -> FloatOrArray:
+        """
+        The same value as calling this function on the points of the geometry, for a
+        single quadruplet; or the same `(N,)` array as `evaluate_batch()`, for a batch.
+        The distance parameters in this module reuse the pair distances that the
+        geometry already holds, instead of calculating them again.
+        """
+        calculator = _DIST_PARAMS_FROM_GEOMETRY.get(self.dist_param_calculator)
+
+        if geometry.points.ndim == 2:
+            if calculator is None:
+                return self([Cartesian3D(*point) for point in geometry.points])
+
+            return self.function(float(calculator(geometry)))
+
+        if calculator is None:
+            return self.evaluate_batch(geometry.points)
+
+        dist_params = np.asarray(calculator(geometry), dtype=np.float64)
+        return _evaluate_elementwise(self.function, dist_params)
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]:
+        """
+        Evaluate the function for a batch of quadruplets, given as an `(N, 4, 3)` array
+        of points; returns an `(N,)` array. The distance parameters in this module, and
+        the functions in the `shortrange` package, are evaluated without a Python loop
+        over the quadruplets.
+        """
+        batch = batched.as_quadruplet_batch(points)
+
+        batch_calculator = _BATCHED_DIST_PARAMS.get(self.dist_param_calculator)
+        if batch_calculator is not None:
+            dist_params = batch_calculator(batch)
+        else:
+            dist_params = np.array(
+                [
+                    self.dist_param_calculator([Cartesian3D(*p) for p in quadruplet])
+                    for quadruplet in batch
+                ],
+                dtype=np.float64,
+            )
+
+        return _evaluate_elementwise(self.function, dist_params)
+
+    def gradient(self, points: Sequence[Cartesian3D]) -> NDArray[np.float64]:
+        """
+        The analytic gradient with respect to each of the points, as an `(n_points, 3)`
+        array. This requires the `function` to have a `derivative()` method, and the
+        `dist_param_calculator` to be one of the distance parameters in this module.
+        """
+        gradient_calculator = _DIST_PARAM_GRADIENTS.get(self.dist_param_calculator)
+        derivative = getattr(self.function, "derivative", None)
+
+        if gradient_calculator is None or derivative is None:
+            raise TypeError(
+                "The gradient is only available when the distance parameter has a known\n"
+                "gradient and the function has a 'derivative()' method."
+            )
+
+        dist_param = self._dist_param(points)
+        return derivative(dist_param) * gradient_calculator(points)
+
+    def _dist_param(self, points: Sequence[PointLike]) -> float:
+        """
+        The distance parameter of the points; points given as NumPy arrays are read as
+        plain floats (see `scalar.py`), and are only converted to `Cartesian3D` objects
+        for a distance parameter not in this module.
+        """
+        if are_all_cartesian(points, Cartesian3D):
+            return self.dist_param_calculator(points)
+
+        coordinates = [scalar.as_coordinates(point) for point in points]
+        calculator = _DIST_PARAMS_FROM_COORDINATES.get(self.dist_param_calculator)
+        if calculator is not None:
+            return calculator(coordinates)
+
+        return self.dist_param_calculator([Cartesian3D(*c) for c in coordinates])
+
+    def radial_scan(
+        self, points: Sequence[Cartesian3D], scales: ArrayLike
+    ) -> NDArray[np.float64]:
+        """
+        The value of the function after every position is multiplied by each of the
+        `scales`. If the distance parameter is one of the distance parameters in this
+        module, it scales linearly with the positions, and is only calculated once.
+        """
+        scales = as_scales(scales)
+
+        if self.dist_param_calculator in _LINEAR_DIST_PARAMS:
+            dist_params = self._dist_param(points) * scales
+            return _evaluate_elementwise(self.function, dist_params)
+        else:
+            return np.array([self(scale_points(points, scale)) for scale in scales])
+
 
 def sum_of_sidelengths(points: Sequence[Cartesian3D]) -> float:
     return sum([distance(p0, p1) for (p0, p1) in combinations(points, 2)])
@@ -39,3 +151,134 @@ def sum_of_sidelengths(points: Sequence[Cartesian3D]) -> float:
 def sum_of_com_distances(points: Sequence[Cartesian3D]) -> float:
     com = centroid(points)
     return sum([distance(p, com) for p in points])
+
+
+def sum_of_sidelengths_batch(points: ArrayLike) -> NDArray[np.float64]:
+    """
+    The `sum_of_sidelengths()` of each quadruplet in an `(N, 4, 3)` batch, as an
+    `(N,)` array.
+    """
+    separations = batched.pair_separations(batched.as_quadruplet_batch(points))
+    distances = np.sqrt(np.einsum("...i,...i->...", separations, separations))
+
+    return np.sum(distances, axis=-1)
+
+
+def sum_of_com_distances_batch(points: ArrayLike) -> NDArray[np.float64]:
+    """
+    The `sum_of_com_distances()` of each quadruplet in an `(N, 4, 3)` batch, as an
+    `(N,)` array.
+    """
+    batch = batched.as_quadruplet_batch(points)
+    separations = batch - batch.mean(axis=1, keepdims=True)
+    distances = np.sqrt(np.einsum("...i,...i->...", separations, separations))
+
+    return np.sum(distances, axis=-1)
+
+
+def sum_of_sidelengths_gradient(points: Sequence[Cartesian3D]) -> NDArray[np.float64]:
+    """The gradient of `sum_of_sidelengths()` with respect to each of the points."""
+    coords = as_point_array(points)
+    gradient = np.zeros_like(coords)
+
+    for i, j in combinations(range(len(coords)), 2):
+        separation = coords[i] - coords[j]
+        unit_vector = separation / np.linalg.norm(separation)
+        gradient[i] += unit_vector
+        gradient[j] -= unit_vector
+
+    return gradient
+
+
+def sum_of_com_distances_gradient(
+    points: Sequence[Cartesian3D],
+) -> NDArray[np.float64]:
+    """The gradient of `sum_of_com_distances()` with respect to each of the points."""
+    coords = as_point_array(points)
+    separations = coords - coords.mean(axis=0)
+    unit_vectors = separations / np.linalg.norm(separations, axis=1)[:, np.newaxis]
+
+    # each point also moves the centre of mass, which is shared by all the distances
+    return unit_vectors - unit_vectors.mean(axis=0)
+
+
+def sum_of_sidelengths_from_geometry(geometry: QuadrupletGeometry) -> FloatOrArray:
+    """The same as `sum_of_sidelengths()`, using the precomputed pair distances."""
+    return np.sum(geometry.distances, axis=-1)
+
+
+def sum_of_com_distances_from_geometry(
+    geometry: QuadrupletGeometry,
+) -> FloatOrArray:
+    """The same as `sum_of_com_distances()`, using the points held by the geometry."""
+    points = geometry.points
+    separations = points - points.mean(axis=-2, keepdims=True)
+
+    return np.sum(np.linalg.norm(separations, axis=-1), axis=-1)
+
+
+def _sum_of_sidelengths_from_coordinates(coordinates: Sequence[scalar.Vector]) -> float:
+    return sum(math.dist(c0, c1) for (c0, c1) in combinations(coordinates, 2))
+
+
+def _sum_of_com_distances_from_coordinates(
+    coordinates: Sequence[scalar.Vector],
+) -> float:
+    com = [sum(values) / len(coordinates) for values in zip(*coordinates)]
+    return sum(math.dist(c, com) for c in coordinates)
+
+
+_BATCHED_DIST_PARAMS: dict[
+    Callable[[Sequence[Cartesian3D]], float],
+    Callable[[ArrayLike], NDArray[np.float64]],
+] = {
+    sum_of_sidelengths: sum_of_sidelengths_batch,
+    sum_of_com_distances: sum_of_com_distances_batch,
+}
+
+_DIST_PARAMS_FROM_GEOMETRY: dict[
+    Callable[[Sequence[Cartesian3D]], float],
+    Callable[[QuadrupletGeometry], FloatOrArray],
+] = {
+    sum_of_sidelengths: sum_of_sidelengths_from_geometry,
+    sum_of_com_distances: sum_of_com_distances_from_geometry,
+}
+
+_DIST_PARAMS_FROM_COORDINATES: dict[
+    Callable[[Sequence[Cartesian3D]], float],
+    Callable[[Sequence[scalar.Vector]], float],
+] = {
+    sum_of_sidelengths: _sum_of_sidelengths_from_coordinates,
+    sum_of_com_distances: _sum_of_com_distances_from_coordinates,
+}
+
+_DIST_PARAM_GRADIENTS: dict[
+    Callable[[Sequence[Cartesian3D]], float],
+    Callable[[Sequence[Cartesian3D]], NDArray[np.float64]],
+] = {
+    sum_of_sidelengths: sum_of_sidelengths_gradient,
+    sum_of_com_distances: sum_of_com_distances_gradient,
+}
+
+# the distance parameters that are homogeneous of degree 1 in the positions
+_LINEAR_DIST_PARAMS: set[Callable[[Sequence[Cartesian3D]], float]] = {
+    sum_of_sidelengths,
+    sum_of_com_distances,
+}
+
+# the functions of the distance parameter that can be evaluated on an array at once
+_VECTORIZED_FUNCTIONS = (
+    ExponentialDecay,
+    ExponentialDecayOrder2,
+    SilveraGoldmanAttenuation,
+)
+
+
+def _evaluate_elementwise(
+    function: Callable[[float], float], values: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Evaluate the function at each of the values, in a single call if possible."""
+    if isinstance(function, _VECTORIZED_FUNCTIONS):
+        return np.asarray(function(values), dtype=np.float64)
+
+    return np.array([function(value) for value in values], dtype=np.float64)
@@ -9,15 +9,45 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Annotated
 from typing import Callable
+from typing import Protocol
 from typing import Sequence
 
-from cartesian import Cartesian3D
-from dispersion4b.potential import FourBodyDispersionPotential
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
 
+from cartesian import Cartesian3D
+from dispersion4b import batched
+from dispersion4b.geometry import QuadrupletGeometry
+from dispersion4b.scan import as_scales
+from dispersion4b.scan import dispersion_radial_scan
+from dispersion4b.scan import scale_points
+from dispersion4b.utils import PointLike
 
 FourPoints = Annotated[Sequence[Cartesian3D], 4]
 
 
+class DispersionPotential(Protocol):
+    """
+    The long-range part of a `FourBodyAnalyticPotential`; for example, the
+    `FourBodyDispersionPotential` or the `QuadrupletDispersionPotential`.
+    """
+
+    def __call__(
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
+    ) -> float: ...
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]: ...
+
+    def energies_from_geometry(
+        self, distances: NDArray[np.float64], unit_vectors: NDArray[np.float64]
+    ) -> NDArray[np.float64]: ...
+
+    def energy_and_forces(
+        self, p0: PointLike, p1: PointLike, p2: PointLike, p3: PointLike
+    ) -> tuple[float, NDArray[np.float64]]: ...
+
+
 @dataclass
 class FourBodyAnalyticPotential:
     """
@@ -36,13 +66,130 @@ class FourBodyAnalyticPotential:
       intermolecular separations decrease.
     """
 
-    dispersion_potential: FourBodyDispersionPotential
+    dispersion_potential: DispersionPotential
     short_range_potential: Callable[[FourPoints], float]
     short_long_attenuation: Callable[[FourPoints], float]
 
     def __call__(self, points: FourPoints) -> float:
+        # a single quadruplet is evaluated on plain floats, which is faster than
+        # building the small NumPy arrays of a `QuadrupletGeometry`; the geometry is
+        # only shared between the components for a batch
         short_range_energy = self.short_range_potential(points)
         short_long_att_factor = self.short_long_attenuation(points)
         dispersion_energy = self.dispersion_potential(*points)
 
         return short_range_energy + (dispersion_energy * short_long_att_factor)
+
+    def evaluate_batch(self, points: ArrayLike) -> NDArray[np.float64]:
+        """
+        Calculate the interaction energies of a batch of quadruplets, given as an
+        `(N, 4, 3)` array of points; returns an `(N,)` array of energies.
+        """
+        batch = batched.as_quadruplet_batch(points)
+        geometry = QuadrupletGeometry.from_points(batch)
+
+        short_range_energies = _evaluate_geometry(self.short_range_potential, geometry)
+        short_long_att_factors = _evaluate_geometry(
+            self.short_long_attenuation, geometry
+        )
+        dispersion_energies = self.dispersion_potential.energies_from_geometry(
+            geometry.distances, geometry.unit_vectors
+        )
+
+        return short_range_energies + (dispersion_energies * short_long_att_factors)
+
+    def energy_and_forces(
+        self, points: FourPoints
+    ) -> tuple[float, NDArray[np.float64]]:
+        """
+        Calculate the interaction energy, and the analytic forces on each of the four
+        points as a `(4, 3)` array.
+
+        The short-range potential and the attenuation function must both provide a
+        `gradient()` method (for example, a `DistanceParameterFunction` built from the
+        functions in the `shortrange` package).
+        """
+        short_range_energy = self.short_range_potential(points)
+        short_long_att_factor = self.short_long_attenuation(points)
+        dispersion_energy, dispersion_forces = (
+            self.dispersion_potential.energy_and_forces(*points)
+        )
+
+        short_range_gradient = _gradient(self.short_range_potential, points)
+        short_long_att_gradient = _gradient(self.short_long_attenuation, points)
+
+        energy = short_range_energy + (dispersion_energy * short_long_att_factor)
+        forces = (
+            -short_range_gradient
+            + (dispersion_forces * short_long_att_factor)
+            - (dispersion_energy * short_long_att_gradient)
+        )
+
+        return energy, forces
+
+    def radial_scan(self, points: FourPoints, scales: ArrayLike) -> NDArray[np.float64]:
+        """
+        The interaction energy of the shape given by `points`, after every position is
+        multiplied by each of the `scales`.
+
+        The dispersion energy is only calculated once, and scaled analytically (see
+        `scan.py`); only the short-range potential and the attenuation function are
+        evaluated at each scale.
+        """
+        dispersion_energies = dispersion_radial_scan(
+            self.dispersion_potential, points, scales
+        )
+        short_range_energies = _radial_scan(self.short_range_potential, points, scales)
+        short_long_att_factors = _radial_scan(
+            self.short_long_attenuation, points, scales
+        )
+
+        return short_range_energies + (dispersion_energies * short_long_att_factors)
+
+
+def _evaluate_geometry(
+    component: Callable[[FourPoints], float], geometry: QuadrupletGeometry
+) -> NDArray[np.float64]:
+    evaluate_geometry = getattr(component, "evaluate_geometry", None)
+    if evaluate_geometry is not None:
+        return np.asarray(evaluate_geometry(geometry), dtype=np.float64)
+
+    return _evaluate_batch(component, geometry.points)
+
+
+def _evaluate_batch(
+    component: Callable[[FourPoints], float], batch: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    evaluate_batch = getattr(component, "evaluate_batch", None)
+    if evaluate_batch is not None:
+        return np.asarray(evaluate_batch(batch), dtype=np.float64)
+
+    return np.array(
+        [component([Cartesian3D(*point) for point in points]) for points in batch],
+        dtype=np.float64,
+    )
+
+
+def _radial_scan(
+    component: Callable[[FourPoints], float], points: FourPoints, scales: ArrayLike
+) -> NDArray[np.float64]:
+    radial_scan = getattr(component, "radial_scan", None)
+    if radial_scan is not None:
+        return np.asarray(radial_scan(points, scales), dtype=np.float64)
+
+    return np.array(
+        [component(scale_points(points, scale)) for scale in as_scales(scales)]
+    )
+
+
+def _gradient(
+    component: Callable[[FourPoints], float], points: FourPoints
+) -> NDArray[np.float64]:
+    gradient = getattr(component, "gradient", None)
+    if gradient is None:
+        raise TypeError(
+            "Analytic forces require each component of the potential to have a 'gradient()' method.\n"
+            f"Found component without one: {component!r}"
+        )
+
+    return np.asarray(gradient(points), dtype=np.float64)
@@ -1,10 +1,23 @@
 """
 This module contains functions used as the short-range potential portion of the
 'FourBodyAnalyticPotential'.
+
+The functions accept either a single value, or a NumPy array of values; an array is
+evaluated elementwise, and a single float is evaluated with the `math` module, which is
+much faster than NumPy for one value.
 """
 
+from __future__ import annotations
+
 import math
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from dispersion4b.utils import FloatOrArray
+from dispersion4b.utils import as_float_or_array
 
 
 @dataclass(frozen=True)
@@ -19,8 +32,17 @@ class ExponentialDecay:
                 f"Entered: {self.expon: .12f}"
             )
 
-    def __call__(self, x: float) -> float:
-        return self.coeff * math.exp(-self.expon * x)
+    def __call__(self, x: Union[float, ArrayLike]) -> FloatOrArray:
+        if isinstance(x, (float, int)):
+            return self.coeff * math.exp(-self.expon * x)
+
+        x_values = np.asarray(x, dtype=np.float64)
+        values = self.coeff * np.exp(-self.expon * x_values)
+
+        return as_float_or_array(values, x)
+
+    def derivative(self, x: Union[float, ArrayLike]) -> FloatOrArray:
+        return -self.expon * self(x)
 
 
 @dataclass(frozen=True)
@@ -39,6 +61,21 @@ class ExponentialDecayOrder2:
                 f"Entered: {self.expon_sq: .12f}"
             )
 
-    def __call__(self, x: float) -> float:
-        exponent = (self.expon_lin * x) + (self.expon_sq * x**2)
-        return self.coeff * math.exp(-exponent)
+    def __call__(self, x: Union[float, ArrayLike]) -> FloatOrArray:
+        if isinstance(x, (float, int)):
+            return self.coeff * math.exp(-(self.expon_lin * x) - (self.expon_sq * x**2))
+
+        x_values = np.asarray(x, dtype=np.float64)
+        exponent = (self.expon_lin * x_values) + (self.expon_sq * x_values**2)
+        values = self.coeff * np.exp(-exponent)
+
+        return as_float_or_array(values, x)
+
+    def derivative(self, x: Union[float, ArrayLike]) -> FloatOrArray:
+        if isinstance(x, (float, int)):
+            return -(self.expon_lin + 2.0 * self.expon_sq * x) * self(x)
+
+        x_values = np.asarray(x, dtype=np.float64)
+        values = -(self.expon_lin + 2.0 * self.expon_sq * x_values) * self(x_values)
+
+        return as_float_or_array(values, x)
@@ -0,0 +1,200 @@
+"""
+This module converts a 'FourBodyAnalyticPotential' to and from a plain dictionary (a
+"spec") that names its building blocks and their parameters. Unlike the potential
+itself, which may hold lambdas, the spec can always be pickled or written as JSON, so
+it can be sent cheaply to other processes.
+
+An example of a spec:
+```
+{
+    "dispersion_potential": {"type": "FourBodyDispersionPotential", "c12_coeff": 1.0},
+    "short_range_potential": {
+        "function": {"type": "ExponentialDecay", "coeff": 5.0, "expon": 0.5},
+        "dist_param_calculator": "sum_of_sidelengths",
+    },
+    "short_long_attenuation": {
+        "function": {"type": "SilveraGoldmanAttenuation", "r_cutoff": 12.0, "expon_coeff": 1.0},
+        "dist_param_calculator": "sum_of_sidelengths",
+    },
+}
+```
+
+Building a potential from a spec is cached, so a worker process that receives the same
+spec many times only builds the potential once; the potentials built from equal specs
+are the same object, and must not be modified.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+from typing import Any
+from typing import Callable
+from typing import NoReturn
+
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import DispersionPotential
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+from dispersion4b.shortrange.short_range_functions import ExponentialDecayOrder2
+
+Spec = dict[str, Any]
+
+_FUNCTION_TYPES: dict[str, type] = {
+    "ExponentialDecay": ExponentialDecay,
+    "ExponentialDecayOrder2": ExponentialDecayOrder2,
+    "SilveraGoldmanAttenuation": SilveraGoldmanAttenuation,
+}
+
+_DIST_PARAM_CALCULATORS: dict[str, Callable[..., float]] = {
+    "sum_of_sidelengths": sum_of_sidelengths,
+    "sum_of_com_distances": sum_of_com_distances,
+}
+
+# the name of the coefficient of each dispersion potential
+_DISPERSION_COEFFS: dict[str, str] = {
+    "FourBodyDispersionPotential": "c12_coeff",
+    "QuadrupletDispersionPotential": "coeff",
+}
+
+_DISPERSION_TYPES: dict[str, Callable[[float], DispersionPotential]] = {
+    "FourBodyDispersionPotential": FourBodyDispersionPotential,
+    "QuadrupletDispersionPotential": QuadrupletDispersionPotential,
+}
+
+
+def potential_to_spec(potential: FourBodyAnalyticPotential) -> Spec:
+    """
+    Describe the potential as a spec. Every part of the potential must be one of the
+    building blocks named in this module; a lambda cannot be described by a spec.
+    """
+    return {
+        "dispersion_potential": _dispersion_to_spec(potential.dispersion_potential),
+        "short_range_potential": _dist_param_function_to_spec(
+            potential.short_range_potential
+        ),
+        "short_long_attenuation": _dist_param_function_to_spec(
+            potential.short_long_attenuation
+        ),
+    }
+
+
+def potential_from_spec(spec: Spec) -> FourBodyAnalyticPotential:
+    """Build the potential described by the spec; the result is cached."""
+    return _cached_potential_from_json(json.dumps(spec, sort_keys=True))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_potential_from_json(spec_json: str) -> FourBodyAnalyticPotential:
+    spec = json.loads(spec_json)
+    _check_keys(
+        spec,
+        {"dispersion_potential", "short_range_potential", "short_long_attenuation"},
+    )
+
+    return FourBodyAnalyticPotential(
+        dispersion_potential=_dispersion_from_spec(spec["dispersion_potential"]),
+        short_range_potential=_dist_param_function_from_spec(
+            spec["short_range_potential"]
+        ),
+        short_long_attenuation=_dist_param_function_from_spec(
+            spec["short_long_attenuation"]
+        ),
+    )
+
+
+def _dispersion_to_spec(potential: DispersionPotential) -> Spec:
+    type_name = type(potential).__name__
+    if type_name not in _DISPERSION_COEFFS:
+        _raise_unknown("dispersion potential", type_name, _DISPERSION_COEFFS)
+
+    coeff_name = _DISPERSION_COEFFS[type_name]
+    return {"type": type_name, coeff_name: getattr(potential, coeff_name)}
+
+
+def _dispersion_from_spec(spec: Spec) -> DispersionPotential:
+    type_name = spec.get("type")
+    if type_name not in _DISPERSION_TYPES:
+        _raise_unknown("dispersion potential", type_name, _DISPERSION_TYPES)
+
+    coeff_name = _DISPERSION_COEFFS[type_name]
+    _check_keys(spec, {"type", coeff_name})
+
+    return _DISPERSION_TYPES[type_name](spec[coeff_name])
+
+
+def _dist_param_function_to_spec(component: Callable[..., float]) -> Spec:
+    if not isinstance(component, DistanceParameterFunction):
+        raise ValueError(
+            "Only a 'DistanceParameterFunction' can be described by a spec.\n"
+            f"Entered: {component!r}"
+        )
+
+    # all the known functions are dataclasses, whose fields are their parameters
+    function: object = component.function
+    function_name = type(function).__name__
+    if (
+        function_name not in _FUNCTION_TYPES
+        or not dataclasses.is_dataclass(function)
+        or isinstance(function, type)
+    ):
+        _raise_unknown("function", function_name, _FUNCTION_TYPES)
+
+    calculator_names = {
+        calculator: name for (name, calculator) in _DIST_PARAM_CALCULATORS.items()
+    }
+    calculator_name = calculator_names.get(component.dist_param_calculator)
+    if calculator_name is None:
+        _raise_unknown(
+            "distance parameter",
+            repr(component.dist_param_calculator),
+            _DIST_PARAM_CALCULATORS,
+        )
+
+    return {
+        "function": {"type": function_name, **dataclasses.asdict(function)},
+        "dist_param_calculator": calculator_name,
+    }
+
+
+def _dist_param_function_from_spec(spec: Spec) -> DistanceParameterFunction:
+    _check_keys(spec, {"function", "dist_param_calculator"})
+
+    function_spec = dict(spec["function"])
+    function_name = function_spec.pop("type", None)
+    if function_name not in _FUNCTION_TYPES:
+        _raise_unknown("function", function_name, _FUNCTION_TYPES)
+
+    calculator_name = spec["dist_param_calculator"]
+    if calculator_name not in _DIST_PARAM_CALCULATORS:
+        _raise_unknown("distance parameter", calculator_name, _DIST_PARAM_CALCULATORS)
+
+    return DistanceParameterFunction(
+        function=_FUNCTION_TYPES[function_name](**function_spec),
+        dist_param_calculator=_DIST_PARAM_CALCULATORS[calculator_name],
+    )
+
+
+def _check_keys(spec: Spec, expected_keys: set[str]) -> None:
+    if set(spec) != expected_keys:
+        raise ValueError(
+            f"The spec must have exactly the keys {sorted(expected_keys)}.\n"
+            f"Entered: {sorted(spec)}"
+        )
+
+
+def _raise_unknown(kind: str, name: Any, known: dict[str, Any]) -> NoReturn:
+    raise ValueError(
+        f"Unknown {kind} in the spec; it must be one of {sorted(known)}.\n"
+        f"Entered: {name}"
+    )
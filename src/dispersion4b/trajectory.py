@@ -0,0 +1,149 @@
+"""
+This module evaluates the four-body energy of every frame of a trajectory (for example,
+from a path integral Monte Carlo or a molecular dynamics simulation), one frame at a
+time.
+
+The frames are read lazily, from either an XYZ text file or a `.npy` file holding an
+`(n_frames, n_particles, 3)` array; the `.npy` file is memory-mapped, so only the frame
+being evaluated is read into memory. The energies are written to the output file as
+soon as each frame is evaluated, so the memory used does not grow with the length of
+the trajectory.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import TextIO
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+PathLike = Union[str, Path]
+
+
+def read_xyz_frames(path: PathLike) -> Iterator[NDArray[np.float64]]:
+    """
+    Read the `(n_particles, 3)` positions of each frame of an XYZ file, one frame at a
+    time. Each frame is a line with the number of particles, a comment line, and one
+    line per particle with its symbol and its three coordinates.
+    """
+    with open(path, "r") as xyz_file:
+        while True:
+            header = xyz_file.readline()
+            if not header:
+                return
+            if not header.strip():
+                continue
+
+            n_particles = _parse_n_particles(header, path)
+            xyz_file.readline()  # the comment line
+
+            positions = np.empty((n_particles, 3), dtype=np.float64)
+            for i in range(n_particles):
+                positions[i] = _parse_coordinates(xyz_file.readline(), path)
+
+            yield positions
+
+
+def read_npy_frames(path: PathLike) -> Iterator[NDArray[np.float64]]:
+    """
+    Read the `(n_particles, 3)` positions of each frame of a memory-mapped `.npy` file
+    holding an `(n_frames, n_particles, 3)` array, one frame at a time.
+    """
+    frames = np.load(path, mmap_mode="r")
+    if frames.ndim != 3 or frames.shape[2] != 3:
+        raise ValueError(
+            "The frames in a .npy file must have the shape (n_frames, n_particles, 3).\n"
+            f"Entered: shape = {frames.shape}"
+        )
+
+    for frame in frames:
+        yield np.array(frame, dtype=np.float64)
+
+
+def read_frames(path: PathLike) -> Iterator[NDArray[np.float64]]:
+    """Read the frames of an `.xyz` or a `.npy` file, depending on its extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".xyz":
+        return read_xyz_frames(path)
+    elif suffix == ".npy":
+        return read_npy_frames(path)
+    else:
+        raise ValueError(
+            "The trajectory must be an '.xyz' or a '.npy' file.\n"
+            f"Entered: path = {path}"
+        )
+
+
+def frame_energies(
+    energy: Callable[[ArrayLike], float], frames: Iterable[ArrayLike]
+) -> Iterator[float]:
+    """
+    The energy of each frame, evaluated lazily.
+
+    energy
+    - calculates the energy of a frame from its `(n_particles, 3)` positions; for
+      example, a `ClusterDispersionEnergy`
+    """
+    for positions in frames:
+        yield float(energy(positions))
+
+
+def evaluate_trajectory(
+    energy: Callable[[ArrayLike], float],
+    trajectory_path: PathLike,
+    output: Union[PathLike, TextIO],
+) -> int:
+    """
+    Evaluate the energy of every frame in the trajectory file, and write one line with
+    the frame index and its energy to `output` as soon as each frame is evaluated.
+
+    Returns the number of frames evaluated.
+    """
+    if isinstance(output, (str, Path)):
+        with open(output, "w") as output_file:
+            return _write_energies(energy, trajectory_path, output_file)
+    else:
+        return _write_energies(energy, trajectory_path, output)
+
+
+def _write_energies(
+    energy: Callable[[ArrayLike], float],
+    trajectory_path: PathLike,
+    output_file: TextIO,
+) -> int:
+    n_frames = 0
+    for index, frame_energy in enumerate(
+        frame_energies(energy, read_frames(trajectory_path))
+    ):
+        output_file.write(f"{index} {frame_energy!r}\n")
+        output_file.flush()
+        n_frames += 1
+
+    return n_frames
+
+
+def _parse_n_particles(line: str, path: PathLike) -> int:
+    try:
+        return int(line.strip())
+    except ValueError:
+        raise ValueError(
+            "Expected the number of particles at the start of an XYZ frame.\n"
+            f"Entered: '{line.strip()}' in {path}"
+        ) from None
+
+
+def _parse_coordinates(line: str, path: PathLike) -> list[float]:
+    fields = line.split()
+    if len(fields) < 4:
+        raise ValueError(
+            "Each particle in an XYZ frame needs a symbol and three coordinates.\n"
+            f"Entered: '{line.strip()}' in {path}"
+        )
+
+    return [float(field) for field in fields[1:4]]
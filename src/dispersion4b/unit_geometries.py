@@ -0,0 +1,35 @@
+"""
+The points of the simple quadruplet geometries whose energies are easy to calculate by
+hand; these are shared by the unit tests and the benchmarks.
+"""
+
+import math
+
+from cartesian import Cartesian3D
+
+
+def get_tetrahedron_points(sidelen: float) -> list[Cartesian3D]:
+    p0 = sidelen * Cartesian3D(-0.5, 0.0, 0.0)
+    p1 = sidelen * Cartesian3D(0.5, 0.0, 0.0)
+    p2 = sidelen * Cartesian3D(0.0, math.sqrt(3.0 / 4.0), 0.0)
+    p3 = sidelen * Cartesian3D(0.0, math.sqrt(1.0 / 12.0), math.sqrt(2.0 / 3.0))
+
+    return [p0, p1, p2, p3]
+
+
+def get_square_points(sidelen: float) -> list[Cartesian3D]:
+    p0 = sidelen * Cartesian3D(0.0, 0.0, 0.0)
+    p1 = sidelen * Cartesian3D(1.0, 0.0, 0.0)
+    p2 = sidelen * Cartesian3D(1.0, 1.0, 0.0)
+    p3 = sidelen * Cartesian3D(0.0, 1.0, 0.0)
+
+    return [p0, p1, p2, p3]
+
+
+def get_collinear_points(sidelen: float) -> list[Cartesian3D]:
+    p0 = sidelen * Cartesian3D(0.0, 0.0, 0.0)
+    p1 = sidelen * Cartesian3D(1.0, 0.0, 0.0)
+    p2 = sidelen * Cartesian3D(2.0, 0.0, 0.0)
+    p3 = sidelen * Cartesian3D(3.0, 0.0, 0.0)
+
+    return [p0, p1, p2, p3]
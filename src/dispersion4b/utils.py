@@ -1,8 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Sequence
+from typing import TypeVar
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
 from cartesian import CartesianND
 from cartesian.measure import euclidean_norm
 
 from dispersion4b.magnitude_and_direction import MagnitudeAndDirection
 
+if TYPE_CHECKING:
+    # `typing.TypeGuard` is only available from Python 3.10
+    from typing_extensions import TypeGuard
+
+# a single value, or an array of values evaluated elementwise
+FloatOrArray = Union[float, NDArray[np.float64]]
+
+# a point, either as a `CartesianND` or as a NumPy array (or other sequence of floats)
+PointLike = Union[CartesianND, ArrayLike]
+
+CartesianT = TypeVar("CartesianT", bound=CartesianND)
+
+
+def are_all_cartesian(
+    points: Sequence[PointLike], point_type: type[CartesianT]
+) -> TypeGuard[Sequence[CartesianT]]:
+    """Whether every one of the points is an instance of the given `CartesianND` type."""
+    return all(isinstance(point, point_type) for point in points)
+
 
 def distance_and_unit_vector(
     p_i: CartesianND, p_j: CartesianND
@@ -13,3 +43,33 @@ def distance_and_unit_vector(
     unit_vec = p_ij / distance
 
     return MagnitudeAndDirection(distance, unit_vec)
+
+
+def as_point_array(
+    points: Union[Sequence[PointLike], ArrayLike],
+) -> NDArray[np.float64]:
+    """
+    The coordinates of the points as an `(n_points, n_dims)` array; an array that
+    already holds float64 coordinates is used without copying.
+    """
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=np.float64)
+
+    if isinstance(points, Sequence):
+        points = [
+            tuple(point) if isinstance(point, CartesianND) else point
+            for point in points
+        ]
+
+    return np.array(points, dtype=np.float64)
+
+
+def as_float_or_array(values: NDArray[np.float64], inputs: ArrayLike) -> FloatOrArray:
+    """
+    Return the values as a plain float if the inputs they were calculated from are a
+    scalar, and as an array otherwise.
+    """
+    if np.ndim(inputs) == 0:
+        return float(values)
+
+    return values
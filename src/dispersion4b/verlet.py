@@ -0,0 +1,189 @@
+"""
+This module contains a Verlet list for quadruplets, which lets the quadruplets within
+the cutoff be reused over many steps of a simulation instead of being enumerated again
+at every step.
+
+The quadruplets are enumerated with the cutoff extended by a skin distance. As long as
+no particle has moved by more than half of the skin since the last enumeration, no pair
+can have moved from outside `cutoff + skin` to inside `cutoff`, so every quadruplet
+within the cutoff is still among the stored candidates; only the candidates need to be
+checked against the cutoff at each step. When some particle does move farther than half
+the skin, the candidates are enumerated again.
+
+A larger skin means fewer rebuilds, but more candidates to check at every step.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from dispersion4b.cluster import BatchPotential
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.neighbor_list import as_positions
+from dispersion4b.neighbor_list import enumerate_quadruplets
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.periodic import check_cutoff_fits_box
+
+
+class VerletQuadrupletList:
+    """
+    The candidate quadruplets within `cutoff + skin`, rebuilt only when some particle
+    has moved by more than half of the skin since the last rebuild.
+
+    cutoff
+    - the pair cutoff of the quadruplets of interest
+    skin
+    - the extra distance added to the cutoff when enumerating the candidates
+    box
+    - if given, the particles are in this periodic box; `cutoff + skin` must fit in the
+      box (see `PeriodicBox.max_quadruplet_cutoff()`)
+    """
+
+    def __init__(
+        self, cutoff: float, skin: float, box: Optional[PeriodicBox] = None
+    ) -> None:
+        self._check_cutoff_positive(cutoff)
+        self._check_skin_nonnegative(skin)
+        if box is not None:
+            check_cutoff_fits_box(cutoff + skin, box.max_quadruplet_cutoff())
+
+        self._cutoff = cutoff
+        self._skin = skin
+        self._box = box
+
+        self._reference_positions: Optional[NDArray[np.float64]] = None
+        self._candidates = np.empty((0, 4), dtype=np.int64)
+        self._n_updates = 0
+        self._n_rebuilds = 0
+
+    @property
+    def cutoff(self) -> float:
+        return self._cutoff
+
+    @property
+    def skin(self) -> float:
+        return self._skin
+
+    @property
+    def n_updates(self) -> int:
+        """The number of times the candidates have been asked for."""
+        return self._n_updates
+
+    @property
+    def n_rebuilds(self) -> int:
+        """The number of times the candidates have been enumerated."""
+        return self._n_rebuilds
+
+    @property
+    def reuse_ratio(self) -> float:
+        """The fraction of the updates that reused the stored candidates."""
+        if self._n_updates == 0:
+            return 0.0
+
+        return (self._n_updates - self._n_rebuilds) / self._n_updates
+
+    def quadruplets(self, positions: ArrayLike) -> NDArray[np.int64]:
+        """
+        The `(M, 4)` candidate quadruplets for the given positions; this includes every
+        quadruplet whose six pair distances are all less than the cutoff, along with
+        some that are not.
+        """
+        positions = as_positions(positions)
+        self._n_updates += 1
+
+        if self._needs_rebuild(positions):
+            self._candidates = enumerate_quadruplets(
+                positions, self._cutoff + self._skin, self._box
+            )
+            self._reference_positions = positions.copy()
+            self._n_rebuilds += 1
+
+        return self._candidates
+
+    def _needs_rebuild(self, positions: NDArray[np.float64]) -> bool:
+        reference = self._reference_positions
+        if reference is None or reference.shape != positions.shape:
+            return True
+
+        displacements = positions - reference
+        if self._box is not None:
+            displacements = self._box.minimum_image(displacements)
+
+        max_sq_displacement = np.max(
+            np.einsum("ij,ij->i", displacements, displacements), initial=0.0
+        )
+
+        return bool(max_sq_displacement > (0.5 * self._skin) ** 2)
+
+    def _check_cutoff_positive(self, cutoff: float) -> None:
+        if cutoff <= 0.0:
+            raise ValueError(
+                "The cutoff distance must be positive.\n" f"Entered: cutoff = {cutoff}"
+            )
+
+    def _check_skin_nonnegative(self, skin: float) -> None:
+        if skin < 0.0:
+            raise ValueError(
+                "The skin distance must be zero or positive.\n"
+                f"Entered: skin = {skin}"
+            )
+
+
+class VerletClusterEnergy(ClusterDispersionEnergy):
+    """
+    Calculate the total four-body dispersion interaction energy of a cluster from all
+    the quadruplets within the cutoffs, like `ClusterDispersionEnergy`, but reusing
+    the enumerated quadruplets between calls through a `VerletQuadrupletList`.
+
+    skin
+    - the skin distance of the Verlet list
+
+    The remaining arguments are the same as for `ClusterDispersionEnergy`.
+    """
+
+    def __init__(
+        self,
+        potential: BatchPotential,
+        pair_cutoff: Optional[float],
+        skin: float,
+        batch_size: int = 65536,
+        box: Optional[PeriodicBox] = None,
+        sidelength_sum_cutoff: Optional[float] = None,
+    ) -> None:
+        super().__init__(
+            potential,
+            pair_cutoff=pair_cutoff,
+            sidelength_sum_cutoff=sidelength_sum_cutoff,
+            batch_size=batch_size,
+            box=box,
+        )
+        self._neighbor_list = VerletQuadrupletList(self._pair_cutoff, skin, box)
+
+    @property
+    def neighbor_list(self) -> VerletQuadrupletList:
+        return self._neighbor_list
+
+    def quadruplets(self, positions: ArrayLike) -> NDArray[np.int64]:
+        """
+        The `(M, 4)` candidate quadruplets from the Verlet list; these include every
+        quadruplet within the pair cutoff, along with some outside of it, which are
+        given an energy of zero by `energies()`.
+        """
+        return self._neighbor_list.quadruplets(positions)
+
+    def _within_cutoffs(
+        self, distances: NDArray[np.float64]
+    ) -> Optional[NDArray[np.bool_]]:
+        within_pair_cutoff: NDArray[np.bool_] = np.all(
+            distances < self._pair_cutoff, axis=1
+        )
+
+        within_sidelength_sum_cutoff = super()._within_cutoffs(distances)
+        if within_sidelength_sum_cutoff is None:
+            return within_pair_cutoff
+
+        return within_pair_cutoff & within_sidelength_sum_cutoff
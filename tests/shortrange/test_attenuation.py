@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from dataclasses import dataclass
@@ -33,3 +34,19 @@ class TestSilveraGoldmanAttenuation:
     def test_raises_nonpositive_expon_cutoff(self, bad_expon_coeff, sga_args):
         with pytest.raises(ValueError):
             SilveraGoldmanAttenuation(sga_args.r_cutoff, bad_expon_coeff)
+
+
+def test_array_input_matches_scalar():
+    sg_atten = SilveraGoldmanAttenuation(2.0, 1.5)
+    r_values = np.linspace(0.5, 3.0, 26)
+
+    values = sg_atten(r_values)
+    derivatives = sg_atten.derivative(r_values)
+
+    assert isinstance(sg_atten(1.0), float)
+    assert isinstance(sg_atten(3.0), float)
+    assert values.tolist() == pytest.approx([sg_atten(r) for r in r_values.tolist()])
+    assert derivatives.tolist() == pytest.approx(
+        [sg_atten.derivative(r) for r in r_values.tolist()]
+    )
+    assert np.all(values[r_values >= 2.0] == 1.0)
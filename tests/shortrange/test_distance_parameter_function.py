@@ -1,12 +1,23 @@
 import math
 
+import numpy as np
 import pytest
 from cartesian import Cartesian3D
 from cartesian.operations import centroid
 from cartesian.measure import euclidean_distance as distance
 
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
 from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
 from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import (
+    sum_of_com_distances_batch,
+)
+from dispersion4b.shortrange.distance_parameter_function import (
+    sum_of_sidelengths_batch,
+)
 
 
 @pytest.fixture(scope="function")
@@ -33,3 +44,41 @@ def test_sum_of_com_distances(unit_tetrahedron_points):
     dist = distance(com, unit_tetrahedron_points[0])
 
     assert sum_of_com_distances(unit_tetrahedron_points) == pytest.approx(4 * dist)
+
+
+@pytest.fixture(scope="module")
+def random_batch():
+    rng = np.random.default_rng(seed=9)
+    yield rng.uniform(0.0, 3.0, size=(16, 4, 3))
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator, batch_calculator",
+    [
+        (sum_of_sidelengths, sum_of_sidelengths_batch),
+        (sum_of_com_distances, sum_of_com_distances_batch),
+    ],
+)
+def test_batched_dist_params(dist_param_calculator, batch_calculator, random_batch):
+    expect_params = [
+        dist_param_calculator([Cartesian3D(*p) for p in points])
+        for points in random_batch
+    ]
+
+    assert batch_calculator(random_batch) == pytest.approx(expect_params)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator",
+    [sum_of_sidelengths, sum_of_com_distances, lambda points: points[0].x ** 2],
+)
+def test_evaluate_batch_matches_call(dist_param_calculator, random_batch):
+    function = DistanceParameterFunction(
+        SilveraGoldmanAttenuation(6.0, 1.0), dist_param_calculator
+    )
+
+    expect_values = [
+        function([Cartesian3D(*p) for p in points]) for points in random_batch
+    ]
+
+    assert function.evaluate_batch(random_batch) == pytest.approx(expect_values)
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecayOrder2
+
+
+@pytest.fixture(scope="module")
+def random_batch():
+    rng = np.random.default_rng(seed=13)
+    yield rng.uniform(0.0, 4.0, size=(16, 4, 3))
+
+
+@pytest.mark.parametrize(
+    "short_long_attenuation",
+    [
+        DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_com_distances
+        ),
+        lambda points: 1.0 - math.exp(-(points[1].x ** 2)),
+    ],
+)
+def test_evaluate_batch_matches_call(short_long_attenuation, random_batch):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecayOrder2(5.0, 0.5, 0.1), sum_of_sidelengths
+        ),
+        short_long_attenuation=short_long_attenuation,
+    )
+
+    expect_energies = [
+        potential([Cartesian3D(*p) for p in points]) for points in random_batch
+    ]
+
+    assert potential.evaluate_batch(random_batch) == pytest.approx(expect_energies)
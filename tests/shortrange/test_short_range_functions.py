@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from contextlib import nullcontext
@@ -64,3 +65,21 @@ class TestExponentialDecayOrder2:
                 ExponentialDecayOrder2(edo2_args.coeff, expon_lin, edo2_args.expon_sq)
                 is not None
             )
+
+
+@pytest.mark.parametrize(
+    "function",
+    [ExponentialDecay(2.0, 0.7), ExponentialDecayOrder2(2.0, 0.7, 0.3)],
+)
+def test_array_input_matches_scalar(function):
+    x_values = np.linspace(0.0, 5.0, 11)
+
+    values = function(x_values)
+    derivatives = function.derivative(x_values)
+
+    assert isinstance(function(1.0), float)
+    assert isinstance(values, np.ndarray)
+    assert values.tolist() == pytest.approx([function(x) for x in x_values.tolist()])
+    assert derivatives.tolist() == pytest.approx(
+        [function.derivative(x) for x in x_values.tolist()]
+    )
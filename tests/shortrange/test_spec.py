@@ -0,0 +1,83 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecayOrder2
+from dispersion4b.shortrange.spec import potential_from_spec
+from dispersion4b.shortrange.spec import potential_to_spec
+
+
+@pytest.fixture(scope="module")
+def analytic_potential():
+    yield FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(2.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecayOrder2(5.0, 0.5, 0.1), sum_of_sidelengths
+        ),
+        short_long_attenuation=DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_com_distances
+        ),
+    )
+
+
+def test_round_trip_through_json(analytic_potential):
+    spec = potential_to_spec(analytic_potential)
+    rebuilt = potential_from_spec(json.loads(json.dumps(spec)))
+
+    batch = np.random.default_rng(seed=4).uniform(0.0, 4.0, size=(8, 4, 3))
+
+    assert pickle.loads(pickle.dumps(spec)) == spec
+    assert rebuilt.evaluate_batch(batch) == pytest.approx(
+        analytic_potential.evaluate_batch(batch)
+    )
+
+
+def test_reconstruction_is_cached(analytic_potential):
+    spec = potential_to_spec(analytic_potential)
+
+    assert potential_from_spec(spec) is potential_from_spec(dict(spec))
+
+
+def test_quadruplet_dispersion_potential(analytic_potential):
+    spec = potential_to_spec(analytic_potential)
+    spec["dispersion_potential"] = {
+        "type": "QuadrupletDispersionPotential",
+        "coeff": 3.0,
+    }
+
+    rebuilt = potential_from_spec(spec)
+
+    assert isinstance(rebuilt.dispersion_potential, QuadrupletDispersionPotential)
+    assert rebuilt.dispersion_potential.coeff == 3.0
+
+
+def test_raises_lambda_component():
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=lambda points: 0.0,
+        short_long_attenuation=lambda points: 1.0,
+    )
+
+    with pytest.raises(ValueError):
+        potential_to_spec(potential)
+
+
+def test_raises_unknown_function(analytic_potential):
+    spec = potential_to_spec(analytic_potential)
+    spec["short_range_potential"]["function"]["type"] = "GaussianDecay"
+
+    with pytest.raises(ValueError):
+        potential_from_spec(spec)
@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b.batched import as_quadruplet_batch
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+def get_tetrahedron_array(sidelen: float) -> np.ndarray:
+    return sidelen * np.array(
+        [
+            [-0.5, 0.0, 0.0],
+            [0.5, 0.0, 0.0],
+            [0.0, math.sqrt(3.0 / 4.0), 0.0],
+            [0.0, math.sqrt(1.0 / 12.0), math.sqrt(2.0 / 3.0)],
+        ]
+    )
+
+
+def get_random_batch(n_quadruplets: int) -> np.ndarray:
+    rng = np.random.default_rng(seed=42)
+    return rng.uniform(-2.0, 2.0, size=(n_quadruplets, 4, 3))
+
+
+def as_cartesian_points(points: np.ndarray) -> list[Cartesian3D]:
+    return [Cartesian3D(*point) for point in points]
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.5), QuadrupletDispersionPotential(1.5)],
+)
+def test_batch_matches_scalar(potential):
+    batch = get_random_batch(32)
+
+    expect_energies = [potential(*as_cartesian_points(points)) for points in batch]
+    actual_energies = potential.evaluate_batch(batch)
+
+    assert actual_energies.shape == (32,)
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+def test_batch_tetrahedron_by_hand():
+    cos120 = math.cos((2.0 / 3.0) * math.pi)
+    total_pair_contrib = 6.0
+    total_triplet_contrib = 12.0 * (1.0 + cos120**2)
+    total_quadruplet_contrib = 6.0 * (-1.0 + 4 * (cos120**2) + 9 * (cos120**4))
+    expect_energy = -(
+        total_pair_contrib + total_triplet_contrib + total_quadruplet_contrib
+    )
+
+    pot = FourBodyDispersionPotential(1.0)
+    energies = pot.evaluate_batch(get_tetrahedron_array(1.0)[np.newaxis])
+
+    assert energies[0] == pytest.approx(expect_energy)
+
+
+def test_batch_is_not_copied():
+    batch = get_random_batch(4)
+    assert as_quadruplet_batch(batch) is batch
+
+
+@pytest.mark.parametrize("bad_shape", [(4, 3), (2, 3, 3), (2, 4, 2)])
+def test_raises_bad_batch_shape(bad_shape):
+    with pytest.raises(ValueError):
+        as_quadruplet_batch(np.zeros(bad_shape))
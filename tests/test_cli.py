@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cli import main
+from dispersion4b.coefficients import b12_parahydrogen_avtz_approx
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def batch():
+    rng = np.random.default_rng(seed=17)
+    yield rng.uniform(0.0, 5.0, size=(25, 4, 3))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_npy_to_npy(workers, batch, tmp_path):
+    input_path = tmp_path / "quadruplets.npy"
+    output_path = tmp_path / "energies.npy"
+    np.save(input_path, batch)
+
+    argv = [str(input_path), "--output", str(output_path), "--batch-size", "7"]
+    argv += ["--potential", "quadruplet", "--workers", str(workers)]
+    assert main(argv) == 0
+
+    potential = QuadrupletDispersionPotential(b12_parahydrogen_avtz_approx())
+    assert np.load(output_path) == pytest.approx(potential.evaluate_batch(batch))
+
+
+def test_npy_format_keeps_output_name(batch, tmp_path):
+    input_path = tmp_path / "quadruplets.npy"
+    output_path = tmp_path / "energies.dat"
+    np.save(input_path, batch)
+
+    assert main([str(input_path), "--output", str(output_path), "--format", "npy"]) == 0
+
+    assert not (tmp_path / "energies.dat.npy").exists()
+    potential = FourBodyDispersionPotential(b12_parahydrogen_avtz_approx())
+    assert np.load(output_path) == pytest.approx(potential.evaluate_batch(batch))
+
+
+def test_text_to_stdout(batch, tmp_path, capsys):
+    input_path = tmp_path / "quadruplets.dat"
+    np.savetxt(input_path, batch.reshape(-1, 12))
+
+    assert main([str(input_path), "--coefficient", "2.5"]) == 0
+
+    energies = np.array([float(line) for line in capsys.readouterr().out.split()])
+    potential = FourBodyDispersionPotential(2.5)
+    assert energies == pytest.approx(potential.evaluate_batch(batch))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--coefficient", "not_a_coefficient"],
+        ["--batch-size", "0"],
+        ["--format", "npy"],
+    ],
+)
+def test_raises_invalid_options(options, batch, tmp_path):
+    input_path = tmp_path / "quadruplets.npy"
+    np.save(input_path, batch)
+
+    with pytest.raises(SystemExit):
+        main([str(input_path), *options])
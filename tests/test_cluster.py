@@ -0,0 +1,99 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=1)
+    yield rng.uniform(0.0, 6.0, size=(25, 3))
+
+
+def sidelengths(positions: np.ndarray, quadruplet: tuple) -> list[float]:
+    return [
+        np.linalg.norm(positions[i] - positions[j])
+        for (i, j) in itertools.combinations(quadruplet, 2)
+    ]
+
+
+def brute_force_energy(potential, positions: np.ndarray, within_cutoff) -> float:
+    quadruplets = [
+        q
+        for q in itertools.combinations(range(len(positions)), 4)
+        if within_cutoff(sidelengths(positions, q))
+    ]
+    return float(np.sum(potential.evaluate_batch(positions[np.array(quadruplets)])))
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_pair_cutoff_matches_brute_force(potential, random_positions):
+    pair_cutoff = 2.5
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=pair_cutoff)
+
+    expect_energy = brute_force_energy(
+        potential, random_positions, lambda dists: max(dists) < pair_cutoff
+    )
+    actual_energy = cluster_energy(random_positions)
+
+    assert actual_energy == pytest.approx(expect_energy)
+
+
+def test_sidelength_sum_cutoff_matches_brute_force(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    sum_cutoff = 10.0
+    cluster_energy = ClusterDispersionEnergy(
+        potential, sidelength_sum_cutoff=sum_cutoff, batch_size=7
+    )
+
+    expect_energy = brute_force_energy(
+        potential, random_positions, lambda dists: sum(dists) < sum_cutoff
+    )
+    actual_energy = cluster_energy(random_positions)
+
+    assert actual_energy == pytest.approx(expect_energy)
+
+
+class GeometryOnlyPotential:
+    """A potential without `energies_from_squared_distances()`."""
+
+    def __init__(self, potential) -> None:
+        self.potential = potential
+
+    def energies_from_geometry(self, distances, unit_vectors):
+        return self.potential.energies_from_geometry(distances, unit_vectors)
+
+
+@pytest.mark.parametrize("sidelength_sum_cutoff", [None, 7.0])
+def test_squared_distances_match_unit_vectors(sidelength_sum_cutoff, random_positions):
+    potential = FourBodyDispersionPotential(1.0)
+    kwargs = dict(
+        pair_cutoff=2.5, sidelength_sum_cutoff=sidelength_sum_cutoff, batch_size=100
+    )
+    expect_energy = ClusterDispersionEnergy(GeometryOnlyPotential(potential), **kwargs)
+
+    cluster_energy = ClusterDispersionEnergy(potential, **kwargs)
+
+    assert cluster_energy(random_positions) == pytest.approx(
+        expect_energy(random_positions)
+    )
+
+
+def test_raises_no_cutoff():
+    with pytest.raises(ValueError):
+        ClusterDispersionEnergy(QuadrupletDispersionPotential(1.0))
+
+
+@pytest.mark.parametrize("bad_cutoff", [-1.0, 0.0])
+def test_raises_nonpositive_cutoff(bad_cutoff):
+    with pytest.raises(ValueError):
+        ClusterDispersionEnergy(
+            QuadrupletDispersionPotential(1.0), pair_cutoff=bad_cutoff
+        )
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b import batched
+from dispersion4b.components import BadeComponent
+from dispersion4b.components import BadeComponentPotential
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_batch():
+    rng = np.random.default_rng(seed=3)
+    yield rng.uniform(-2.0, 2.0, size=(32, 4, 3))
+
+
+def test_all_components_match_full_potential(random_batch):
+    potential = BadeComponentPotential(1.5)
+    expect_energies = FourBodyDispersionPotential(1.5).evaluate_batch(random_batch)
+
+    assert potential.evaluate_batch(random_batch) == pytest.approx(expect_energies)
+
+
+def test_quadruplet_component_matches_quadruplet_potential(random_batch):
+    potential = BadeComponentPotential(1.5, BadeComponent.QUADRUPLET)
+    expect_energies = QuadrupletDispersionPotential(1.5).evaluate_batch(random_batch)
+
+    assert potential.evaluate_batch(random_batch) == pytest.approx(expect_energies)
+
+
+def test_components_sum_to_total(random_batch):
+    potential = BadeComponentPotential(1.5)
+    energies = potential.evaluate_components(random_batch)
+
+    separations = batched.pair_separations(random_batch)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+    assert energies.pair == pytest.approx(-1.5 * batched.pair_contributions(distances))
+    assert energies.triplet == pytest.approx(
+        -1.5 * batched.triplet_contributions(distances, unit_vectors)
+    )
+    assert energies.total == pytest.approx(
+        energies.pair + energies.triplet + energies.quadruplet
+    )
+
+
+def test_unrequested_components_are_none(random_batch):
+    potential = BadeComponentPotential(1.0, BadeComponent.PAIR | BadeComponent.TRIPLET)
+    energies = potential.evaluate_components(random_batch)
+
+    assert energies.pair is not None
+    assert energies.triplet is not None
+    assert energies.quadruplet is None
+
+
+def test_scalar_matches_batch(random_batch):
+    potential = BadeComponentPotential(1.0, BadeComponent.TRIPLET)
+    points = random_batch[0]
+
+    expect_energy = potential.evaluate_batch(points[np.newaxis])[0]
+    actual_energy = potential(*[Cartesian3D(*point) for point in points])
+
+    assert actual_energy == pytest.approx(expect_energy)
+
+
+def test_raises_no_components():
+    with pytest.raises(ValueError):
+        BadeComponentPotential(1.0, BadeComponent(0))
+
+
+def test_raises_negative_coeff():
+    with pytest.raises(ValueError):
+        BadeComponentPotential(-1.0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.dipole_tensor import DipoleTensorClusterEnergy
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def clumps():
+    rng = np.random.default_rng(seed=73)
+    centres = rng.uniform(0.0, 30.0, size=(5, 3))
+    yield np.concatenate(
+        [centre + rng.normal(scale=0.6, size=(8, 3)) for centre in centres]
+    )
+
+
+@pytest.fixture(scope="module")
+def scattered():
+    rng = np.random.default_rng(seed=29)
+    yield rng.uniform(0.0, 8.0, size=(24, 3))
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [QuadrupletDispersionPotential(1.5), FourBodyDispersionPotential(1.5)],
+)
+@pytest.mark.parametrize("positions_name", ["clumps", "scattered"])
+def test_matches_all_quadruplets(potential, positions_name, request):
+    positions = request.getfixturevalue(positions_name)
+    expect_energy = ClusterDispersionEnergy(potential, pair_cutoff=1.0e3)(positions)
+
+    actual_energy = DipoleTensorClusterEnergy(potential)(positions)
+
+    assert actual_energy == pytest.approx(expect_energy, rel=1.0e-10)
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 64])
+def test_independent_of_block_size(block_size, scattered):
+    potential = FourBodyDispersionPotential(1.0)
+    expect_energy = DipoleTensorClusterEnergy(potential)(scattered)
+
+    actual_energy = DipoleTensorClusterEnergy(potential, block_size)(scattered)
+
+    assert actual_energy == pytest.approx(expect_energy, rel=1.0e-12)
+
+
+def test_too_few_particles():
+    cluster_energy = DipoleTensorClusterEnergy(QuadrupletDispersionPotential(1.0))
+
+    assert cluster_energy(np.eye(3)) == 0.0
+
+
+def test_raises_invalid_potential():
+    with pytest.raises(TypeError):
+        DipoleTensorClusterEnergy(ClusterDispersionEnergy)
+
+
+@pytest.mark.parametrize("block_size", [0, -1])
+def test_raises_nonpositive_block_size(block_size):
+    with pytest.raises(ValueError):
+        DipoleTensorClusterEnergy(QuadrupletDispersionPotential(1.0), block_size)
@@ -0,0 +1,122 @@
+"""
+Check that the analytic forces are consistent with central finite differences of
+the corresponding energies.
+"""
+
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+from dispersion4b.shortrange.short_range_functions import ExponentialDecayOrder2
+
+
+def as_cartesian_points(points: np.ndarray) -> list[Cartesian3D]:
+    return [Cartesian3D(*point) for point in points]
+
+
+def finite_difference_forces(
+    energy_func: Callable[[np.ndarray], float],
+    points: np.ndarray,
+    step: float = 1.0e-6,
+) -> np.ndarray:
+    """The negative gradient of `energy_func` using central finite differences."""
+    forces = np.empty_like(points)
+
+    for index in np.ndindex(points.shape):
+        points_plus = points.copy()
+        points_minus = points.copy()
+        points_plus[index] += step
+        points_minus[index] -= step
+
+        energy_diff = energy_func(points_plus) - energy_func(points_minus)
+        forces[index] = -energy_diff / (2.0 * step)
+
+    return forces
+
+
+@pytest.fixture(scope="module")
+def random_quadruplets():
+    rng = np.random.default_rng(seed=7)
+    yield 3.0 * rng.uniform(0.0, 1.0, size=(5, 4, 3))
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_dispersion_forces(potential, random_quadruplets):
+    def energy_func(points: np.ndarray) -> float:
+        return potential(*as_cartesian_points(points))
+
+    for points in random_quadruplets:
+        energy, forces = potential.energy_and_forces(*as_cartesian_points(points))
+        expect_forces = finite_difference_forces(energy_func, points)
+
+        assert energy == pytest.approx(energy_func(points))
+        assert forces == pytest.approx(expect_forces, rel=1.0e-5, abs=1.0e-8)
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_batched_forces(potential, random_quadruplets):
+    energies, forces = potential.evaluate_batch_with_forces(random_quadruplets)
+
+    assert energies == pytest.approx(potential.evaluate_batch(random_quadruplets))
+    for points, actual_forces in zip(random_quadruplets, forces):
+        _, expect_forces = potential.energy_and_forces(*as_cartesian_points(points))
+        assert actual_forces == pytest.approx(expect_forces)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator", [sum_of_sidelengths, sum_of_com_distances]
+)
+def test_analytic_potential_forces(dist_param_calculator, random_quadruplets):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecayOrder2(5.0, 0.5, 0.1), dist_param_calculator
+        ),
+        short_long_attenuation=DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), dist_param_calculator
+        ),
+    )
+
+    def energy_func(points: np.ndarray) -> float:
+        return potential(as_cartesian_points(points))
+
+    for points in random_quadruplets:
+        energy, forces = potential.energy_and_forces(as_cartesian_points(points))
+        expect_forces = finite_difference_forces(energy_func, points)
+
+        assert energy == pytest.approx(energy_func(points))
+        assert forces == pytest.approx(expect_forces, rel=1.0e-5, abs=1.0e-8)
+
+
+def test_analytic_potential_raises_without_gradient(random_quadruplets):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=lambda points: 0.0,
+        short_long_attenuation=DistanceParameterFunction(
+            ExponentialDecay(1.0, 1.0), sum_of_sidelengths
+        ),
+    )
+
+    with pytest.raises(TypeError):
+        potential.energy_and_forces(as_cartesian_points(random_quadruplets[0]))
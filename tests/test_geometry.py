@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b.geometry import QuadrupletGeometry
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+
+
+@pytest.fixture(scope="module")
+def random_points():
+    rng = np.random.default_rng(seed=5)
+    yield [Cartesian3D(*point) for point in rng.uniform(0.0, 3.0, size=(4, 3))]
+
+
+def test_geometry_matches_points(random_points):
+    geometry = QuadrupletGeometry.from_points(random_points)
+
+    p0, p1, p2, p3 = random_points
+    expect_distances = [
+        np.linalg.norm(np.subtract(tuple(p_i), tuple(p_j)))
+        for (p_i, p_j) in [(p1, p0), (p2, p0), (p3, p0), (p2, p1), (p3, p1), (p3, p2)]
+    ]
+
+    assert geometry.distances == pytest.approx(expect_distances)
+    assert np.linalg.norm(geometry.unit_vectors, axis=1) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator",
+    [sum_of_sidelengths, sum_of_com_distances, lambda points: points[0].x ** 2],
+)
+def test_evaluate_geometry_matches_call(dist_param_calculator, random_points):
+    function = DistanceParameterFunction(
+        ExponentialDecay(2.0, 0.3), dist_param_calculator
+    )
+    geometry = QuadrupletGeometry.from_points(random_points)
+
+    assert function.evaluate_geometry(geometry) == pytest.approx(
+        function(random_points)
+    )
+
+
+def test_analytic_potential_uses_shared_geometry(random_points):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecay(5.0, 0.5), sum_of_sidelengths
+        ),
+        short_long_attenuation=DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_com_distances
+        ),
+    )
+
+    short_range_energy = potential.short_range_potential(random_points)
+    short_long_att_factor = potential.short_long_attenuation(random_points)
+    dispersion_energy = potential.dispersion_potential(*random_points)
+    expect_energy = short_range_energy + dispersion_energy * short_long_att_factor
+
+    assert potential(random_points) == pytest.approx(expect_energy)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator",
+    [sum_of_sidelengths, sum_of_com_distances, lambda points: points[0].x ** 2],
+)
+def test_evaluate_geometry_matches_evaluate_batch(dist_param_calculator):
+    function = DistanceParameterFunction(
+        ExponentialDecay(2.0, 0.3), dist_param_calculator
+    )
+    batch = np.random.default_rng(seed=6).uniform(0.0, 3.0, size=(16, 4, 3))
+    geometry = QuadrupletGeometry.from_points(batch)
+
+    assert function.evaluate_geometry(geometry) == pytest.approx(
+        function.evaluate_batch(batch)
+    )
+
+
+class GeometrySpy:
+    def __init__(self, function: DistanceParameterFunction) -> None:
+        self.function = function
+        self.geometries: list[QuadrupletGeometry] = []
+
+    def __call__(self, points):
+        return self.function(points)
+
+    def evaluate_geometry(self, geometry):
+        self.geometries.append(geometry)
+        return self.function.evaluate_geometry(geometry)
+
+
+def test_analytic_batch_shares_geometry():
+    short_range_potential = GeometrySpy(
+        DistanceParameterFunction(ExponentialDecay(5.0, 0.5), sum_of_sidelengths)
+    )
+    short_long_attenuation = GeometrySpy(
+        DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_com_distances
+        )
+    )
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=short_range_potential,
+        short_long_attenuation=short_long_attenuation,
+    )
+    batch = np.random.default_rng(seed=7).uniform(0.0, 3.0, size=(8, 4, 3))
+
+    energies = potential.evaluate_batch(batch)
+
+    assert len(short_range_potential.geometries) == 1
+    assert short_long_attenuation.geometries == short_range_potential.geometries
+    assert energies == pytest.approx(
+        [potential([Cartesian3D(*p) for p in points]) for points in batch]
+    )
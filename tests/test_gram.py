@@ -0,0 +1,71 @@
+"""
+Check the distance-only (Gram matrix) formulation of the Bade potential against the
+implementations that use unit vectors.
+"""
+
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b import batched
+from dispersion4b import gram
+from dispersion4b.direct_potential import DirectFourBodyDispersionPotential
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_quadruplets():
+    rng = np.random.default_rng(seed=11)
+    yield rng.uniform(0.0, 3.0, size=(16, 4, 3))
+
+
+def test_contributions_match_unit_vectors(random_quadruplets):
+    separations = batched.pair_separations(random_quadruplets)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+    squared_distances = gram.squared_pair_distances(random_quadruplets)
+
+    assert squared_distances == pytest.approx(distances**2)
+    assert gram.pair_contributions(squared_distances) == pytest.approx(
+        batched.pair_contributions(distances)
+    )
+    assert gram.triplet_contributions(squared_distances) == pytest.approx(
+        batched.triplet_contributions(distances, unit_vectors)
+    )
+    assert gram.quadruplet_contributions(squared_distances) == pytest.approx(
+        batched.quadruplet_contributions(distances, unit_vectors),
+        rel=1.0e-8,
+        abs=1.0e-10,
+    )
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_single_quadruplet_matches_scalar_potential(potential, random_quadruplets):
+    for points in random_quadruplets:
+        squared_distances = gram.squared_pair_distances(points)
+
+        expect_energy = potential(*[Cartesian3D(*point) for point in points])
+        actual_energy = potential.energies_from_squared_distances(squared_distances)
+
+        assert actual_energy == pytest.approx(expect_energy, rel=1.0e-8, abs=1.0e-10)
+
+
+def test_matches_direct_potential(random_quadruplets):
+    """
+    The direct potential sums over every ordered cycle (i, j, k, l) with neighbouring
+    indices distinct; this visits each term of the Bade formula four times as often as
+    `FourBodyDispersionPotential` does.
+    """
+    direct_potential = DirectFourBodyDispersionPotential(1.0)
+    potential = FourBodyDispersionPotential(1.0)
+
+    squared_distances = gram.squared_pair_distances(random_quadruplets)
+    energies = potential.energies_from_squared_distances(squared_distances)
+
+    for points, energy in zip(random_quadruplets, energies):
+        expect_energy = direct_potential(*[Cartesian3D(*point) for point in points])
+        assert 4.0 * energy == pytest.approx(expect_energy, rel=1.0e-8, abs=1.0e-10)
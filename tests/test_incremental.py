@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.incremental import IncrementalClusterEnergy
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="function")
+def random_positions():
+    rng = np.random.default_rng(seed=3)
+    yield rng.uniform(0.0, 5.0, size=(30, 3))
+
+
+def test_initial_energy_matches_cluster(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    cutoff = 2.5
+
+    evaluator = IncrementalClusterEnergy(potential, random_positions, cutoff)
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=cutoff)
+
+    assert evaluator.total_energy == pytest.approx(cluster_energy(random_positions))
+
+
+def test_moves_match_cluster(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    cutoff = 2.5
+    rng = np.random.default_rng(seed=4)
+
+    evaluator = IncrementalClusterEnergy(potential, random_positions, cutoff)
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=cutoff)
+    positions = random_positions.copy()
+
+    for _ in range(50):
+        index = rng.integers(len(positions))
+        new_position = positions[index] + rng.normal(scale=0.3, size=3)
+
+        trial_positions = positions.copy()
+        trial_positions[index] = new_position
+        expect_delta = cluster_energy(trial_positions) - cluster_energy(positions)
+
+        delta = evaluator.propose_move(index, new_position)
+        assert delta == pytest.approx(expect_delta, abs=1.0e-10)
+
+        if rng.uniform() < 0.5:
+            evaluator.accept()
+            positions = trial_positions
+        else:
+            evaluator.reject()
+
+        assert evaluator.total_energy == pytest.approx(cluster_energy(positions))
+
+    fresh_evaluator = IncrementalClusterEnergy(potential, positions, cutoff)
+    assert evaluator.particle_energies == pytest.approx(
+        fresh_evaluator.particle_energies
+    )
+
+
+def test_raises_pending_move(random_positions):
+    evaluator = IncrementalClusterEnergy(
+        QuadrupletDispersionPotential(1.0), random_positions, 2.5
+    )
+    evaluator.propose_move(0, random_positions[0] + 0.1)
+
+    with pytest.raises(RuntimeError):
+        evaluator.propose_move(1, random_positions[1] + 0.1)
+
+
+def test_raises_no_pending_move(random_positions):
+    evaluator = IncrementalClusterEnergy(
+        QuadrupletDispersionPotential(1.0), random_positions, 2.5
+    )
+
+    with pytest.raises(RuntimeError):
+        evaluator.accept()
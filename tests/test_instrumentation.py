@@ -0,0 +1,121 @@
+import io
+import json
+import time
+
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.instrumentation import EvaluationStats
+from dispersion4b.instrumentation import InstrumentedAnalyticPotential
+from dispersion4b.instrumentation import InstrumentedClusterEnergy
+from dispersion4b.instrumentation import InstrumentedPotential
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+
+
+@pytest.fixture(scope="module")
+def random_batch():
+    rng = np.random.default_rng(seed=19)
+    yield rng.uniform(0.0, 4.0, size=(20, 4, 3))
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.5), QuadrupletDispersionPotential(1.5)],
+)
+def test_instrumented_potential_matches(potential, random_batch):
+    stats = EvaluationStats()
+    instrumented = InstrumentedPotential(potential, stats)
+
+    expect = potential.evaluate_batch(random_batch)
+    actual = instrumented.evaluate_batch(random_batch)
+
+    assert actual == pytest.approx(expect)
+    assert stats.quadruplets_evaluated == len(random_batch)
+    assert set(stats.stage_seconds) == {"dispersion"}
+
+
+def test_instrumented_analytic_potential_matches(random_batch):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecay(5.0, 0.5), sum_of_sidelengths
+        ),
+        short_long_attenuation=DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_sidelengths
+        ),
+    )
+    stats = EvaluationStats()
+    instrumented = InstrumentedAnalyticPotential(potential, stats)
+
+    expect = potential.evaluate_batch(random_batch)
+    actual = instrumented.evaluate_batch(random_batch)
+
+    assert actual == pytest.approx(expect)
+    assert stats.quadruplets_evaluated == len(random_batch)
+    assert set(stats.stage_seconds) == {
+        "geometry",
+        "dispersion",
+        "short_range",
+        "attenuation",
+    }
+
+
+def test_instrumented_cluster_counts_pruned():
+    rng = np.random.default_rng(seed=23)
+    positions = rng.uniform(0.0, 5.0, size=(25, 3))
+    potential = QuadrupletDispersionPotential(1.0)
+
+    cluster_energy = ClusterDispersionEnergy(
+        potential, sidelength_sum_cutoff=9.0, batch_size=50
+    )
+    stats = EvaluationStats()
+    instrumented = InstrumentedClusterEnergy(
+        potential, stats, sidelength_sum_cutoff=9.0, batch_size=50
+    )
+
+    assert instrumented(positions) == pytest.approx(cluster_energy(positions))
+
+    n_enumerated = len(cluster_energy.quadruplets(positions))
+    assert stats.quadruplets_pruned > 0
+    assert stats.quadruplets_evaluated + stats.quadruplets_pruned == n_enumerated
+    assert stats.stage_calls["enumeration"] == 1
+    assert set(stats.stage_seconds) == {"enumeration", "geometry", "dispersion"}
+
+
+def test_nested_stages_are_counted_once():
+    stats = EvaluationStats()
+    start = time.perf_counter()
+    with stats.timed("outer"):
+        with stats.timed("inner"):
+            time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    assert stats.stage_seconds["inner"] >= 0.01
+    assert stats.total_seconds <= elapsed
+
+
+def test_dump_and_reset(random_batch):
+    stats = EvaluationStats()
+    InstrumentedPotential(QuadrupletDispersionPotential(1.0), stats)(*random_batch[0])
+
+    output = io.StringIO()
+    stats.dump(output)
+    dumped = json.loads(output.getvalue())
+
+    assert dumped["quadruplets_evaluated"] == 1
+    assert dumped["stage_calls"]["dispersion"] == 1
+    assert "quadruplets evaluated: 1" in stats.summary()
+
+    stats.reset()
+    assert stats == EvaluationStats()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from dispersion4b import batched
+from dispersion4b import jit
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_batch():
+    rng = np.random.default_rng(seed=17)
+    yield rng.uniform(-2.0, 2.0, size=(64, 4, 3))
+
+
+def test_contributions_match_numpy(random_batch):
+    separations = batched.pair_separations(random_batch)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+    expect_quadruplet = batched.quadruplet_contributions(distances, unit_vectors)
+    expect_full = (
+        batched.pair_contributions(distances)
+        + batched.triplet_contributions(distances, unit_vectors)
+        + expect_quadruplet
+    )
+
+    assert jit.full_contributions(random_batch) == pytest.approx(expect_full)
+    assert jit.quadruplet_contributions(random_batch) == pytest.approx(
+        expect_quadruplet
+    )
+
+
+def test_kernel_matches_numpy(random_batch):
+    """The kernel is checked directly, whether or not Numba compiled it."""
+    batch = random_batch[:8]
+    separations = batched.pair_separations(batch)
+    distances, unit_vectors = batched.distances_and_unit_vectors(separations)
+
+    expect_quadruplet = batched.quadruplet_contributions(distances, unit_vectors)
+
+    assert jit._contributions(batch, False) == pytest.approx(expect_quadruplet)
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.5), QuadrupletDispersionPotential(1.5)],
+)
+def test_numba_backend_matches_numpy_backend(potential, random_batch):
+    expect_energies = potential.evaluate_batch(random_batch)
+    actual_energies = potential.evaluate_batch(random_batch, backend="numba")
+
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+def test_raises_unknown_backend(random_batch):
+    with pytest.raises(ValueError):
+        FourBodyDispersionPotential(1.0).evaluate_batch(random_batch, backend="cuda")
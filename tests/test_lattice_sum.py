@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from dispersion4b.lattice_sum import converged_lattice_energy_per_site
+from dispersion4b.lattice_sum import fcc_lattice_sites
+from dispersion4b.lattice_sum import hcp_lattice_sites
+from dispersion4b.lattice_sum import lattice_energy_per_site
+from dispersion4b.neighbor_list import quadruplets_containing
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+def direct_energy_per_site(potential, sites: np.ndarray, cutoff: float) -> float:
+    others = quadruplets_containing(0, sites, cutoff)
+    quadruplets = np.column_stack((np.zeros(len(others), dtype=np.int64), others))
+
+    return 0.25 * float(np.sum(potential.evaluate_batch(sites[quadruplets])))
+
+
+@pytest.mark.parametrize("lattice_sites", [fcc_lattice_sites, hcp_lattice_sites])
+def test_lattice_sum_matches_direct_sum(lattice_sites):
+    potential = QuadrupletDispersionPotential(1.0)
+    sites = lattice_sites(1.0, 2.5)
+
+    result = lattice_energy_per_site(potential, sites, n_shells=4)
+    cutoff = result.shell_radii[-1] * (1.0 + 1.0e-6)
+
+    assert result.energy == pytest.approx(
+        direct_energy_per_site(potential, sites, cutoff)
+    )
+    assert result.n_evaluated < result.n_quadruplets
+
+
+def test_lattice_sum_shells_are_cumulative():
+    potential = QuadrupletDispersionPotential(1.0)
+    sites = fcc_lattice_sites(1.0, 2.5)
+
+    result = lattice_energy_per_site(potential, sites, n_shells=4)
+
+    for n_shells, radius in enumerate(result.shell_radii, start=1):
+        cutoff = radius * (1.0 + 1.0e-6)
+        assert result.energies[n_shells - 1] == pytest.approx(
+            direct_energy_per_site(potential, sites, cutoff), abs=1.0e-12
+        )
+
+
+def test_fcc_nearest_neighbours():
+    sites = fcc_lattice_sites(1.0, 1.0)
+    distances = np.linalg.norm(sites, axis=1)
+
+    assert len(sites) == 13
+    assert distances[0] == 0.0
+    assert distances[1:] == pytest.approx(1.0)
+
+
+def test_hcp_nearest_neighbours():
+    sites = hcp_lattice_sites(2.0, 2.0)
+    distances = np.linalg.norm(sites, axis=1)
+
+    assert len(sites) == 13
+    assert distances[1:] == pytest.approx(2.0)
+
+
+def test_converged_lattice_sum_respects_max_shells():
+    potential = QuadrupletDispersionPotential(1.0)
+    result = converged_lattice_energy_per_site(
+        potential, fcc_lattice_sites, 1.0, rtol=0.0, max_shells=6
+    )
+
+    assert len(result.energies) == 6
+
+
+def test_lattice_sum_raises_nonpositive_shells():
+    potential = QuadrupletDispersionPotential(1.0)
+    with pytest.raises(ValueError):
+        lattice_energy_per_site(potential, fcc_lattice_sites(1.0, 1.0), n_shells=0)
+
+
+def test_converged_lattice_sum_matches_single_sum():
+    potential = QuadrupletDispersionPotential(1.0)
+    result = converged_lattice_energy_per_site(
+        potential, hcp_lattice_sites, 1.0, rtol=0.0, max_shells=6
+    )
+    expected = lattice_energy_per_site(potential, hcp_lattice_sites(1.0, 2.5), 6)
+
+    np.testing.assert_allclose(result.shell_radii, expected.shell_radii)
+    np.testing.assert_allclose(result.energies, expected.energies, rtol=1.0e-10)
+    assert result.n_quadruplets == expected.n_quadruplets
+
+
+def test_converged_lattice_sum_raises_too_few_max_shells():
+    potential = QuadrupletDispersionPotential(1.0)
+    with pytest.raises(ValueError, match="max_shells = 1"):
+        converged_lattice_energy_per_site(
+            potential, fcc_lattice_sites, 1.0, max_shells=1
+        )
@@ -32,3 +32,9 @@ def test_corner_vector():
     assert mad.magnitude == pytest.approx(expected_magnitude)
     assert approx_eq(mad.direction, Cartesian3D(-1.0, -2.0, -3.0) / expected_magnitude)
     assert euclidean_norm(mad.direction) == pytest.approx(1.0)
+
+
+def test_has_no_instance_dict():
+    mad = MagnitudeAndDirection(1.0, Cartesian3D(1.0, 0.0, 0.0))
+
+    assert not hasattr(mad, "__dict__")
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from dispersion4b.neighbor_list import enumerate_quadruplets
+from dispersion4b.neighbor_list import neighbor_pairs
+from dispersion4b.neighbor_list import quadruplets_containing
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=0)
+    yield rng.uniform(0.0, 6.0, size=(30, 3))
+
+
+def brute_force_quadruplets(positions: np.ndarray, cutoff: float) -> set:
+    def within_cutoff(quadruplet) -> bool:
+        return all(
+            np.linalg.norm(positions[i] - positions[j]) < cutoff
+            for (i, j) in itertools.combinations(quadruplet, 2)
+        )
+
+    indices = range(len(positions))
+    return {q for q in itertools.combinations(indices, 4) if within_cutoff(q)}
+
+
+def test_neighbor_pairs(random_positions):
+    cutoff = 2.0
+    expect_pairs = [
+        (i, j)
+        for (i, j) in itertools.combinations(range(len(random_positions)), 2)
+        if np.linalg.norm(random_positions[i] - random_positions[j]) < cutoff
+    ]
+    actual_pairs = [tuple(pair) for pair in neighbor_pairs(random_positions, cutoff)]
+
+    assert actual_pairs == expect_pairs
+
+
+def test_enumerate_quadruplets(random_positions):
+    cutoff = 2.5
+    expect_quadruplets = brute_force_quadruplets(random_positions, cutoff)
+    actual_quadruplets = enumerate_quadruplets(random_positions, cutoff)
+
+    assert len(actual_quadruplets) == len(expect_quadruplets)
+    assert {tuple(q) for q in actual_quadruplets} == expect_quadruplets
+
+
+def test_quadruplets_containing(random_positions):
+    cutoff = 2.5
+    index = 7
+    expect_others = {
+        tuple(i for i in q if i != index)
+        for q in brute_force_quadruplets(random_positions, cutoff)
+        if index in q
+    }
+    actual_others = quadruplets_containing(index, random_positions, cutoff)
+
+    assert {tuple(others) for others in actual_others} == expect_others
+
+
+def test_enumerate_quadruplets_too_few_particles():
+    positions = np.zeros((3, 3))
+    assert enumerate_quadruplets(positions, 1.0).shape == (0, 4)
+
+
+@pytest.mark.parametrize("bad_cutoff", [-1.0, 0.0])
+def test_raises_nonpositive_cutoff(bad_cutoff, random_positions):
+    with pytest.raises(ValueError):
+        neighbor_pairs(random_positions, bad_cutoff)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from dispersion4b import batched
+from dispersion4b.pair_geometry import PairGeometry
+from dispersion4b.periodic import PeriodicBox
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=31)
+    yield rng.uniform(0.0, 6.0, size=(30, 3))
+
+
+@pytest.fixture(scope="module")
+def random_quadruplets():
+    rng = np.random.default_rng(seed=37)
+    yield np.array([rng.choice(30, size=4, replace=False) for _ in range(40)])
+
+
+@pytest.mark.parametrize("box", [None, PeriodicBox([6.0, 6.0, 6.0])])
+def test_matches_batched(box, random_positions, random_quadruplets):
+    separations = batched.pair_separations(random_positions[random_quadruplets])
+    if box is not None:
+        separations = box.minimum_image(separations)
+    expect_distances, expect_unit_vectors = batched.distances_and_unit_vectors(
+        separations
+    )
+
+    geometry = PairGeometry()
+    distances, unit_vectors = geometry.from_positions(
+        random_positions, random_quadruplets, box
+    )
+
+    assert distances == pytest.approx(expect_distances)
+    assert unit_vectors == pytest.approx(expect_unit_vectors)
+
+
+@pytest.mark.parametrize("box", [None, PeriodicBox([6.0, 6.0, 6.0])])
+def test_squared_distances_match_distances(box, random_positions, random_quadruplets):
+    expect_distances, _ = PairGeometry().from_positions(
+        random_positions, random_quadruplets, box
+    )
+
+    sq_distances = PairGeometry().squared_distances_from_positions(
+        random_positions, random_quadruplets, box
+    )
+
+    assert sq_distances == pytest.approx(expect_distances**2)
+
+
+def test_reuses_buffers(random_positions, random_quadruplets):
+    geometry = PairGeometry(capacity=len(random_quadruplets))
+
+    first_distances, _ = geometry.from_points(random_positions[random_quadruplets])
+    second_distances, _ = geometry.from_points(
+        random_positions[random_quadruplets[:10]]
+    )
+
+    assert geometry.capacity == len(random_quadruplets)
+    assert np.shares_memory(first_distances, second_distances)
+
+
+def test_grows_for_larger_batches(random_positions, random_quadruplets):
+    geometry = PairGeometry(capacity=5)
+    distances, unit_vectors = geometry.from_positions(
+        random_positions, random_quadruplets
+    )
+
+    assert geometry.capacity == len(random_quadruplets)
+    assert distances.shape == (len(random_quadruplets), 6)
+    assert unit_vectors.shape == (len(random_quadruplets), 6, 3)
+
+
+def test_raises_negative_capacity():
+    with pytest.raises(ValueError):
+        PairGeometry(capacity=-1)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from dispersion4b import batched
+from dispersion4b import pairwise_cache
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.pairwise_cache import PairwiseGeometryCache
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=41)
+    yield rng.uniform(0.0, 6.0, size=(40, 3))
+
+
+@pytest.fixture(scope="module")
+def random_quadruplets(random_positions):
+    cluster_energy = ClusterDispersionEnergy(
+        QuadrupletDispersionPotential(1.0), pair_cutoff=3.0
+    )
+    yield cluster_energy.quadruplets(random_positions)
+
+
+def expected_geometry(positions, quadruplets, box=None):
+    separations = batched.pair_separations(positions[quadruplets])
+    if box is not None:
+        separations = box.minimum_image(separations)
+
+    return batched.distances_and_unit_vectors(separations)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+@pytest.mark.parametrize("box", [None, PeriodicBox([6.0, 6.0, 6.0])])
+def test_matches_batched(dense, box, random_positions, random_quadruplets, monkeypatch):
+    if not dense:
+        monkeypatch.setattr(pairwise_cache, "DENSE_TABLE_MAX_PARTICLES", 0)
+
+    cache = PairwiseGeometryCache(random_positions, box)
+
+    # the geometry is filled in over several calls, in a scrambled order
+    half = len(random_quadruplets) // 2
+    cache.quadruplet_geometry(random_quadruplets[half:, ::-1])
+    distances, unit_vectors = cache.quadruplet_geometry(random_quadruplets)
+
+    expect_distances, expect_unit_vectors = expected_geometry(
+        random_positions, random_quadruplets, box
+    )
+
+    assert distances == pytest.approx(expect_distances)
+    assert unit_vectors == pytest.approx(expect_unit_vectors)
+
+
+def test_each_pair_computed_once(random_positions, random_quadruplets):
+    cache = PairwiseGeometryCache(random_positions)
+    assert cache.n_computed == 0
+
+    cache.quadruplet_geometry(random_quadruplets)
+    cache.quadruplet_geometry(random_quadruplets)
+
+    first = random_quadruplets[:, batched.FIRST_POINT].ravel()
+    second = random_quadruplets[:, batched.SECOND_POINT].ravel()
+    pairs = np.unique(np.sort(np.column_stack((first, second)), axis=1), axis=0)
+
+    assert cache.n_computed == len(pairs)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+@pytest.mark.parametrize("n_moved", [40, 39])
+@pytest.mark.parametrize("n_filled", [2, None])
+def test_update_starts_new_configuration(
+    dense, n_moved, n_filled, random_positions, random_quadruplets, monkeypatch
+):
+    if not dense:
+        monkeypatch.setattr(pairwise_cache, "DENSE_TABLE_MAX_PARTICLES", 0)
+
+    cache = PairwiseGeometryCache(random_positions)
+    cache.quadruplet_geometry(random_quadruplets[:n_filled])
+
+    # the same number of particles reuses the table, and one fewer replaces it
+    moved_positions = 1.5 * random_positions[:n_moved]
+    moved_quadruplets = random_quadruplets[np.all(random_quadruplets < n_moved, axis=1)]
+    cache.update(moved_positions)
+    assert cache.n_computed == 0
+
+    distances, _ = cache.quadruplet_geometry(moved_quadruplets)
+    expect_distances, _ = expected_geometry(moved_positions, moved_quadruplets)
+    assert distances == pytest.approx(expect_distances)
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_energies_from_cache(potential, random_positions, random_quadruplets):
+    cache = PairwiseGeometryCache(random_positions)
+
+    expect = potential.evaluate_batch(random_positions[random_quadruplets])
+    actual = potential.energies_from_cache(cache, random_quadruplets)
+
+    assert actual == pytest.approx(expect)
+
+
+def test_raises_repeated_particle(random_positions):
+    cache = PairwiseGeometryCache(random_positions)
+
+    with pytest.raises(ValueError):
+        cache.pair_geometry([0, 1], [2, 1])
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.parallel import parallel_batch_energies
+from dispersion4b.parallel import parallel_quadruplet_energies
+from dispersion4b.parallel import parallel_quadruplet_energy
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=21)
+    yield rng.uniform(0.0, 8.0, size=(60, 3))
+
+
+def test_matches_serial_energy(random_positions):
+    cluster_energy = ClusterDispersionEnergy(
+        QuadrupletDispersionPotential(1.0), pair_cutoff=3.0
+    )
+    quadruplets = cluster_energy.quadruplets(random_positions)
+
+    expect_energy = cluster_energy(random_positions)
+    actual_energy = parallel_quadruplet_energy(
+        QuadrupletDispersionPotential(1.0),
+        random_positions,
+        quadruplets,
+        n_workers=2,
+        chunk_size=100,
+    )
+
+    assert actual_energy == pytest.approx(expect_energy)
+
+
+def test_independent_of_worker_count(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    box = PeriodicBox([8.0, 8.0, 8.0])
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=2.5, box=box)
+    quadruplets = cluster_energy.quadruplets(random_positions)
+
+    energies = [
+        parallel_quadruplet_energy(
+            potential,
+            random_positions,
+            quadruplets,
+            n_workers=n_workers,
+            chunk_size=64,
+            box=box,
+        )
+        for n_workers in [1, 2, 3]
+    ]
+
+    assert energies[0] == energies[1] == energies[2]
+    assert energies[0] == pytest.approx(cluster_energy(random_positions))
+
+
+def test_energies_in_quadruplet_order(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=3.0)
+    quadruplets = cluster_energy.quadruplets(random_positions)
+
+    expect_energies = potential.evaluate_batch(random_positions[quadruplets])
+    actual_energies = parallel_quadruplet_energies(
+        potential, random_positions, quadruplets, n_workers=2, chunk_size=100
+    )
+
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_batch_energies_from_memory_mapped_file(n_workers, random_positions, tmp_path):
+    potential = QuadrupletDispersionPotential(1.0)
+    rng = np.random.default_rng(seed=22)
+    quadruplets = rng.integers(len(random_positions), size=(250, 4))
+    quadruplets = quadruplets[[len(set(q)) == 4 for q in quadruplets]]
+    batch = random_positions[quadruplets]
+
+    path = tmp_path / "quadruplets.npy"
+    np.save(path, batch)
+    mapped_batch = np.load(path, mmap_mode="r")
+
+    expect_energies = potential.evaluate_batch(batch)
+    actual_energies = parallel_batch_energies(
+        potential, mapped_batch, n_workers=n_workers, chunk_size=16
+    )
+
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+def test_batch_energies_raises_wrong_shape(random_positions):
+    with pytest.raises(ValueError):
+        parallel_batch_energies(
+            QuadrupletDispersionPotential(1.0), random_positions, n_workers=1
+        )
+
+
+def test_no_quadruplets(random_positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    empty = np.empty((0, 4), dtype=np.int64)
+
+    assert parallel_quadruplet_energy(potential, random_positions, empty) == 0.0
+
+
+def test_raises_nonpositive_chunk_size(random_positions):
+    with pytest.raises(ValueError):
+        parallel_quadruplet_energy(
+            QuadrupletDispersionPotential(1.0),
+            random_positions,
+            [[0, 1, 2, 3]],
+            chunk_size=0,
+        )
@@ -0,0 +1,106 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.neighbor_list import enumerate_quadruplets
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+
+ORTHORHOMBIC_CELL = [7.0, 8.0, 9.5]
+TRICLINIC_CELL = [[7.0, 0.0, 0.0], [2.0, 7.5, 0.0], [1.5, -1.0, 8.0]]
+
+
+def brute_force_minimum_image(box: PeriodicBox, separation: np.ndarray) -> np.ndarray:
+    shifts = np.array(list(itertools.product(range(-4, 5), repeat=3))) @ box.cell
+    images = separation + shifts
+    return images[np.argmin(np.linalg.norm(images, axis=1))]
+
+
+def brute_force_quadruplets(box: PeriodicBox, positions: np.ndarray, cutoff: float):
+    def within_cutoff(quadruplet) -> bool:
+        return all(
+            np.linalg.norm(box.minimum_image(positions[i] - positions[j])) < cutoff
+            for (i, j) in itertools.combinations(quadruplet, 2)
+        )
+
+    indices = range(len(positions))
+    return [q for q in itertools.combinations(indices, 4) if within_cutoff(q)]
+
+
+@pytest.fixture(scope="module")
+def random_positions():
+    rng = np.random.default_rng(seed=5)
+    yield rng.uniform(-3.0, 12.0, size=(40, 3))
+
+
+def test_orthorhombic_widths():
+    box = PeriodicBox(ORTHORHOMBIC_CELL)
+
+    assert box.is_orthorhombic
+    assert box.perpendicular_widths() == pytest.approx(ORTHORHOMBIC_CELL)
+    assert box.max_quadruplet_cutoff() == pytest.approx(7.0 / 3.0)
+
+
+@pytest.mark.parametrize("cell", [ORTHORHOMBIC_CELL, TRICLINIC_CELL])
+def test_minimum_image(cell):
+    box = PeriodicBox(cell)
+    rng = np.random.default_rng(seed=6)
+
+    # the minimum image is exact for separations with a short minimum image
+    short_separations = rng.uniform(-1.0, 1.0, size=(20, 3))
+    shifts = rng.integers(-3, 4, size=(20, 3)) @ box.cell
+    separations = short_separations + shifts
+
+    for separation, actual_image in zip(separations, box.minimum_image(separations)):
+        expect_image = brute_force_minimum_image(box, separation)
+        assert actual_image == pytest.approx(expect_image)
+
+
+@pytest.mark.parametrize("cell", [ORTHORHOMBIC_CELL, TRICLINIC_CELL])
+def test_periodic_quadruplets(cell, random_positions):
+    box = PeriodicBox(cell)
+    cutoff = 0.99 * box.max_quadruplet_cutoff()
+
+    expect_quadruplets = brute_force_quadruplets(box, random_positions, cutoff)
+    actual_quadruplets = enumerate_quadruplets(random_positions, cutoff, box)
+
+    assert {tuple(q) for q in actual_quadruplets} == set(expect_quadruplets)
+
+
+@pytest.mark.parametrize("cell", [ORTHORHOMBIC_CELL, TRICLINIC_CELL])
+def test_periodic_cluster_energy(cell, random_positions):
+    box = PeriodicBox(cell)
+    cutoff = 0.99 * box.max_quadruplet_cutoff()
+    potential = QuadrupletDispersionPotential(1.0)
+
+    # unwrap each quadruplet around its first point, then evaluate it in open space
+    unwrapped = []
+    for quadruplet in brute_force_quadruplets(box, random_positions, cutoff):
+        points = random_positions[list(quadruplet)]
+        unwrapped.append(points[0] + box.minimum_image(points - points[0]))
+    expect_energy = np.sum(potential.evaluate_batch(np.array(unwrapped)))
+
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=cutoff, box=box)
+    actual_energy = cluster_energy(random_positions)
+
+    assert actual_energy == pytest.approx(expect_energy)
+
+
+def test_raises_cutoff_too_large_for_box():
+    box = PeriodicBox(ORTHORHOMBIC_CELL)
+    cutoff = 1.01 * box.max_quadruplet_cutoff()
+
+    with pytest.raises(ValueError):
+        ClusterDispersionEnergy(
+            QuadrupletDispersionPotential(1.0), pair_cutoff=cutoff, box=box
+        )
+
+
+@pytest.mark.parametrize(
+    "bad_cell", [[1.0, -1.0, 1.0], [[1.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 0.0, 1.0]]]
+)
+def test_raises_bad_cell(bad_cell):
+    with pytest.raises(ValueError):
+        PeriodicBox(bad_cell)
@@ -0,0 +1,124 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.sampling import QuadrupletEnergySampler
+from dispersion4b.sampling import _RunningStatistics
+
+
+@pytest.fixture(scope="module")
+def positions():
+    rng = np.random.default_rng(seed=53)
+    yield rng.uniform(0.0, 4.0, size=(12, 3))
+
+
+def brute_force_ordered_probability(positions: np.ndarray, quadruplet: tuple) -> float:
+    i, j, k, m = quadruplet
+    others = np.arange(len(positions))
+
+    def weights(centre: int, excluded: list[int]) -> np.ndarray:
+        distances = np.linalg.norm(positions - positions[centre], axis=1)
+        result = np.where(np.isin(others, excluded), 0.0, 1.0)
+        return result / np.where(result > 0.0, distances, 1.0) ** 3
+
+    weights_j = weights(i, [i])
+    weights_k = weights(j, [i, j])
+    weights_m = weights(k, [i, j, k]) * weights(i, [i, j, k])
+
+    return (
+        (weights_j[j] / np.sum(weights_j))
+        * (weights_k[k] / np.sum(weights_k))
+        * (weights_m[m] / np.sum(weights_m))
+        / len(positions)
+    )
+
+
+def brute_force_probability(positions: np.ndarray, quadruplet: tuple) -> float:
+    return sum(
+        brute_force_ordered_probability(positions, ordering)
+        for ordering in itertools.permutations(quadruplet)
+    )
+
+
+def test_sample_probabilities_are_exact(positions):
+    sampler = QuadrupletEnergySampler(QuadrupletDispersionPotential(1.0), seed=59)
+    quadruplets, probabilities = sampler.sample(positions, 50)
+
+    for quadruplet, probability in zip(quadruplets.tolist(), probabilities):
+        assert len(set(quadruplet)) == 4
+        assert probability == pytest.approx(
+            brute_force_probability(positions, quadruplet)
+        )
+
+
+def test_probabilities_sum_to_one():
+    rng = np.random.default_rng(seed=61)
+    positions = rng.uniform(0.0, 2.0, size=(5, 3))
+
+    total = sum(
+        brute_force_probability(positions, quadruplet)
+        for quadruplet in itertools.combinations(range(5), 4)
+    )
+
+    assert total == pytest.approx(1.0)
+
+
+def test_estimate_matches_exact_energy(positions):
+    potential = QuadrupletDispersionPotential(1.0)
+    expect = ClusterDispersionEnergy(potential, pair_cutoff=100.0)(positions)
+
+    sampler = QuadrupletEnergySampler(potential, seed=67)
+    result = sampler.estimate(positions, max_samples=20000)
+
+    assert not result.converged
+    assert result.n_samples == 20032
+    assert abs(result.energy - expect) < 4.0 * result.standard_error
+
+
+def test_estimate_stops_at_target_precision(positions):
+    sampler = QuadrupletEnergySampler(QuadrupletDispersionPotential(1.0), seed=71)
+    result = sampler.estimate(positions, target_relative_error=0.05)
+
+    assert result.converged
+    assert result.n_samples < 1_000_000
+    assert result.standard_error <= 0.05 * abs(result.energy)
+
+
+def test_running_statistics_match_all_values():
+    rng = np.random.default_rng(seed=71)
+    batches = [rng.normal(5.0, 2.0, size=size) for size in [1, 64, 7, 300]]
+    all_values = np.concatenate(batches)
+
+    statistics = _RunningStatistics()
+    for batch in batches:
+        statistics.add(batch)
+
+    assert statistics.n_values == len(all_values)
+    assert statistics.mean == pytest.approx(np.mean(all_values))
+    assert statistics.standard_error == pytest.approx(
+        np.std(all_values, ddof=1) / np.sqrt(len(all_values))
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"target_error": 0.0},
+        {"target_relative_error": -0.1},
+        {"min_samples": 1},
+        {"min_samples": 100, "max_samples": 10},
+    ],
+)
+def test_estimate_raises_invalid_arguments(kwargs, positions):
+    sampler = QuadrupletEnergySampler(QuadrupletDispersionPotential(1.0))
+    with pytest.raises(ValueError):
+        sampler.estimate(positions, **kwargs)
+
+
+def test_raises_too_few_particles():
+    sampler = QuadrupletEnergySampler(QuadrupletDispersionPotential(1.0))
+    with pytest.raises(ValueError):
+        sampler.sample(np.zeros((3, 3)), 10)
@@ -0,0 +1,88 @@
+import array
+
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
+from dispersion4b.direct_potential import DirectFourBodyDispersionPotential
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(seed=29)
+    yield rng.uniform(0.0, 3.0, size=(4, 3))
+
+
+def as_cartesian(points: np.ndarray) -> list[Cartesian3D]:
+    return [Cartesian3D(*point) for point in points.tolist()]
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [
+        FourBodyDispersionPotential(1.5),
+        QuadrupletDispersionPotential(1.5),
+        DirectFourBodyDispersionPotential(1.5),
+    ],
+)
+@pytest.mark.parametrize(
+    "convert",
+    [
+        lambda points: list(points),
+        lambda points: points.tolist(),
+        lambda points: [array.array("d", point) for point in points.tolist()],
+        lambda points: [memoryview(point) for point in points],
+        lambda points: [*as_cartesian(points[:2]), *points[2:]],
+    ],
+)
+def test_potentials_accept_arrays(potential, convert, points):
+    expect = potential(*as_cartesian(points))
+    actual = potential(*convert(points))
+
+    assert actual == pytest.approx(expect)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator", [sum_of_sidelengths, sum_of_com_distances]
+)
+def test_distance_parameter_function_accepts_arrays(dist_param_calculator, points):
+    function = DistanceParameterFunction(
+        ExponentialDecay(5.0, 0.5), dist_param_calculator
+    )
+
+    assert function(points) == pytest.approx(function(as_cartesian(points)))
+    assert function.gradient(points) == pytest.approx(
+        function.gradient(as_cartesian(points))
+    )
+
+
+def test_analytic_potential_accepts_arrays(points):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecay(5.0, 0.5), sum_of_sidelengths
+        ),
+        short_long_attenuation=DistanceParameterFunction(
+            SilveraGoldmanAttenuation(12.0, 1.0), sum_of_sidelengths
+        ),
+    )
+
+    expect_energy, expect_forces = potential.energy_and_forces(as_cartesian(points))
+    actual_energy, actual_forces = potential.energy_and_forces(points)
+
+    assert potential(points) == pytest.approx(potential(as_cartesian(points)))
+    assert actual_energy == pytest.approx(expect_energy)
+    assert actual_forces == pytest.approx(expect_forces)
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.scan import dispersion_radial_scan
+from dispersion4b.scan import scale_points
+from dispersion4b.shortrange.attenuation import SilveraGoldmanAttenuation
+from dispersion4b.shortrange.distance_parameter_function import (
+    DistanceParameterFunction,
+)
+from dispersion4b.shortrange.distance_parameter_function import sum_of_com_distances
+from dispersion4b.shortrange.distance_parameter_function import sum_of_sidelengths
+from dispersion4b.shortrange.four_body_analytic_potential import (
+    FourBodyAnalyticPotential,
+)
+from dispersion4b.shortrange.short_range_functions import ExponentialDecay
+from dispersion4b.unit_geometries import get_tetrahedron_points
+
+
+@pytest.fixture(scope="module")
+def scales():
+    yield np.linspace(0.5, 3.0, 32)
+
+
+@pytest.mark.parametrize(
+    "potential",
+    [FourBodyDispersionPotential(1.0), QuadrupletDispersionPotential(1.0)],
+)
+def test_dispersion_scan_matches_direct(potential, scales):
+    points = get_tetrahedron_points(1.0)
+
+    expect_energies = [potential(*scale_points(points, s)) for s in scales]
+    actual_energies = dispersion_radial_scan(potential, points, scales)
+
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+@pytest.mark.parametrize(
+    "dist_param_calculator",
+    [sum_of_sidelengths, sum_of_com_distances, lambda points: points[0].x ** 2],
+)
+def test_analytic_scan_matches_direct(dist_param_calculator, scales):
+    potential = FourBodyAnalyticPotential(
+        dispersion_potential=FourBodyDispersionPotential(1.0),
+        short_range_potential=DistanceParameterFunction(
+            ExponentialDecay(5.0, 0.5), dist_param_calculator
+        ),
+        short_long_attenuation=lambda points: 1.0 - math.exp(-(points[1].x ** 2)),
+    )
+    points = get_tetrahedron_points(1.0)
+
+    expect_energies = [potential(scale_points(points, s)) for s in scales]
+    actual_energies = potential.radial_scan(points, scales)
+
+    assert actual_energies == pytest.approx(expect_energies)
+
+
+def test_attenuation_scan_matches_direct(scales):
+    attenuation = DistanceParameterFunction(
+        SilveraGoldmanAttenuation(12.0, 1.0), sum_of_sidelengths
+    )
+    points = get_tetrahedron_points(1.0)
+
+    expect_values = [attenuation(scale_points(points, s)) for s in scales]
+    actual_values = attenuation.radial_scan(points, scales)
+
+    assert actual_values == pytest.approx(expect_values)
+
+
+def test_scan_raises_nonpositive_scales():
+    points = get_tetrahedron_points(1.0)
+    with pytest.raises(ValueError):
+        dispersion_radial_scan(FourBodyDispersionPotential(1.0), points, [1.0, 0.0])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.trajectory import evaluate_trajectory
+from dispersion4b.trajectory import read_frames
+
+
+@pytest.fixture(scope="module")
+def frames():
+    rng = np.random.default_rng(seed=8)
+    yield rng.uniform(0.0, 5.0, size=(5, 12, 3))
+
+
+def write_xyz(path, frames: np.ndarray) -> None:
+    with open(path, "w") as xyz_file:
+        for index, frame in enumerate(frames):
+            xyz_file.write(f"{len(frame)}\n")
+            xyz_file.write(f"frame {index}\n")
+            for x, y, z in frame.tolist():
+                xyz_file.write(f"H {x!r} {y!r} {z!r}\n")
+
+
+@pytest.mark.parametrize("suffix", [".xyz", ".npy"])
+def test_read_frames(suffix, frames, tmp_path):
+    path = tmp_path / f"trajectory{suffix}"
+    if suffix == ".xyz":
+        write_xyz(path, frames)
+    else:
+        np.save(path, frames)
+
+    read = list(read_frames(path))
+
+    assert len(read) == len(frames)
+    for actual, expect in zip(read, frames):
+        assert actual == pytest.approx(expect)
+
+
+@pytest.mark.parametrize("suffix", [".xyz", ".npy"])
+def test_evaluate_trajectory(suffix, frames, tmp_path):
+    trajectory_path = tmp_path / f"trajectory{suffix}"
+    output_path = tmp_path / "energies.dat"
+    if suffix == ".xyz":
+        write_xyz(trajectory_path, frames)
+    else:
+        np.save(trajectory_path, frames)
+
+    cluster_energy = ClusterDispersionEnergy(
+        QuadrupletDispersionPotential(1.0), pair_cutoff=3.0
+    )
+
+    n_frames = evaluate_trajectory(cluster_energy, trajectory_path, output_path)
+    output = np.loadtxt(output_path)
+
+    assert n_frames == len(frames)
+    assert output[:, 0].tolist() == list(range(len(frames)))
+    assert output[:, 1] == pytest.approx([cluster_energy(frame) for frame in frames])
+
+
+def test_raises_unknown_extension(tmp_path):
+    with pytest.raises(ValueError):
+        read_frames(tmp_path / "trajectory.pdb")
+
+
+def test_raises_malformed_xyz(tmp_path):
+    path = tmp_path / "bad.xyz"
+    path.write_text("2\ncomment\nH 0.0 0.0 0.0\nH 1.0 1.0\n")
+
+    with pytest.raises(ValueError):
+        list(read_frames(path))
@@ -2,10 +2,10 @@ import math
 
 import pytest
 
-from cartesian import Cartesian3D
 from cartesian.operations import dot_product
 
 from dispersion4b.potential import FourBodyDispersionPotential
+from dispersion4b.unit_geometries import get_collinear_points
 
 # TODO:
 # - try out other unit geometries, ones that are easy to calculate by hand
@@ -13,15 +13,6 @@ from dispersion4b.potential import FourBodyDispersionPotential
 # - a square of unit side length?
 
 
-def get_collinear_points(sidelen: float) -> list[Cartesian3D]:
-    p0 = sidelen * Cartesian3D(0.0, 0.0, 0.0)
-    p1 = sidelen * Cartesian3D(1.0, 0.0, 0.0)
-    p2 = sidelen * Cartesian3D(2.0, 0.0, 0.0)
-    p3 = sidelen * Cartesian3D(3.0, 0.0, 0.0)
-
-    return [p0, p1, p2, p3]
-
-
 def unit_collinear_energy_by_hand() -> float:
     """
     Calculate the 4-body dispersion interaction energy, for an interaction with
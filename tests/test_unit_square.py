@@ -2,19 +2,10 @@ import math
 
 import pytest
 
-from cartesian import Cartesian3D
 from cartesian.operations import dot_product
 
 from dispersion4b.potential import FourBodyDispersionPotential
-
-
-def get_square_points(sidelen: float) -> list[Cartesian3D]:
-    p0 = sidelen * Cartesian3D(0.0, 0.0, 0.0)
-    p1 = sidelen * Cartesian3D(1.0, 0.0, 0.0)
-    p2 = sidelen * Cartesian3D(1.0, 1.0, 0.0)
-    p3 = sidelen * Cartesian3D(0.0, 1.0, 0.0)
-
-    return [p0, p1, p2, p3]
+from dispersion4b.unit_geometries import get_square_points
 
 
 def unit_square_energy_by_hand() -> float:
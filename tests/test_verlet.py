@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from dispersion4b.cluster import ClusterDispersionEnergy
+from dispersion4b.periodic import PeriodicBox
+from dispersion4b.quadruplet_potential import QuadrupletDispersionPotential
+from dispersion4b.verlet import VerletClusterEnergy
+from dispersion4b.verlet import VerletQuadrupletList
+
+
+def random_walk(n_steps: int, step_size: float, box_length: float, seed: int):
+    rng = np.random.default_rng(seed=seed)
+    positions = rng.uniform(0.0, box_length, size=(40, 3))
+
+    frames = []
+    for _ in range(n_steps):
+        positions = positions + rng.normal(scale=step_size, size=positions.shape)
+        frames.append(positions)
+
+    return frames
+
+
+@pytest.mark.parametrize("box", [None, PeriodicBox([9.0, 9.0, 9.0])])
+def test_matches_cluster_energy(box):
+    potential = QuadrupletDispersionPotential(1.0)
+    cluster_energy = ClusterDispersionEnergy(potential, pair_cutoff=2.5, box=box)
+    verlet_energy = VerletClusterEnergy(
+        potential, pair_cutoff=2.5, skin=0.3, batch_size=100, box=box
+    )
+
+    for positions in random_walk(20, 0.02, 9.0, seed=43):
+        assert verlet_energy(positions) == pytest.approx(cluster_energy(positions))
+
+    neighbor_list = verlet_energy.neighbor_list
+    assert neighbor_list.n_updates == 20
+    assert 1 <= neighbor_list.n_rebuilds < 20
+    assert neighbor_list.reuse_ratio == pytest.approx(
+        1.0 - neighbor_list.n_rebuilds / 20
+    )
+
+
+def test_matches_cluster_energy_with_sidelength_sum_cutoff():
+    potential = QuadrupletDispersionPotential(1.0)
+    cluster_energy = ClusterDispersionEnergy(
+        potential, pair_cutoff=3.0, sidelength_sum_cutoff=12.0
+    )
+    verlet_energy = VerletClusterEnergy(
+        potential, pair_cutoff=3.0, skin=0.3, sidelength_sum_cutoff=12.0
+    )
+
+    for positions in random_walk(10, 0.02, 9.0, seed=44):
+        assert verlet_energy(positions) == pytest.approx(cluster_energy(positions))
+
+
+def test_rebuilds_only_after_half_skin():
+    rng = np.random.default_rng(seed=47)
+    positions = rng.uniform(0.0, 6.0, size=(30, 3))
+    neighbor_list = VerletQuadrupletList(cutoff=2.0, skin=0.4)
+
+    neighbor_list.quadruplets(positions)
+    moved = positions.copy()
+    moved[0, 0] += 0.19
+    neighbor_list.quadruplets(moved)
+    assert neighbor_list.n_rebuilds == 1
+
+    moved[0, 0] += 0.02
+    neighbor_list.quadruplets(moved)
+    assert neighbor_list.n_rebuilds == 2
+
+
+@pytest.mark.parametrize("cutoff, skin", [(0.0, 0.1), (1.0, -0.1)])
+def test_raises_invalid_distances(cutoff, skin):
+    with pytest.raises(ValueError):
+        VerletQuadrupletList(cutoff, skin)